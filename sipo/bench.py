@@ -0,0 +1,238 @@
+"""Simulation performance benchmarks with an append-only history
+
+Every DESIGN is compiled once and runs the bench_lm70 workload at fixed
+sizes (1k, 64k and 1M frames) from that build. Each run records compile time, wall time, the sim-time/wall-time
+ratio, frames/sec and the peak RSS of the simulator process as one JSON line
+in the history file. The new samples are then compared with a baseline from
+that history using Welch's t-test, and a statistically significant slowdown
+makes the script exit non-zero.
+
+Usage: python bench.py [--designs ...] [--workloads ...] [--repeat N]
+                       [--baseline previous|COMMIT] [--history FILE]
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+import runner
+
+WORKLOADS = (1_000, 65_536, 1_048_576)
+BENCH_MODULE = "bench_lm70"
+DEFAULT_HISTORY = os.path.join(runner.SIPO_DIR, "bench_history.jsonl")
+
+# Metrics where a higher value is better; these are the ones checked for slowdowns
+THROUGHPUT_METRICS = ("frames_per_sec", "ratio_time")
+
+
+def _betacf(a, b, x):
+    """Continued fraction for the regularized incomplete beta function"""
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c, d = 1.0, 1.0 - qab * x / qap
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + aa / c
+        c = c if abs(c) > tiny else tiny
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + aa / c
+        c = c if abs(c) > tiny else tiny
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < 1e-12:
+            break
+    return h
+
+
+def _betai(a, b, x):
+    """Regularized incomplete beta function I_x(a, b)"""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1.0 - x))
+    if x < (a + 1.0) / (a + b + 2.0):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1.0 - x) / b
+
+
+def welch_t_test(baseline, current):
+    """One-sided Welch t-test that `current` has a lower mean than `baseline`
+
+    Returns (t, degrees_of_freedom, p_value), or None when either side has
+    fewer than two samples.
+    """
+    if len(baseline) < 2 or len(current) < 2:
+        return None
+    var_b = statistics.variance(baseline) / len(baseline)
+    var_c = statistics.variance(current) / len(current)
+    if var_b + var_c == 0:
+        diff = statistics.mean(current) - statistics.mean(baseline)
+        return (-math.inf if diff < 0 else math.inf, math.inf, 0.0 if diff < 0 else 1.0)
+    t = (statistics.mean(current) - statistics.mean(baseline)) / math.sqrt(var_b + var_c)
+    dof = (var_b + var_c) ** 2 / (var_b**2 / (len(baseline) - 1) + var_c**2 / (len(current) - 1))
+    # P(T <= t) for Student's t with dof degrees of freedom
+    tail = 0.5 * _betai(dof / 2.0, 0.5, dof / (dof + t * t))
+    p_value = tail if t < 0 else 1.0 - tail
+    return t, dof, p_value
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=runner.SIPO_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compile_bench(design, out_dir, variables):
+    """Compiles `design` from scratch; returns (sim_build, compile wall time) for every workload to reuse"""
+    design_dir = os.path.join(out_dir, design)
+    sim_build = os.path.join(design_dir, "sim_build")
+    shutil.rmtree(sim_build, ignore_errors=True)
+    os.makedirs(design_dir, exist_ok=True)
+
+    build = runner.compile_design(design, sim_build, variables, log_path=os.path.join(design_dir, "compile.log"))
+    if not build.ok:
+        raise RuntimeError(f"{design}: compile failed, see {build.log_path}")
+    return sim_build, build.wall_time
+
+
+def run_workload(design, sim_build, frames, repeat, out_dir, variables):
+    """Runs the workload `repeat` times from a compile_bench build; returns the samples"""
+    design_dir = os.path.join(out_dir, design)
+    samples = []
+    for i in range(repeat):
+        results_file = os.path.join(design_dir, f"results_{frames}_{i}.xml")
+        report_path = os.path.join(design_dir, f"report_{frames}_{i}.json")
+        result = runner.run_design(
+            design,
+            sim_build,
+            results_file,
+            variables,
+            env={"BENCH_FRAMES": frames, "BENCH_REPORT": report_path},
+            log_path=os.path.join(design_dir, f"run_{frames}_{i}.log"),
+        )
+        testcases = runner.parse_results(results_file)
+        if not result.ok or not testcases or not os.path.exists(report_path):
+            raise RuntimeError(f"{design}: benchmark run failed, see {result.log_path}")
+        with open(report_path) as f:
+            report = json.load(f)
+        samples.append(
+            {
+                "wall_time": testcases[0]["time"],
+                "sim_time_ns": testcases[0]["sim_time_ns"],
+                "ratio_time": testcases[0]["ratio_time"],
+                "frames_per_sec": report["frames_per_sec"],
+                "peak_rss_kb": report["peak_rss_kb"],
+            }
+        )
+    return samples
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def baseline_records(history, record, baseline, runs):
+    """History records comparable with `record` that form the baseline"""
+    key = ("design", "frames", "sim", "host")
+    matching = [old for old in history if all(old.get(k) == record[k] for k in key)]
+    if baseline == "previous":
+        return matching[-runs:]
+    return [old for old in matching if old["commit"].startswith(baseline)]
+
+
+def compare(record, baseline, threshold, alpha):
+    """Returns a list of slowdown messages for `record` against the baseline records"""
+    alerts = []
+    for metric in THROUGHPUT_METRICS:
+        old = [sample[metric] for base in baseline for sample in base["samples"]]
+        new = [sample[metric] for sample in record["samples"]]
+        if not old:
+            continue
+        old_mean, new_mean = statistics.mean(old), statistics.mean(new)
+        change = (new_mean - old_mean) / old_mean if old_mean else 0.0
+        test = welch_t_test(old, new)
+        if change < -threshold and test is not None and test[2] < alpha:
+            alerts.append(
+                f"{record['design']} @ {record['frames']} frames: {metric} dropped {-change:.1%} "
+                f"({old_mean:.1f} -> {new_mean:.1f}, p={test[2]:.3g})"
+            )
+    return alerts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--designs", nargs="+", default=list(runner.DESIGNS))
+    parser.add_argument("--workloads", nargs="+", type=int, default=list(WORKLOADS), help="frame counts")
+    parser.add_argument("--repeat", type=int, default=3, help="samples per workload")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="append-only JSON Lines history")
+    parser.add_argument("--baseline", default="previous", help="'previous' or a commit prefix from the history")
+    parser.add_argument("--baseline-runs", type=int, default=5, help="history records used for 'previous'")
+    parser.add_argument("--threshold", type=float, default=0.10, help="minimum relative slowdown to flag")
+    parser.add_argument("--alpha", type=float, default=0.05, help="significance level")
+    parser.add_argument("--out", default="bench_build")
+    parser.add_argument("--var", action="append", default=[], help="extra make variable, e.g. PDK_PATH=...")
+    args = parser.parse_args(argv)
+
+    variables = dict(item.split("=", 1) for item in args.var)
+    variables.setdefault("MODULE", BENCH_MODULE)
+    variables.setdefault("WAVES", "0")
+    out_dir = os.path.abspath(args.out)
+
+    history = load_history(args.history)
+    commit = git_commit()
+    alerts = []
+    for design in args.designs:
+        sim_build, compile_time = compile_bench(design, out_dir, variables)
+        for frames in args.workloads:
+            samples = run_workload(design, sim_build, frames, args.repeat, out_dir, variables)
+            record = {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "commit": commit,
+                "host": platform.node(),
+                "sim": variables.get("SIM", "icarus"),
+                "design": design,
+                "frames": frames,
+                "compile_time": compile_time,
+                "samples": samples,
+            }
+            baseline = baseline_records(history, record, args.baseline, args.baseline_runs)
+            alerts += compare(record, baseline, args.threshold, args.alpha)
+            with open(args.history, "a") as f:
+                f.write(json.dumps(record) + "\n")
+
+            print(
+                f"{design:22s} {frames:8d} frames  compile {compile_time:6.2f} s  "
+                f"wall {statistics.mean(s['wall_time'] for s in samples):8.2f} s  "
+                f"{statistics.mean(s['frames_per_sec'] for s in samples):9.0f} frames/s  "
+                f"ratio {statistics.mean(s['ratio_time'] for s in samples):9.0f}  "
+                f"rss {max(s['peak_rss_kb'] for s in samples) / 1024:7.1f} MiB"
+            )
+
+    for alert in alerts:
+        print(f"SLOWDOWN: {alert}")
+    return 1 if alerts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
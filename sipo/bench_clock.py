@@ -0,0 +1,58 @@
+import json
+import os
+import time
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import Timer
+
+from hdl_clock import HdlClock
+
+PERIOD_NS = 10
+
+
+async def coroutine_clock(signal):
+    """The clock_gen loop the testbenches used before hdl_clock.py"""
+    while True:
+        signal.value = 0
+        await Timer(PERIOD_NS / 2, units="ns")
+        signal.value = 1
+        await Timer(PERIOD_NS / 2, units="ns")
+
+
+# Free-running clock workload for clock_compare.py
+@cocotb.test()
+async def bench_clock(dut):
+    """Runs CLOCK_BENCH_CYCLES cycles of a free-running clock in CLOCK_BENCH_MODE"""
+
+    mode = os.environ.get("CLOCK_BENCH_MODE", "hdl")
+    cycles = int(os.environ.get("CLOCK_BENCH_CYCLES", "100000"))
+    signal = dut.clk if hasattr(dut, "clk") else dut.SC
+
+    native = False
+    if mode == "coroutine":
+        cocotb.start_soon(coroutine_clock(signal))
+    elif mode == "cocotb":
+        cocotb.start_soon(Clock(signal, PERIOD_NS, units="ns").start(start_high=False))
+    else:
+        clock = HdlClock(signal, PERIOD_NS, units="ns").start(start_high=False)
+        native = clock.native
+
+    start = time.perf_counter()
+    await Timer(cycles * PERIOD_NS, units="ns")
+    elapsed = time.perf_counter() - start
+
+    report_path = os.environ.get("CLOCK_BENCH_REPORT")
+    if report_path:
+        with open(report_path, "w") as f:
+            json.dump(
+                {
+                    "mode": mode,
+                    "native": native,
+                    "cycles": cycles,
+                    "wall_time": elapsed,
+                    "cycles_per_sec": cycles / elapsed if elapsed else 0.0,
+                },
+                f,
+            )
+    dut._log.info(f"{mode}: {cycles} cycles in {elapsed:.2f} s ({cycles / elapsed:.0f} cycles/s)")
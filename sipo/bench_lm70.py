@@ -0,0 +1,64 @@
+import os
+import time
+
+import cocotb
+from cocotb.triggers import Timer
+
+from bench_report import write_report
+from channels import channels
+from hdl_clock import HdlClock
+from lm70 import LM70
+
+
+def bench_words(count):
+    """Deterministic spread of LM70 words shared by every benchmark run"""
+    return ((i * 40503) & 0xFFFF for i in range(count))
+
+
+# Throughput workload for bench.py; works with every DESIGN in the Makefile
+@cocotb.test()
+async def bench_frames(dut):
+    """Pushes BENCH_FRAMES frames through the design and reports the rate"""
+
+    frame_count = int(os.environ.get("BENCH_FRAMES", "1000"))
+
+    start = time.perf_counter()
+    if hasattr(dut, "SC"):
+        # Serial designs: reset, then stream LM70 frames with CS framing
+        dut.SC.value = 0
+        dut.RESET_N.value = 0
+        if len(dut.CS) > 1:
+            # sipo_multi: every chip select idle high, frames go to channel 0
+            sensor = channels(dut)[0]
+            data = sensor.D
+        else:
+            sensor = dut
+            dut.CS.value = 1
+            data = dut.SIO if hasattr(dut, "SIO") else dut.D
+            data.value = 0
+        await Timer(20, units="ns")
+        dut.RESET_N.value = 1
+        await Timer(1, units="ns")
+        HdlClock(dut.SC, 10, units="ns").start()
+
+        lm70 = LM70(sensor, data)
+        await lm70.send_frames(bench_words(frame_count))
+        frames = lm70.frames_sent
+    else:
+        # mux2to1: one latched word and display select per frame
+        lsb = dut.Latch_Q_LSB
+        msb = dut.Latch_Q_MSB
+        lsb_sel = dut.lsb_sel
+        settle = Timer(10, units="ns")
+        frames = 0
+        for word in bench_words(frame_count):
+            latch_q = ((word >> 8) << 1) & 0xFF
+            lsb.value = latch_q & 0xF
+            msb.value = latch_q >> 4
+            lsb_sel.value = frames & 1
+            await settle
+            frames += 1
+    elapsed = time.perf_counter() - start
+
+    write_report(os.environ.get("BENCH_REPORT"), frames, elapsed)
+    dut._log.info(f"{frames} frames in {elapsed:.2f} s ({frames / elapsed:.0f} frames/s)")
@@ -0,0 +1,28 @@
+"""Throughput report written by in-simulator benchmarks (BENCH_REPORT, MULTI_REPORT)
+
+    write_report(os.environ.get("BENCH_REPORT"), frames, elapsed)
+"""
+import json
+import resource
+
+
+def peak_rss_kb():
+    """Peak RSS of this process; called from a cocotb test it is the simulator's (vvp or Vtop)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def write_report(path, frames, elapsed, **extra):
+    """Writes frames, wall time, frames/sec and peak RSS as JSON to `path` (skipped when empty)"""
+    if not path:
+        return
+    with open(path, "w") as f:
+        json.dump(
+            dict(
+                extra,
+                frames=frames,
+                wall_time=elapsed,
+                frames_per_sec=frames / elapsed if elapsed else 0.0,
+                peak_rss_kb=peak_rss_kb(),
+            ),
+            f,
+        )
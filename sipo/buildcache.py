@@ -0,0 +1,112 @@
+"""Content-hashed build cache for SIM_BUILD
+
+The key covers the contents of every Verilog source (including the PDK
+model file), TOPLEVEL, the simulator, the compile flags and defines, and the
+cocotb version. Each key gets its own snapshot directory, so switching
+DESIGN keeps the other compiles, and an unchanged key reuses the existing
+snapshot. The Makefile calls this while parsing and uses the printed
+directory as SIM_BUILD.
+
+Beyond the `keep` most recently used snapshots, older ones are pruned,
+except any used within the last `min_age` seconds: another make may have
+picked it moments ago and still be compiling into it or running from it.
+Picking and pruning hold an exclusive lock on ROOT/.lock, so a concurrent
+make can neither reuse a snapshot while it is being removed nor have its
+fresh one counted as stale.
+
+Usage: python buildcache.py [--root DIR] [--sim SIM] [--toplevel TOP]
+                            [--flags=FLAGS] [--keep N] [--min-age SECONDS] SOURCE ...
+"""
+import argparse
+import fcntl
+import hashlib
+import os
+import shutil
+import sys
+import time
+
+KEY_LENGTH = 16
+MIN_AGE = 3600  # Seconds a used snapshot is safe from pruning
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents, read in 1 MiB chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(sources, sim="icarus", toplevel="", flags=""):
+    """Hex key for one compile configuration"""
+    try:
+        import cocotb
+
+        cocotb_version = cocotb.__version__
+    except ImportError:
+        cocotb_version = "none"
+
+    digest = hashlib.sha256()
+    for part in (sim, toplevel.strip(), " ".join(flags.split()), cocotb_version):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    for source in sources:
+        # Order matters to the compiler; the directory a source lives in does not
+        digest.update(os.path.basename(source).encode())
+        digest.update(b"\0")
+        digest.update(file_digest(source).encode() if os.path.exists(source) else b"missing")
+        digest.update(b"\0")
+    return digest.hexdigest()[:KEY_LENGTH]
+
+
+def snapshot_dir(root, sources, sim="icarus", toplevel="", flags=""):
+    name = f"{toplevel.strip() or 'top'}-{sim}-{cache_key(sources, sim, toplevel, flags)}"
+    return os.path.join(root, name)
+
+
+def reuse(snapshot):
+    """Marks a snapshot as fresh so make does not rebuild it after a source touch"""
+    now = time.time()
+    for entry in os.scandir(snapshot):
+        if entry.is_file():
+            os.utime(entry.path, (now, now))
+    os.utime(snapshot, (now, now))
+
+
+def prune(root, keep, min_age=MIN_AGE):
+    """Removes all but the `keep` most recently used snapshots, sparing any used in the last min_age seconds"""
+    snapshots = [entry for entry in os.scandir(root) if entry.is_dir() and entry.name.count("-") >= 2]
+    snapshots.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    cutoff = time.time() - min_age
+    for entry in snapshots[keep:]:
+        if entry.stat().st_mtime < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sources", nargs="*")
+    parser.add_argument("--root", default="sim_build", help="directory holding the snapshots")
+    parser.add_argument("--sim", default="icarus")
+    parser.add_argument("--toplevel", default="")
+    parser.add_argument("--flags", default="", help="compile flags and defines")
+    parser.add_argument("--keep", type=int, default=16, help="snapshots to keep")
+    parser.add_argument("--min-age", type=float, default=MIN_AGE, help="never prune snapshots used this recently (s)")
+    args = parser.parse_args(argv)
+
+    snapshot = snapshot_dir(args.root, args.sources, args.sim, args.toplevel, args.flags)
+    os.makedirs(args.root, exist_ok=True)
+    with open(os.path.join(args.root, ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if os.path.isdir(snapshot):
+            reuse(snapshot)
+        else:
+            os.makedirs(snapshot)
+        prune(args.root, args.keep, args.min_age)
+    print(snapshot)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
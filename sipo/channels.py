@@ -0,0 +1,182 @@
+"""Per-channel views of the sipo_multi top
+
+sipo_multi packs one bit per channel into CS, D and lsb_sel, and each
+channel has its own slice of Latch_Q, uo_out and SIPO_Q. A PackedBus keeps
+the driven value of a packed input in Python, so concurrent LM70 tasks
+can each write their own bit without overwriting the others' bits in the
+same delta cycle. A Channel looks like the single-channel DUT to LM70
+(`SC`, `CS`, `D`, `lsb_sel`), so the models run unchanged.
+
+ChannelMonitor gives every channel its own OutputMonitor-style queue fed
+by a single watcher on the packed CS, so a Scoreboard per channel checks
+sipo_multi exactly as it checks a single-channel top:
+
+    monitor = ChannelMonitor(dut, sensors)
+    scoreboards = [Scoreboard(channel, golden, monitor.channel(channel.index)) for channel in sensors]
+"""
+import cocotb
+from cocotb.queue import Queue
+from cocotb.triggers import Edge, ReadOnly
+from cocotb.utils import get_sim_time
+
+from monitor import CS_RISE, Transaction
+
+
+class PackedBus:
+    """Bitwise writer for a packed input vector shared by several tasks"""
+
+    def __init__(self, handle, initial=0):
+        self.handle = handle
+        self.bits = initial
+        handle.value = initial
+
+    def set(self, index, bit):
+        if bit:
+            self.bits |= 1 << index
+        else:
+            self.bits &= ~(1 << index)
+        self.handle.value = self.bits
+
+    def bit(self, index):
+        return BusBit(self, index)
+
+
+class BusBit:
+    """One bit of a PackedBus with a handle-like `.value`"""
+
+    __slots__ = ("bus", "index", "_name")
+
+    def __init__(self, bus, index):
+        self.bus = bus
+        self.index = index
+        self._name = f"{bus.handle._name}[{index}]"
+
+    @property
+    def value(self):
+        return (self.bus.bits >> self.index) & 1
+
+    @value.setter
+    def value(self, bit):
+        self.bus.set(self.index, int(bit))
+
+
+class Channel:
+    """Channel `index` of a sipo_multi DUT"""
+
+    def __init__(self, dut, index, cs, d, lsb_sel):
+        self.dut = dut
+        self.index = index
+        self.SC = dut.SC
+        self.CS = cs.bit(index)
+        self.D = d.bit(index)
+        self.lsb_sel = lsb_sel.bit(index)
+        self._log = dut._log
+        self._name = f"{dut._name}.channel[{index}]"
+
+    # Each returns None while any bit of this channel's slice is X or Z
+
+    def latch_q(self):
+        return _slice(self.dut.Latch_Q.value, self.index, 8)
+
+    def uo_out(self):
+        return _slice(self.dut.uo_out.value, self.index, 7)
+
+    def sipo_q(self):
+        return _slice(self.dut.SIPO_Q.value, self.index, 16)
+
+
+def _slice(sample, index, width):
+    # Channel `index` of a packed sample; other channels' X bits do not matter
+    if sample.is_resolvable:
+        return (sample.integer >> (width * index)) & ((1 << width) - 1)
+    bits = sample.binstr  # MSB first
+    end = len(bits) - width * index
+    field = bits[end - width:end]
+    return int(field, 2) if not field.strip("01") else None
+
+
+class ChannelMonitor:
+    """Publishes a Transaction to a channel's queue when that channel's CS rises
+
+    One task watches the packed CS and samples the packed outputs once per
+    change, however many channels there are. lsb_sel changes are not
+    watched: the channels are driven with it held.
+    """
+
+    def __init__(self, dut, sensors):
+        self.dut = dut
+        self.sensors = sensors
+        self.queues = [Queue() for _ in sensors]
+        self._task = None
+
+    def channel(self, index):
+        """Monitor view of one channel, for Scoreboard(channel, golden, monitor)"""
+        return _ChannelQueue(self, self.queues[index])
+
+    def start(self):
+        if self._task is None:
+            self._task = cocotb.start_soon(self._watch())
+        return self
+
+    def stop(self):
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+
+    async def _watch(self):
+        dut = self.dut
+        edge = Edge(dut.CS)
+        read_only = ReadOnly()
+        # The chip selects are driven from Python (PackedBus), so CS itself is never X
+        cs = dut.CS.value.integer
+        while True:
+            await edge
+            await read_only
+            previous, cs = cs, dut.CS.value.integer
+            rose = ~previous & cs
+            if not rose:
+                continue
+            time_ps = get_sim_time("ps")
+            sipo_q = dut.SIPO_Q.value
+            latch_q = dut.Latch_Q.value
+            uo_out = dut.uo_out.value
+            lsb_sel = dut.lsb_sel.value
+            for channel in self.sensors:
+                i = channel.index
+                if rose >> i & 1:
+                    self.queues[i].put_nowait(
+                        Transaction(
+                            time_ps,
+                            CS_RISE,
+                            _slice(sipo_q, i, 16),
+                            _slice(latch_q, i, 8),
+                            None,  # sipo_multi has no per-nibble ports
+                            None,
+                            _slice(lsb_sel, i, 1),
+                            _slice(uo_out, i, 7),
+                        )
+                    )
+
+
+class _ChannelQueue:
+    # What Scoreboard needs from a monitor: a queue, start() and stop()
+
+    def __init__(self, monitor, queue):
+        self.monitor = monitor
+        self.queue = queue
+
+    def start(self):
+        self.monitor.start()
+        return self
+
+    def stop(self):
+        self.monitor.stop()
+
+
+def channels(dut):
+    """Channel views for every sensor of a sipo_multi DUT, with CS idle high"""
+    count = len(dut.CS)
+    cs = PackedBus(dut.CS, (1 << count) - 1)
+    d = PackedBus(dut.D)
+    lsb_sel = PackedBus(dut.lsb_sel)
+    return [Channel(dut, index, cs, d, lsb_sel) for index in range(count)]
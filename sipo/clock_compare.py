@@ -0,0 +1,76 @@
+"""Compares the cost of free-running clocks on long runs
+
+Runs the bench_clock workload once per clock implementation:
+    coroutine  the old clock_gen loop (two Python resumes per cycle)
+    cocotb     cocotb.clock.Clock
+    hdl        hdl_clock.HdlClock, toggled inside the simulator
+and prints wall time, cycles/sec and the speedup over the coroutine loop.
+
+Usage: python clock_compare.py [--design DESIGN] [--cycles N ...] [--modes ...]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+
+import runner
+
+MODES = ("coroutine", "cocotb", "hdl")
+CYCLES = (100_000, 1_000_000, 10_000_000)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--design", default="sipo_with_latch_mux", choices=runner.DESIGNS)
+    parser.add_argument("--cycles", nargs="+", type=int, default=list(CYCLES))
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--out", default="bench_build/clocks")
+    parser.add_argument("--var", action="append", default=[], help="extra make variable, e.g. PDK_PATH=...")
+    args = parser.parse_args(argv)
+
+    variables = dict(item.split("=", 1) for item in args.var)
+    variables["MODULE"] = "bench_clock"
+    variables.setdefault("WAVES", "0")
+    out_dir = os.path.abspath(args.out)
+    sim_build = os.path.join(out_dir, "sim_build")
+    shutil.rmtree(sim_build, ignore_errors=True)
+    os.makedirs(out_dir, exist_ok=True)
+
+    build = runner.compile_design(args.design, sim_build, variables, log_path=os.path.join(out_dir, "compile.log"))
+    if not build.ok:
+        print(f"{args.design}: compile failed, see {build.log_path}")
+        return 1
+
+    failed = False
+    for cycles in args.cycles:
+        baseline = None
+        for mode in args.modes:
+            report_path = os.path.join(out_dir, f"report_{mode}_{cycles}.json")
+            result = runner.run_design(
+                args.design,
+                sim_build,
+                os.path.join(out_dir, f"results_{mode}_{cycles}.xml"),
+                variables,
+                env={"CLOCK_BENCH_MODE": mode, "CLOCK_BENCH_CYCLES": cycles, "CLOCK_BENCH_REPORT": report_path},
+                log_path=os.path.join(out_dir, f"run_{mode}_{cycles}.log"),
+            )
+            if not result.ok or not os.path.exists(report_path):
+                print(f"{mode:10s} {cycles:9d} cycles  FAILED, see {result.log_path}")
+                failed = True
+                continue
+            with open(report_path) as f:
+                report = json.load(f)
+            if mode == "coroutine":
+                baseline = report["wall_time"]
+            speedup = f"x{baseline / report['wall_time']:7.1f}" if baseline and report["wall_time"] else ""
+            native = "" if mode != "hdl" or report["native"] else "  (no hdl_clocks root, Python fallback)"
+            print(
+                f"{mode:10s} {cycles:9d} cycles  wall {report['wall_time']:8.2f} s  "
+                f"{report['cycles_per_sec']:12.0f} cycles/s  {speedup}{native}"
+            )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+// Display Scan Controller
+
+// Alternates lsb_sel from clk so the two digits of the display are scanned
+// without testbench involvement. Each digit stays enabled for REFRESH_DIV
+// clk cycles; digit_en is one-hot with [0] = LSB digit, [1] = MSB digit.
+
+module display_scan #(
+    parameter REFRESH_DIV = 4          // clk cycles per digit
+) (
+    input clk,                         // Scan clock
+    input RESET_N,                     // Reset (Active Low)
+    output reg lsb_sel,                // 0 shows Latch_Q_LSB, 1 shows Latch_Q_MSB
+    output [1:0] digit_en              // One-hot digit enables
+);
+
+    reg [31:0] count;                  // clk cycles spent on the current digit
+
+    always @(posedge clk or negedge RESET_N) begin
+        if (!RESET_N) begin
+            count <= 0;
+            lsb_sel <= 1'b0;
+        end
+        else if (count == REFRESH_DIV - 1) begin
+            count <= 0;
+            lsb_sel <= ~lsb_sel;       // Move to the other digit
+        end
+        else
+            count <= count + 1;
+    end
+
+    assign digit_en = lsb_sel ? 2'b10 : 2'b01;
+
+endmodule
+
+
+// SIPO with Latch and MUX, with the display scanned from clk
+
+module sipo_scan_display #(
+    parameter REFRESH_DIV = 4          // clk cycles per digit
+) (
+    input CS,                          // Chip Select (Active Low)
+    input SC,                          // Serial Clock
+    input RESET_N,                     // Reset (Active Low)
+    input D,                           // Serial Data Input
+    input clk,                         // Display scan clock
+    output [7:0] Latch_Q,              // 8-bit output from the latch
+    output [6:0] uo_out,               // Seven-segment output of the enabled digit
+    output [15:0] SIPO_Q,              // SIPO output
+    output [1:0] digit_en,             // One-hot digit enables
+    output lsb_sel                     // Current scan position
+);
+
+    display_scan #(.REFRESH_DIV(REFRESH_DIV)) scan (
+        .clk(clk),
+        .RESET_N(RESET_N),
+        .lsb_sel(lsb_sel),
+        .digit_en(digit_en)
+    );
+
+    sipo_with_latch_mux core (
+        .CS(CS),
+        .SC(SC),
+        .RESET_N(RESET_N),
+        .D(D),
+        .lsb_sel(lsb_sel),
+        .clk(clk),
+        .Latch_Q(Latch_Q),
+        .uo_out(uo_out),
+        .SIPO_Q(SIPO_Q)
+    );
+
+endmodule
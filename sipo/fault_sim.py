@@ -0,0 +1,324 @@
+"""Bit-parallel stuck-at fault simulation of the sipo_with_latch_mux netlist
+
+The UDP cells of the PRIMS=pdk build are simulated cycle by cycle in
+NumPy, with one machine per bit of a uint64 word: bit 0 of word 0 is the
+fault-free machine, and every other bit carries one single stuck-at
+fault. Every signal is an array of machine words, so all the faulty
+machines step together with a few array operations per SC edge.
+
+Fault list (stuck-at-0 and stuck-at-1 on each pin):
+    sipo_inst.dff_inst[i].dff                 udp_dff$PR      D, CLK, Q   (16 cells)
+    latch_inst.dlatch_instance[i].dlatch_inst udp_dlatch$PR   D, GATE, Q  (8 cells)
+    mux_display.mux_loop[i].mux_instance      udp_mux_2to1    A0, A1, S, X (4 cells)
+Reset pins are left out: the tests only reset with SC parked, so a
+flop that never resets differs only in its unknown power-up value.
+
+The stimulus is driven the way LM70.send_frames drives it: CS low, 16
+bits on falling SC edges, a 17th rising edge to load SIPO_Q, CS high,
+then `gap` idle cycles. Like the scoreboard, the engine compares SIPO_Q,
+Latch_Q and uo_out at every CS rising edge and after every lsb_sel
+change. A fault is detected when any compared bit of its machine differs
+from the fault-free machine. The fault-free machine is also checked
+against the golden model.
+
+Stimulus comes from a replay recording (--replay), from the greedy
+coverage-closure frames (--directed) or from random frames (--random N).
+
+Usage: python fault_sim.py [--replay FILE | --directed | --random N] [--seed S]
+                           [--observe SIPO_Q Latch_Q uo_out] [--json FILE] [--show-detected]
+"""
+import argparse
+import collections
+import json
+import random
+import sys
+import time
+
+import numpy as np
+
+from golden_model import SEVEN_SEGMENT, GoldenModel
+
+ALL = np.uint64(0xFFFFFFFFFFFFFFFF)
+OUTPUTS = ("SIPO_Q", "Latch_Q", "uo_out")
+
+Fault = collections.namedtuple("Fault", ["cell", "index", "pin", "value"])
+Frame = collections.namedtuple("Frame", ["word", "lsb_sel", "gap", "reset"])
+
+CELLS = (
+    # cell kind, instance path, count, pins
+    ("dff", "sipo_inst.dff_inst[{}].dff", 16, ("D", "CLK", "Q")),
+    ("dlatch", "latch_inst.dlatch_instance[{}].dlatch_inst", 8, ("D", "GATE", "Q")),
+    ("mux", "mux_display.mux_loop[{}].mux_instance", 4, ("A0", "A1", "S", "X")),
+)
+_PATHS = {kind: path for kind, path, _, _ in CELLS}
+
+
+def fault_list():
+    """Every single stuck-at fault on the UDP cell pins"""
+    return [
+        Fault(kind, index, pin, value)
+        for kind, _, count, pins in CELLS
+        for index in range(count)
+        for pin in pins
+        for value in (0, 1)
+    ]
+
+
+def fault_name(fault):
+    return f"{_PATHS[fault.cell].format(fault.index)}.{fault.pin}/SA{fault.value}"
+
+
+def _bits(values, width):
+    """(width, ...) array of 0/1 for each bit of integer `values`"""
+    return (np.asarray(values)[None, ...] >> np.arange(width).reshape((width,) + (1,) * np.ndim(values))) & 1
+
+
+# bcd_to_seven_segment as a sum of minterms: _SEGMENT_CODES[j, c] is set when code c drives segment j
+_SEGMENT_CODES = _bits(SEVEN_SEGMENT.astype(np.int64), 7).astype(bool)
+_CODE_BITS = _bits(np.arange(16), 4).T.astype(bool)  # (16 codes, 4 bits)
+
+
+class FaultMachines:
+    """State of the fault-free machine and every faulty machine, one per bit"""
+
+    def __init__(self, faults):
+        self.faults = faults
+        self.machines = len(faults) + 1  # Machine 0 is fault free
+        self.words = -(-self.machines // 64)
+        self.masks = {}
+        for machine, fault in enumerate(faults, start=1):
+            key = (fault.cell, fault.pin, fault.value)
+            if key not in self.masks:
+                count = next(count for kind, _, count, _ in CELLS if kind == fault.cell)
+                self.masks[key] = np.zeros((count, self.words), dtype=np.uint64)
+            self.masks[key][fault.index, machine // 64] |= np.uint64(1 << (machine % 64))
+        self.dff = np.zeros((16, self.words), dtype=np.uint64)
+        self.sipo_q = np.zeros((16, self.words), dtype=np.uint64)  # Behavioral output register
+        self.latch = np.zeros((8, self.words), dtype=np.uint64)
+        self.cs = ALL
+        self.lsb_sel = np.uint64(0)
+        self.d = np.uint64(0)
+
+    def _pin(self, cell, pin, value):
+        """Applies the stuck-at masks of one pin to its fault-free value"""
+        sa0 = self.masks.get((cell, pin, 0))
+        sa1 = self.masks.get((cell, pin, 1))
+        if sa0 is not None:
+            value = value & ~sa0
+        if sa1 is not None:
+            value = value | sa1
+        return value
+
+    def reset(self):
+        """RESET_N pulse with SC parked: the flops and latches clear, SIPO_Q keeps its value"""
+        self.dff[:] = 0
+        self.latch[:] = 0
+        self._update_latch()
+
+    def dff_q(self):
+        return self._pin("dff", "Q", self.dff)
+
+    def _update_latch(self):
+        # Data_in = {SIPO_Q[14:8], 1'b0}; GATE = ~CS
+        data = np.zeros_like(self.latch)
+        data[1:] = self.sipo_q[8:15]
+        data = self._pin("dlatch", "D", data)
+        gate = self._pin("dlatch", "GATE", np.broadcast_to(~self.cs, self.latch.shape))
+        self.latch = (data & gate) | (self.latch & ~gate)
+
+    def set_inputs(self, cs=None, d=None, lsb_sel=None):
+        """Input changes on a falling SC edge"""
+        if cs is not None:
+            self.cs = ALL if cs else np.uint64(0)
+        if d is not None:
+            self.d = ALL if d else np.uint64(0)
+        if lsb_sel is not None:
+            self.lsb_sel = ALL if lsb_sel else np.uint64(0)
+        self._update_latch()
+
+    def rising_edge(self):
+        q = self.dff_q()
+        if not self.cs:
+            self.sipo_q = q.copy()  # Nonblocking: SIPO_Q takes the chain before it shifts
+        d = np.empty_like(self.dff)
+        d[0] = self.d
+        d[1:] = q[:-1]
+        d = self._pin("dff", "D", d)
+        # A stuck CLK pin never clocks, so that flop keeps its state
+        hold = self.masks.get(("dff", "CLK", 0), np.uint64(0)) | self.masks.get(("dff", "CLK", 1), np.uint64(0))
+        self.dff = (self.dff & hold) | (d & ~hold)
+        self._update_latch()
+
+    def outputs(self):
+        """Output bits, (16 + 8 + 7, words) for SIPO_Q, Latch_Q, uo_out"""
+        latch_q = self._pin("dlatch", "Q", self.latch)
+        a0 = self._pin("mux", "A0", latch_q[:4])
+        a1 = self._pin("mux", "A1", latch_q[4:])
+        s = self._pin("mux", "S", np.broadcast_to(self.lsb_sel, a0.shape))
+        bcd = self._pin("mux", "X", (a1 & s) | (a0 & ~s))
+        # One minterm per code, then OR the codes that light each segment
+        literals = np.where(_CODE_BITS[:, :, None], bcd[None], ~bcd[None])
+        minterms = np.bitwise_and.reduce(literals, axis=1)
+        segments = np.bitwise_or.reduce(np.where(_SEGMENT_CODES[:, :, None], minterms[None], np.uint64(0)), axis=1)
+        return {"SIPO_Q": self.sipo_q, "Latch_Q": latch_q, "uo_out": segments}
+
+    @staticmethod
+    def machine_value(bits, machine=0):
+        """Integer value of an output for one machine"""
+        word, bit = divmod(machine, 64)
+        lanes = (bits[:, word] >> np.uint64(bit)) & np.uint64(1)
+        return int((lanes.astype(np.int64) << np.arange(bits.shape[0])).sum())
+
+
+def simulate(frames, faults=None, observe=OUTPUTS):
+    """Runs every frame on all machines
+
+    Returns (faults, first_detection) where first_detection[k] is the index
+    of the frame whose strobe first exposed fault k, or -1 if it never did.
+    """
+    faults = fault_list() if faults is None else faults
+    machines = FaultMachines(faults)
+    golden = GoldenModel()
+    detected = np.zeros(machines.words, dtype=np.uint64)
+    first_detection = np.full(len(faults), -1, dtype=np.int64)
+
+    def strobe(index, word):
+        nonlocal detected
+        outputs = machines.outputs()
+        if word is not None:
+            good = {name: machines.machine_value(outputs[name]) for name in OUTPUTS}
+            expected = {
+                "SIPO_Q": word,
+                "Latch_Q": golden.latch_q(word),
+                "uo_out": golden.uo_out(word, int(bool(machines.lsb_sel))),
+            }
+            if good != expected:
+                raise AssertionError(f"frame {index}: fault-free machine gives {good}, golden model {expected}")
+        diff = np.zeros(machines.words, dtype=np.uint64)
+        for name in observe:
+            bits = outputs[name]
+            good_bits = np.where(bits[:, 0] & np.uint64(1), ALL, np.uint64(0))[:, None]
+            diff |= np.bitwise_or.reduce(bits ^ good_bits, axis=0)
+        new = diff & ~detected
+        if new.any():
+            detected |= new
+            lanes = np.unpackbits(new.view(np.uint8), bitorder="little")[1:len(faults) + 1]
+            first_detection[lanes.astype(bool)] = index
+
+    machines.reset()
+    held = None  # Word held by the latch, once a frame has completed
+    for index, frame in enumerate(frames):
+        if frame.reset and index:
+            machines.reset()
+            held = None
+        if frame.lsb_sel != bool(machines.lsb_sel):
+            machines.set_inputs(lsb_sel=frame.lsb_sel)
+            if held is not None:
+                strobe(index, held)
+        machines.set_inputs(cs=0, d=(frame.word >> 15) & 1)
+        for bit in range(14, -2, -1):
+            machines.rising_edge()
+            if bit >= 0:
+                machines.set_inputs(d=(frame.word >> bit) & 1)
+        machines.rising_edge()  # 17th rising edge moves the shift chain into SIPO_Q
+        machines.set_inputs(cs=1)
+        strobe(index, frame.word)
+        held = frame.word
+        for _ in range(frame.gap):
+            machines.rising_edge()
+    return faults, first_detection
+
+
+def random_frames(count, rng):
+    return [Frame(rng.getrandbits(16), rng.getrandbits(1), 1, False) for _ in range(count)]
+
+
+def directed_frames(rng):
+    """The frames DirectedStimulus picks until functional coverage closes"""
+    from func_coverage import Coverage, DirectedStimulus
+
+    coverage = Coverage()
+    stimulus = DirectedStimulus(coverage, rng)
+    golden = GoldenModel()
+    frames = []
+    while True:
+        choice = stimulus.next_frame()
+        if choice is None:
+            return frames
+        word, lsb_sel = choice
+        coverage.sample_word(word)
+        latch_q = golden.latch_q(word)
+        coverage.sample_latch(latch_q)
+        coverage.sample_display(lsb_sel, latch_q, golden.uo_out(word, lsb_sel))
+        frames.append(Frame(word, lsb_sel, 1, False))
+
+
+def replay_frames(path):
+    import replay
+
+    records = replay.load(path).records
+    return [
+        Frame(word, bool(flags & replay.LSB_SEL), gap, False)  # A recording holds no resets after the first
+        for word, flags, gap in zip(records["word"].tolist(), records["flags"].tolist(), records["gap"].tolist())
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--replay", help="replay recording to use as the stimulus")
+    source.add_argument("--directed", action="store_true", help="coverage-closure frames from func_coverage")
+    source.add_argument("--random", type=int, default=256, help="random frames (default)")
+    parser.add_argument("--seed", type=int, default=21)
+    parser.add_argument("--observe", nargs="+", choices=OUTPUTS, default=list(OUTPUTS))
+    parser.add_argument("--json", help="write per-fault results to this file")
+    parser.add_argument("--show-detected", action="store_true", help="list detected faults as well")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    if args.replay:
+        frames, label = replay_frames(args.replay), args.replay
+    elif args.directed:
+        frames, label = directed_frames(rng), "directed"
+    else:
+        frames, label = random_frames(args.random, rng), f"random seed {args.seed}"
+
+    start = time.perf_counter()
+    faults, first_detection = simulate(frames, observe=args.observe)
+    elapsed = time.perf_counter() - start
+
+    detected = first_detection >= 0
+    print(
+        f"{len(frames)} frames ({label}), {len(faults)} faults, observing {', '.join(args.observe)}: "
+        f"{int(detected.sum())} detected, stuck-at coverage {100.0 * detected.mean():.1f}% in {elapsed:.2f} s"
+    )
+    for kind, path, _, _ in CELLS:
+        in_cell = np.array([fault.cell == kind for fault in faults])
+        print(f"  {path.format('*'):45s} {int((detected & in_cell).sum()):3d}/{int(in_cell.sum()):3d}")
+    for fault, frame in zip(faults, first_detection.tolist()):
+        if frame < 0:
+            print(f"  undetected  {fault_name(fault)}")
+        elif args.show_detected:
+            print(f"  frame {frame:5d}  {fault_name(fault)}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "stimulus": label,
+                    "frames": len(frames),
+                    "observe": args.observe,
+                    "coverage": float(detected.mean()),
+                    "faults": [
+                        {"fault": fault_name(fault), "first_frame": frame}
+                        for fault, frame in zip(faults, first_detection.tolist())
+                    ],
+                },
+                f,
+                indent=1,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""Functional coverage for the LM70 -> seven-segment pipeline
+
+Coverpoints:
+    sign         LM70 sign bit (D15)
+    degrees      integer temperature in 10 degC ranges over the LM70's
+                 -55..150 degC span, plus below/above-spec bins
+    fraction     the two fraction bits (0.25 degC steps)
+    latch_msb    Latch_Q_MSB nibble, 0-15 (10-15 are invalid BCD)
+    latch_lsb    Latch_Q_LSB nibble, 0-15
+    display      lsb_sel x displayed nibble (includes the invalid-BCD states)
+    uo_out       seven-segment patterns (8 and invalid BCD share 1111111)
+
+Word bins are sampled from the driven word; latch, display and uo_out bins
+come from the values the monitor actually observed. Reachability is
+derived from the golden model. Because Latch_Q is {SIPO_Q[14:8], 0}, the
+odd Latch_Q_LSB values can never occur; such bins are reported but left
+out of closure.
+
+DirectedStimulus picks each frame (word, lsb_sel) greedily: out of all
+131,072 choices it takes the one that hits the most unhit bins, so closure
+needs close to the minimum number of frames.
+
+Databases are JSON files. Runs merge by adding their hit counts.
+
+Usage: python func_coverage.py report DB.json
+       python func_coverage.py merge OUT.json DB.json [DB.json ...]
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+from golden_model import SEVEN_SEGMENT, build_table
+
+DB_VERSION = 1
+
+# 10 degC ranges across the LM70 span; values below -55 or above 150 get their own bins
+DEGREE_EDGES = np.array([-55] + list(range(-45, 150, 10)) + [151])
+
+
+def _degree_labels():
+    labels = ["<-55"]
+    for low, high in zip(DEGREE_EDGES[:-1], DEGREE_EDGES[1:]):
+        labels.append(f"{low}..{high - 1}")
+    return labels + [">150"]
+
+
+UO_OUT_PATTERNS = [int(code) for code in dict.fromkeys(SEVEN_SEGMENT.tolist())]
+
+COVERPOINTS = {
+    "sign": ["positive", "negative"],
+    "degrees": _degree_labels(),
+    "fraction": ["0.00", "0.25", "0.50", "0.75"],
+    "latch_msb": [str(n) for n in range(16)],
+    "latch_lsb": [str(n) for n in range(16)],
+    "display": [f"lsb_sel={sel} nibble={n}" for sel in (0, 1) for n in range(16)],
+    "uo_out": ["8/invalid" if code == 0b1111111 else format(code, "07b") for code in UO_OUT_PATTERNS],
+}
+_UO_OUT_INDEX = np.full(128, -1, dtype=np.int64)
+_UO_OUT_INDEX[UO_OUT_PATTERNS] = np.arange(len(UO_OUT_PATTERNS))
+
+
+def word_bins(words):
+    """sign, degrees and fraction bin indices for an array of LM70 words"""
+    words = np.asarray(words, dtype=np.int64)
+    quarter_degrees = words >> 5
+    quarter_degrees = np.where(quarter_degrees >= 1 << 10, quarter_degrees - (1 << 11), quarter_degrees)
+    return {
+        "sign": words >> 15,
+        "degrees": np.digitize(quarter_degrees >> 2, DEGREE_EDGES),
+        "fraction": quarter_degrees & 3,
+    }
+
+
+def frame_bins():
+    """Bin indices of every (lsb_sel, word) frame, shaped (2, 65536), from the golden model"""
+    table = build_table()
+    bins = {name: np.broadcast_to(index, (2, index.size)) for name, index in word_bins(table["SIPO_Q"]).items()}
+    bins["latch_msb"] = np.broadcast_to(table["Latch_Q_MSB"].astype(np.int64), (2, 1 << 16))
+    bins["latch_lsb"] = np.broadcast_to(table["Latch_Q_LSB"].astype(np.int64), (2, 1 << 16))
+    bins["display"] = np.arange(2)[:, None] * 16 + table["bcd_data"].T.astype(np.int64)
+    bins["uo_out"] = _UO_OUT_INDEX[table["uo_out"].T]
+    return bins
+
+
+_FRAME_BINS = None
+_REACHABLE = None
+
+
+def _frame_bins():
+    global _FRAME_BINS
+    if _FRAME_BINS is None:
+        _FRAME_BINS = frame_bins()
+    return _FRAME_BINS
+
+
+def reachable():
+    """Boolean mask per coverpoint of the bins any frame can hit"""
+    global _REACHABLE
+    if _REACHABLE is None:
+        _REACHABLE = {}
+        for name, labels in COVERPOINTS.items():
+            mask = np.zeros(len(labels), dtype=bool)
+            mask[np.unique(_frame_bins()[name])] = True
+            _REACHABLE[name] = mask
+    return _REACHABLE
+
+
+class Coverage:
+    """Hit counts per coverpoint bin"""
+
+    def __init__(self):
+        self.hits = {name: np.zeros(len(labels), dtype=np.int64) for name, labels in COVERPOINTS.items()}
+        self.frames = 0
+        self.runs = 1
+
+    def sample_word(self, word):
+        hits = self.hits
+        for name, index in word_bins(word).items():
+            hits[name][int(index)] += 1
+        self.frames += 1
+
+    def sample_latch(self, latch_q):
+        self.hits["latch_msb"][latch_q >> 4] += 1
+        self.hits["latch_lsb"][latch_q & 0xF] += 1
+
+    def sample_display(self, lsb_sel, latch_q, uo_out):
+        nibble = latch_q >> 4 if lsb_sel else latch_q & 0xF
+        self.hits["display"][lsb_sel * 16 + nibble] += 1
+        pattern = _UO_OUT_INDEX[uo_out & 0x7F]
+        if pattern >= 0:
+            self.hits["uo_out"][pattern] += 1
+
+    def sample_frame(self, word, tx):
+        """Samples a driven word and the monitor transaction taken when its CS rose"""
+        self.sample_word(word)
+        if tx.latch_q is not None:
+            self.sample_latch(tx.latch_q)
+            if tx.lsb_sel is not None and tx.uo_out is not None:
+                self.sample_display(tx.lsb_sel, tx.latch_q, tx.uo_out)
+
+    # Closure
+
+    def holes(self):
+        """Reachable bins that have not been hit, per coverpoint"""
+        masks = reachable()
+        return {
+            name: [COVERPOINTS[name][i] for i in np.flatnonzero((hits == 0) & masks[name])]
+            for name, hits in self.hits.items()
+        }
+
+    def closed(self):
+        return not any(self.holes().values())
+
+    def percent(self):
+        masks = reachable()
+        total = sum(int(mask.sum()) for mask in masks.values())
+        hit = sum(int(((self.hits[name] > 0) & mask).sum()) for name, mask in masks.items())
+        return 100.0 * hit / total
+
+    def report(self):
+        masks = reachable()
+        lines = [f"{self.percent():.1f}% of reachable bins hit over {self.frames} frames in {self.runs} run(s)"]
+        for name, hits in self.hits.items():
+            mask = masks[name]
+            hit = int(((hits > 0) & mask).sum())
+            lines.append(f"  {name:10s} {hit:3d}/{int(mask.sum()):3d}")
+            holes = [COVERPOINTS[name][i] for i in np.flatnonzero((hits == 0) & mask)]
+            if holes:
+                lines.append(f"    holes: {', '.join(holes)}")
+            unreachable = [COVERPOINTS[name][i] for i in np.flatnonzero(~mask)]
+            if unreachable:
+                lines.append(f"    unreachable: {', '.join(unreachable)}")
+        return "\n".join(lines)
+
+    # Databases
+
+    def to_dict(self):
+        return {
+            "version": DB_VERSION,
+            "frames": self.frames,
+            "runs": self.runs,
+            "coverpoints": {
+                name: {"bins": COVERPOINTS[name], "hits": hits.tolist()} for name, hits in self.hits.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != DB_VERSION:
+            raise ValueError(f"Unsupported coverage database version {data.get('version')}")
+        coverage = cls()
+        coverage.frames = data["frames"]
+        coverage.runs = data["runs"]
+        for name, point in data["coverpoints"].items():
+            if point["bins"] != COVERPOINTS.get(name):
+                raise ValueError(f"Coverpoint {name} has different bins than this model")
+            coverage.hits[name][:] = point["hits"]
+        return coverage
+
+    def merge(self, other):
+        for name, hits in other.hits.items():
+            self.hits[name] += hits
+        self.frames += other.frames
+        self.runs += other.runs
+        return self
+
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+class DirectedStimulus:
+    """Chooses (word, lsb_sel) frames that hit the most bins still unhit in `coverage`"""
+
+    def __init__(self, coverage, rng):
+        self.coverage = coverage
+        self.rng = rng
+        self.bins = _frame_bins()
+
+    def next_frame(self):
+        """Returns (word, lsb_sel), or None once no frame can hit a new bin"""
+        gain = np.zeros((2, 1 << 16), dtype=np.int64)
+        for name, index in self.bins.items():
+            gain += (self.coverage.hits[name] == 0)[index]
+        best = gain.max()
+        if best == 0:
+            return None
+        candidates = np.flatnonzero(gain.ravel() == best)
+        choice = int(candidates[self.rng.randrange(len(candidates))])
+        lsb_sel, word = divmod(choice, 1 << 16)
+        return word, lsb_sel
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    report = commands.add_parser("report", help="print the bins and holes of a database")
+    report.add_argument("db")
+    merge = commands.add_parser("merge", help="add the hit counts of several databases")
+    merge.add_argument("out")
+    merge.add_argument("dbs", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.command == "report":
+        print(Coverage.load(args.db).report())
+        return 0
+    merged = Coverage.load(args.dbs[0])
+    for path in args.dbs[1:]:
+        merged.merge(Coverage.load(path))
+    merged.save(args.out)
+    print(merged.report())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
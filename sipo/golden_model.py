@@ -0,0 +1,114 @@
+"""Reference model of the SIPO -> latch -> mux -> seven-segment pipeline
+
+The model is evaluated for all 65,536 LM70 words in one vectorized NumPy
+pass and kept as a compact structured table indexed by the word, so checking
+a frame is a single array lookup. The table is saved as a .npy file and
+opened memory-mapped, which lets every worker process share the same pages
+instead of rebuilding it.
+
+Usage: python golden_model.py [table.npy]
+"""
+import os
+import sys
+
+import numpy as np
+
+# bcd_to_seven_segment: codes 10-15 are invalid and drive every segment
+SEVEN_SEGMENT = np.array(
+    [
+        0b1111110,  # 0
+        0b0110000,  # 1
+        0b1101101,  # 2
+        0b1111001,  # 3
+        0b0110010,  # 4
+        0b1011011,  # 5
+        0b1011111,  # 6
+        0b1110000,  # 7
+        0b1111111,  # 8
+        0b1110011,  # 9
+    ]
+    + [0b1111111] * 6,
+    dtype=np.uint8,
+)
+
+# bcd_data and uo_out are indexed by lsb_sel (0 selects Latch_Q_LSB)
+TABLE_DTYPE = np.dtype(
+    [
+        ("SIPO_Q", np.uint16),
+        ("Latch_Q", np.uint8),
+        ("Latch_Q_MSB", np.uint8),
+        ("Latch_Q_LSB", np.uint8),
+        ("bcd_data", np.uint8, (2,)),
+        ("uo_out", np.uint8, (2,)),
+    ]
+)
+
+DEFAULT_TABLE_PATH = os.environ.get(
+    "GOLDEN_TABLE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden_table.npy")
+)
+
+
+def build_table():
+    """Computes the expected outputs for every 16-bit LM70 word"""
+    words = np.arange(1 << 16, dtype=np.uint32)
+    table = np.empty(words.size, dtype=TABLE_DTYPE)
+
+    latch_q = ((words >> 8) << 1) & 0xFF  # Upper 8 bits, left shifted by 1
+    msb = latch_q >> 4
+    lsb = latch_q & 0xF
+
+    table["SIPO_Q"] = words
+    table["Latch_Q"] = latch_q
+    table["Latch_Q_MSB"] = msb
+    table["Latch_Q_LSB"] = lsb
+    table["bcd_data"][:, 0] = lsb
+    table["bcd_data"][:, 1] = msb
+    table["uo_out"][:, 0] = SEVEN_SEGMENT[lsb]
+    table["uo_out"][:, 1] = SEVEN_SEGMENT[msb]
+    return table
+
+
+def save_table(path=DEFAULT_TABLE_PATH):
+    """Builds the table and writes it atomically to `path`"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, build_table())
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_table(path=DEFAULT_TABLE_PATH):
+    """Opens the persisted table read-only and memory-mapped, building it if missing"""
+    if not os.path.exists(path):
+        save_table(path)
+    table = np.load(path, mmap_mode="r")
+    if table.dtype != TABLE_DTYPE or table.shape != (1 << 16,):
+        save_table(path)
+        table = np.load(path, mmap_mode="r")
+    return table
+
+
+class GoldenModel:
+    """Expected-value lookups for LM70 words"""
+
+    def __init__(self, path=DEFAULT_TABLE_PATH):
+        self.table = load_table(path)
+        self._latch_q = self.table["Latch_Q"]
+        self._uo_out = self.table["uo_out"]
+
+    def __getitem__(self, word):
+        return self.table[word]
+
+    def latch_q(self, word):
+        return int(self._latch_q[word])
+
+    def uo_out(self, word, lsb_sel):
+        return int(self._uo_out[word, lsb_sel])
+
+    def mismatches(self, words, latch_q):
+        """Returns the indices where a recorded Latch_Q array disagrees with the model"""
+        return np.flatnonzero(self._latch_q[np.asarray(words)] != np.asarray(latch_q))
+
+
+if __name__ == "__main__":
+    print(save_table(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TABLE_PATH))
@@ -0,0 +1,239 @@
+"""Clocks generated inside the simulator, controlled from Python
+
+HdlClock drives `SC` or `clk` from a clock_source instance in hdl_clocks.v
+(built in by the Makefile with HDL_CLOCKS=1). Once started, the clock
+toggles without any Python callbacks. Python only writes the control
+registers to start, stop, gate or re-time it. If the harness has no
+hdl_clocks root (HDL_CLOCKS=0, another simulator, or pysim), the same
+interface falls back to a Python coroutine clock.
+
+    clock = HdlClock(dut.SC, 10, units="ns").start()
+    clock.gate(False)          # hold low from the next low phase
+    clock.set_period(20, "ns")
+    clock.stop()               # finish the high phase, park low
+    clock.release()            # stop and hand the port back to Python
+
+Every start/stop/gate/set_period/release is also noted in the port's
+ClockTimeline, from which wavecapture.py redraws the clock exactly without
+watching its edges.
+"""
+import cocotb
+from cocotb.triggers import Event, Timer
+from cocotb.utils import get_sim_steps, get_sim_time
+
+try:
+    from cocotb import simulator
+    from cocotb.handle import SimHandle
+except ImportError:  # Not running under a GPI simulator
+    simulator = None
+
+HDL_CLOCKS_ROOT = "hdl_clocks"
+
+_timelines = {}  # port path -> ClockTimeline
+
+
+def _clock_root():
+    if simulator is None:
+        return None
+    handle = simulator.get_root_handle(HDL_CLOCKS_ROOT)
+    return SimHandle(handle) if handle else None
+
+
+def release_all():
+    """Stops every native clock source and releases the ports it forces"""
+    root = _clock_root()
+    if root is None:
+        return
+    for name in ("sc", "clk"):
+        if hasattr(root, name):
+            source = getattr(root, name)
+            source.run.value = 0
+            source.drive.value = 0
+    for timeline in _timelines.values():
+        if timeline.driven:
+            timeline.record("release")
+
+
+def clock_timeline(signal):
+    """The ClockTimeline of a clock port, created empty on first use"""
+    return _timelines.setdefault(getattr(signal, "_path", signal._name), ClockTimeline())  # pysim handles have no _path
+
+
+class ClockTimeline:
+    """What HdlClock did to one port, in sim time
+
+    Entries are (time_ps, action, value): ("start", (start_high, half_ps)),
+    ("stop", None), ("gate", enabled), ("period", half_ps) or ("release",
+    None). `changed` is set on every entry and `driven` is True from a start
+    until the next release.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.driven = False
+        self.changed = Event()
+
+    def record(self, action, value=None):
+        self.entries.append((get_sim_time("ps"), action, value))
+        if action == "start":
+            self.driven = True
+        elif action == "release":
+            self.driven = False
+        self.changed.set()
+
+    def trace(self, start_ps, end_ps):
+        """Replays clock_source over the entries
+
+        Returns the port value at start_ps (None unless a clock drove it
+        then) and the (time_ps, "0"/"1") changes from start_ps to end_ps
+        while driven. Whole cycles before start_ps are skipped, not stepped.
+        """
+        run = loop = drive = False
+        osc, gate, enable, half = 0, 1, 1, 0
+        edge = 0  # Next toggle while the loop runs
+        value, changes = None, []
+        last = None
+
+        def emit(time_ps):
+            nonlocal value, last
+            bit = "1" if osc and enable else "0"
+            if time_ps < start_ps:
+                value = bit
+            elif time_ps <= end_ps and bit != last:
+                changes.append((time_ps, bit))
+            last = bit
+
+        for time_ps, action, arg in self.entries + [(end_ps + 1, "end", None)]:
+            # Toggles scheduled before this entry
+            while loop and edge < time_ps:
+                limit = min(time_ps, start_ps)
+                if run and edge + 2 * half < limit:
+                    edge += (limit - 1 - edge) // (2 * half) * 2 * half
+                    enable = gate  # A low phase went by
+                    continue
+                osc ^= 1
+                if not osc:
+                    enable = gate
+                if drive:
+                    emit(edge)
+                if run or osc:
+                    edge += half
+                else:
+                    loop = False  # Parked low
+            if action == "end":
+                break
+            if action == "start":
+                start_high, half = arg
+                run = drive = True
+                if not loop:
+                    # clock_source only restarts once the previous run has parked
+                    loop, osc, edge = True, int(start_high), time_ps + half
+                    if not osc:
+                        enable = gate
+                emit(time_ps)
+            elif action == "stop":
+                run = False
+            elif action == "gate":
+                gate = int(arg)
+                if not osc:
+                    enable = gate
+            elif action == "period":
+                half = arg
+            elif action == "release":
+                run = drive = False
+                if time_ps < start_ps:
+                    value = None
+                last = None
+        return value, changes
+
+
+class HdlClock:
+    """Free-running clock on `signal`, native when the harness provides one"""
+
+    def __init__(self, signal, period, units="ns"):
+        self.signal = signal
+        self.half_ps = self._half_ps(period, units)
+        self.source = None
+        root = _clock_root()
+        name = signal._name.lower()
+        if root is not None and hasattr(root, name):
+            self.source = getattr(root, name)
+        self._running = False
+        self._gate = True
+        self._level = False  # Python fallback: current oscillator phase and clock enable
+        self._enable = True
+        self._task = None
+        self.timeline = clock_timeline(signal)
+
+    @property
+    def native(self):
+        return self.source is not None
+
+    @staticmethod
+    def _half_ps(period, units):
+        half = get_sim_steps(period, units) * 1000 // get_sim_steps(1, "ns") // 2
+        if half <= 0:
+            raise ValueError(f"Clock period {period} {units} is below the time precision")
+        return half
+
+    def start(self, start_high=True):
+        """Starts toggling; the first phase is high unless start_high is False"""
+        self._running = True
+        self.timeline.record("start", (bool(start_high), self.half_ps))
+        if self.native:
+            self.source.half_ps.value = self.half_ps
+            self.source.start_high.value = int(start_high)
+            self.source.drive.value = 1
+            self.source.run.value = 1
+        elif self._task is None or self._task.done():
+            self._task = cocotb.start_soon(self._toggle(start_high))
+        return self
+
+    def stop(self):
+        """Finishes the current high phase and parks the clock low"""
+        self._running = False
+        self.timeline.record("stop")
+        if self.native:
+            self.source.run.value = 0
+
+    def release(self):
+        """Stops the clock and hands the port back to Python writes"""
+        self.stop()
+        self.timeline.record("release")
+        if self.native:
+            self.source.drive.value = 0
+        else:
+            if self._task is not None:
+                self._task.kill()
+                self._task = None
+            self.signal.value = 0
+
+    def gate(self, enabled):
+        """Enables or gates the clock; takes effect in the next low phase"""
+        self._gate = bool(enabled)
+        self.timeline.record("gate", self._gate)
+        if self.native:
+            self.source.gate.value = int(enabled)
+        elif not self._level:
+            # Like clock_source, the enable follows the gate for as long as the phase is low
+            self._enable = self._gate
+
+    def set_period(self, period, units="ns"):
+        """Changes the period from the next edge on"""
+        self.half_ps = self._half_ps(period, units)
+        self.timeline.record("period", self.half_ps)
+        if self.native:
+            self.source.half_ps.value = self.half_ps
+
+    async def _toggle(self, start_high):
+        # Python fallback with the same run/gate/park-low behavior as clock_source
+        signal = self.signal
+        self._level = bool(start_high)
+        while True:
+            if not self._level:
+                self._enable = self._gate
+            signal.value = int(self._level and self._enable)
+            if not (self._running or self._level):
+                break
+            await Timer(self.half_ps, units="ps")
+            self._level = not self._level
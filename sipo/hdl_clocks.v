@@ -0,0 +1,52 @@
+// Simulator-native clock sources for the cocotb harness
+//
+// hdl_clocks is elaborated as an extra root module (iverilog -s hdl_clocks),
+// the same way cocotb adds its dump module. Every clock_source toggles
+// inside the simulator, so a free-running clock costs no Python callbacks.
+// hdl_clock.py controls it by writing the run/start_high/gate/half_ps
+// registers. While `drive` is set, the output is forced onto the DUT port
+// named by CLOCK_SC_TARGET / CLOCK_clk_TARGET, e.g.
+// -DCLOCK_SC_TARGET=sipo_with_latch_mux.SC
+
+`timescale 1ps/1ps
+
+module clock_source;
+    reg run = 0;               // Toggle while set; on clear, finish the high phase and park low
+    reg start_high = 1;        // Level of the first phase after run rises
+    reg gate = 1;              // Clock enable, sampled while the oscillator is low
+    reg drive = 0;             // Force the target port while set
+    integer half_ps = 5000;    // Half period in ps, picked up at the next edge
+    reg osc = 0;
+    reg enable = 1;
+    wire out = osc & enable;
+
+    always @(posedge run) begin
+        osc = start_high;
+        while (run || osc) begin
+            #(half_ps) osc = ~osc;
+        end
+    end
+
+    // Glitch-free gating, like a latch-based clock gate cell
+    always @(osc or gate)
+        if (!osc) enable = gate;
+endmodule
+
+module hdl_clocks;
+    clock_source sc();
+    clock_source clk();
+
+`ifdef CLOCK_SC_TARGET
+    always @(sc.drive)
+        if (sc.drive) force `CLOCK_SC_TARGET = sc.out;
+        else release `CLOCK_SC_TARGET;
+`endif
+
+`ifdef CLOCK_clk_TARGET
+    always @(clk.drive)
+        if (clk.drive) force `CLOCK_clk_TARGET = clk.out;
+        else release `CLOCK_clk_TARGET;
+`endif
+endmodule
+
+`resetall
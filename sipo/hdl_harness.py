@@ -0,0 +1,242 @@
+"""Generated self-checking Verilog harness driven by $readmemh vectors
+
+write_harness() emits selfcheck_<TOP>.v, a top module that instantiates the
+design, loads its stimulus and expected outputs with $readmemh, serializes
+every frame onto D/SC/CS with the same timing as LM70.send_frames, and
+compares SIPO_Q / Latch_Q / uo_out in HDL at each CS rising edge. Only
+the mismatch count and the first failure are left for Python to read
+(test_selfcheck.py), so nothing crosses the GPI boundary per bit or per
+frame.
+
+Vector files hold one frame per line:
+    stim.hex      {lsb_sel, word}                     17 bits
+    expect.hex    {uo_out, Latch_Q, SIPO_Q}           31 bits
+and expected values come straight from the golden table.
+
+The Makefile generates the harness while parsing (make selfcheck DESIGN=...).
+
+Usage: python hdl_harness.py --toplevel TOP --out DIR
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from golden_model import GoldenModel
+
+# Serial designs the harness can drive: input ports, output ports with widths, parameters
+DESIGNS = {
+    "sipo_with_latch_mux": {
+        "inputs": ("CS", "SC", "RESET_N", "D", "lsb_sel", "clk"),
+        "outputs": {"Latch_Q": 8, "uo_out": 7, "SIPO_Q": 16},
+        "params": {},
+    },
+    "sipo_with_latch": {
+        "inputs": ("CS", "SC", "RESET_N", "D"),
+        "outputs": {"Latch_Q": 8, "Latch_Q_LSB": 4, "Latch_Q_MSB": 4},
+        "params": {},
+    },
+    "sipo_scan_display": {
+        "inputs": ("CS", "SC", "RESET_N", "D", "clk"),
+        "outputs": {"Latch_Q": 8, "uo_out": 7, "SIPO_Q": 16, "digit_en": 2, "lsb_sel": 1},
+        "params": {"REFRESH_DIV": 4},
+    },
+}
+
+# Bit fields of an expected vector
+FIELDS = (("SIPO_Q", 0, 16), ("Latch_Q", 16, 8), ("uo_out", 24, 7))
+EXPECT_BITS = 31
+
+
+def checked_outputs(toplevel):
+    """Outputs compared for a design; uo_out only when the harness drives lsb_sel"""
+    design = DESIGNS[toplevel]
+    names = [name for name, _, _ in FIELDS if name in design["outputs"]]
+    if "lsb_sel" not in design["inputs"] and "uo_out" in names:
+        names.remove("uo_out")
+    return names
+
+
+def check_mask(toplevel):
+    mask = 0
+    for name, shift, width in FIELDS:
+        if name in checked_outputs(toplevel):
+            mask |= ((1 << width) - 1) << shift
+    return mask
+
+
+def harness_source(toplevel):
+    design = DESIGNS[toplevel]
+    inputs = design["inputs"]
+    outputs = design["outputs"]
+    params = design["params"]
+
+    param_decls = [
+        ("parameter HALF_PERIOD = 5", "SC half period (ns)"),
+        ("parameter GAP = 1", "CS-high SC cycles after each frame"),
+        ("parameter DEPTH = 1 << 17", "Frame capacity of the vector memories"),
+    ] + [(f"parameter {name} = {value}", "Passed to the design") for name, value in params.items()]
+    param_lines = [
+        f"    {(decl + ',') if index < len(param_decls) - 1 else decl:36s}// {comment}"
+        for index, (decl, comment) in enumerate(param_decls)
+    ]
+    port_decls = [f"    reg {name} = 1'b{1 if name == 'CS' else 0};" for name in inputs]
+    port_decls += [f"    wire [{width - 1}:0] {name};" for name, width in outputs.items()]
+    connections = ",\n".join(f"        .{name}({name})" for name in list(inputs) + list(outputs))
+    overrides = f" #({', '.join(f'.{name}({name})' for name in params)})" if params else ""
+    observed = ", ".join(
+        name if name in checked_outputs(toplevel) else f"{width}'b0" for name, _, width in reversed(FIELDS)
+    )
+    lsb_sel = "            lsb_sel = frame[16];\n" if "lsb_sel" in inputs else ""
+    clk = (
+        "\n    // Display clock, free running at the SC rate while frames are driven\n"
+        "    always @(posedge running)\n"
+        "        while (running || clk) #HALF_PERIOD clk = ~clk;\n"
+        if "clk" in inputs
+        else ""
+    )
+    return f"""// Self-checking harness for {toplevel}, generated by hdl_harness.py; do not edit
+
+// Loads frames and expected outputs with $readmemh, drives them like
+// LM70.send_frames and compares the outputs at every CS rising edge.
+// test_selfcheck.py sets `frames`, pulses `start`, waits for `done` and
+// reads the summary registers.
+
+`timescale 1ns/1ps
+
+module selfcheck_{toplevel} #(
+{chr(10).join(param_lines)}
+);
+{chr(10).join(port_decls)}
+
+    {toplevel}{overrides} dut (
+{connections}
+    );
+
+    // Control and summary
+    reg start = 1'b0;                   // Rising edge loads the vectors and runs them
+    reg done = 1'b0;
+    reg running = 1'b0;
+    integer frames = 0;                 // Frames to run, set before start
+    integer checked = 0;
+    integer mismatches = 0;
+    integer first_fail = 0;             // Index of the first mismatch, valid when mismatches > 0
+    reg [{EXPECT_BITS - 1}:0] fail_got = 0;
+    reg [{EXPECT_BITS - 1}:0] fail_expected = 0;
+
+    localparam [{EXPECT_BITS - 1}:0] CHECK_MASK = {EXPECT_BITS}'h{check_mask(toplevel):x};
+
+    reg [16:0] stim [0:DEPTH-1];        // {{lsb_sel, word}}
+    reg [{EXPECT_BITS - 1}:0] expected [0:DEPTH-1];    // {{uo_out, Latch_Q, SIPO_Q}}
+    reg [8*1024-1:0] stim_file;
+    reg [8*1024-1:0] expect_file;
+
+    wire [{EXPECT_BITS - 1}:0] observed = {{{observed}}};
+
+    // Serial clock, parked low between runs
+    always @(posedge running)
+        while (running || SC) #HALF_PERIOD SC = ~SC;
+{clk}
+    integer i, b;
+    reg [16:0] frame;
+    reg [{EXPECT_BITS - 1}:0] got;
+
+    always @(posedge start) begin
+        if (!$value$plusargs("selfcheck_stim=%s", stim_file))
+            stim_file = "stim.hex";
+        if (!$value$plusargs("selfcheck_expect=%s", expect_file))
+            expect_file = "expect.hex";
+        $readmemh(stim_file, stim, 0, frames - 1);
+        $readmemh(expect_file, expected, 0, frames - 1);
+        done = 1'b0;
+        checked = 0;
+        mismatches = 0;
+
+        // Reset with SC parked, then start the clocks
+        CS = 1'b1;
+        D = 1'b0;
+        RESET_N = 1'b0;
+        #20 RESET_N = 1'b1;
+        #1 running = 1'b1;
+
+        @(negedge SC);
+        for (i = 0; i < frames; i = i + 1) begin
+            frame = stim[i];
+{lsb_sel}            CS = 1'b0;
+            for (b = 15; b >= 0; b = b - 1) begin
+                D = frame[b];
+                @(negedge SC);
+            end
+            @(negedge SC);              // 17th rising edge moves the shift chain into SIPO_Q
+            CS = 1'b1;
+            #1 got = observed;          // Latch closed, outputs settled
+            checked = checked + 1;
+            if ((got & CHECK_MASK) !== (expected[i] & CHECK_MASK)) begin
+                if (mismatches == 0) begin
+                    first_fail = i;
+                    fail_got = got;
+                    fail_expected = expected[i];
+                end
+                mismatches = mismatches + 1;
+            end
+            for (b = 0; b < GAP; b = b + 1)
+                @(negedge SC);
+        end
+        running = 1'b0;
+        done = 1'b1;
+    end
+
+endmodule
+"""
+
+
+def write_harness(toplevel, out_dir):
+    """Writes selfcheck_<TOP>.v, leaving the file untouched when it is already current"""
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(os.path.abspath(out_dir), f"selfcheck_{toplevel}.v")
+    source = harness_source(toplevel)
+    if os.path.exists(path):
+        with open(path) as f:
+            if f.read() == source:
+                return path
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(source)
+    os.replace(tmp_path, path)
+    return path
+
+
+def write_vectors(words, lsb_sel, stim_path, expect_path, golden=None):
+    """Writes the $readmemh stimulus and expected-output files for a frame list"""
+    golden = GoldenModel() if golden is None else golden
+    table = golden.table
+    words = np.asarray(words, dtype=np.int64)
+    lsb_sel = np.asarray(lsb_sel, dtype=np.int64)
+    rows = table[words]
+    expected = (
+        rows["SIPO_Q"].astype(np.int64)
+        | rows["Latch_Q"].astype(np.int64) << 16
+        | rows["uo_out"][np.arange(words.size), lsb_sel].astype(np.int64) << 24
+    )
+    np.savetxt(stim_path, lsb_sel << 16 | words, fmt="%05x")
+    np.savetxt(expect_path, expected, fmt="%08x")
+    return expected
+
+
+def unpack(value):
+    """Splits an expected/observed vector into its output fields"""
+    return {name: (value >> shift) & ((1 << width) - 1) for name, shift, width in FIELDS}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--toplevel", required=True, choices=sorted(DESIGNS))
+    parser.add_argument("--out", default="selfcheck_build")
+    args = parser.parse_args(argv)
+    print(write_harness(args.toplevel, args.out))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
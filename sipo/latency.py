@@ -0,0 +1,138 @@
+"""Per-frame latency and sustained throughput, measured in sim time
+
+FrameTimer timestamps every CS edge, the 16th and 17th rising SC edges of
+each frame, and every change of Latch_Q and uo_out. Nothing is computed
+while the simulation runs. report() turns the timestamps into per-frame
+latencies, all measured from CS falling:
+
+    shift     16th SC rising edge (last bit sampled into the chain)
+    latch     first Latch_Q change from the 17th SC edge until CS rises
+    display   first uo_out change from the 17th SC edge until the next frame
+    period    next CS falling edge
+
+The 17th edge moves the shift chain into SIPO_Q, so the outputs are timed
+from the first change it causes: changes while the word is still shifting
+in never count, even when they pass through the final value. A frame whose
+outputs do not change after that edge (the same value as before) is NaN
+and left out of the summary, so each metric's count is the number of
+frames timed. On a zero-delay run both are a constant 16.5 SC periods.
+
+It also reports the sustained throughput in frames per microsecond.
+export() writes every percentile and histogram as <testsuite> properties
+of the results file, so HDL variants can be compared from their
+results.xml files:
+
+    timer = FrameTimer(dut).start()
+    await lm70.send_frames(words)
+    timer.stop()
+    timer.export()
+"""
+import cocotb
+import numpy as np
+from cocotb.triggers import Edge, FallingEdge, First, RisingEdge
+from cocotb.utils import get_sim_time
+
+HISTOGRAM_BINS = 16
+PERCENTILES = (50, 90, 99)
+
+
+def summarize(values_ps, bins=HISTOGRAM_BINS):
+    """Count, mean, percentiles and histogram of latencies, in ns"""
+    values = np.asarray(values_ps, dtype=float)
+    values = values[~np.isnan(values)] / 1000
+    if not values.size:
+        return {"count": 0}
+    counts, edges = np.histogram(values, bins=bins)
+    summary = {"count": int(values.size), "mean": float(values.mean()), "min": float(values.min())}
+    summary.update((f"p{p}", float(np.percentile(values, p))) for p in PERCENTILES)
+    summary["max"] = float(values.max())
+    # "low-high:count" per bin, in ns
+    summary["histogram"] = " ".join(
+        f"{low:g}-{high:g}:{count}" for low, high, count in zip(edges[:-1], edges[1:], counts) if count
+    )
+    return summary
+
+
+def _first_change(times, starts, ends, side):
+    # Time of the first change in [start, end) (side="left") or [start, end] (side="right"), else NaN
+    times = np.asarray(times, dtype=float)
+    if not times.size:
+        return np.full(starts.size, np.nan)
+    first = np.searchsorted(times, np.nan_to_num(starts, nan=np.inf), side="left")
+    found = times[np.minimum(first, times.size - 1)]
+    inside = (first < times.size) & ((found <= ends) if side == "right" else (found < ends))
+    return np.where(inside, found, np.nan)
+
+
+class FrameTimer:
+    """Timestamps CS edges, the 16th/17th SC edges and Latch_Q / uo_out changes"""
+
+    def __init__(self, dut):
+        self.dut = dut
+        self.frames = []  # (CS falling, 16th and 17th SC rising or None, CS rising) in ps
+        self.changes = {name: [] for name in ("Latch_Q", "uo_out") if hasattr(dut, name)}
+        self._tasks = []
+
+    def start(self):
+        self._tasks.append(cocotb.start_soon(self._watch_frames()))
+        for name, times in self.changes.items():
+            self._tasks.append(cocotb.start_soon(self._watch_changes(getattr(self.dut, name), times)))
+        return self
+
+    def stop(self):
+        for task in self._tasks:
+            task.kill()
+        self._tasks = []
+
+    async def _watch_frames(self):
+        cs_fall = FallingEdge(self.dut.CS)
+        cs_rise = RisingEdge(self.dut.CS)
+        sc_rise = RisingEdge(self.dut.SC)
+        while True:
+            await cs_fall
+            start = get_sim_time("ps")
+            sc16 = sc17 = None
+            edges = 0
+            # SC is only watched while CS is low
+            while await First(sc_rise, cs_rise) is sc_rise:
+                edges += 1
+                if edges == 16:
+                    sc16 = get_sim_time("ps")
+                elif edges == 17:
+                    sc17 = get_sim_time("ps")
+            self.frames.append((start, sc16, sc17, get_sim_time("ps")))
+
+    async def _watch_changes(self, handle, times):
+        edge = Edge(handle)
+        while True:
+            await edge
+            times.append(get_sim_time("ps"))
+
+    def report(self):
+        """Latency summaries per metric (ns) and sustained throughput"""
+        if not self.frames:
+            return {"frames": 0}
+        fall, sc16, sc17, rise = np.array(
+            [[np.nan if t is None else t for t in frame] for frame in self.frames], dtype=float
+        ).T
+        next_fall = np.append(fall[1:], np.inf)
+        latencies = {"shift": sc16 - fall, "period": next_fall[:-1] - fall[:-1]}
+        for name, metric, ends, side in (("Latch_Q", "latch", rise, "right"), ("uo_out", "display", next_fall, "left")):
+            if name in self.changes:
+                latencies[metric] = _first_change(self.changes[name], sc17, ends, side) - fall
+        span_us = (rise[-1] - fall[0]) / 1e6
+        report = {"frames": len(self.frames), "frames_per_us": len(self.frames) / span_us if span_us else 0.0}
+        report.update((name, summarize(values)) for name, values in latencies.items())
+        return report
+
+    def export(self, prefix="latency"):
+        """Adds the report to the results file as properties; returns it"""
+        report = self.report()
+        manager = getattr(cocotb, "regression_manager", None)
+        if manager is not None:
+            for name, value in report.items():
+                items = value.items() if isinstance(value, dict) else [(None, value)]
+                for key, item in items:
+                    text = f"{item:.6g}" if isinstance(item, float) else str(item)
+                    manager.xunit.add_property(name=".".join(part for part in (prefix, name, key) if part), value=text)
+        return report
@@ -0,0 +1,79 @@
+import functools
+import logging
+
+from cocotb.triggers import FallingEdge, RisingEdge
+
+
+@functools.lru_cache(maxsize=None)
+def frame_bits(word):
+    """Returns the 16 bits of an LM70 word, MSB first, as a cached tuple"""
+    return tuple((word >> i) & 1 for i in range(15, -1, -1))
+
+
+class LM70:
+    """Bus-functional model for the LM70 temperature sensor
+
+    D is always changed on the falling edge of SC so it is stable when the
+    SIPO samples it on the rising edge. Nothing is logged per bit; frame-level
+    messages go to the "cocotb.lm70" logger at DEBUG, and to `txlog` (a
+    txlog.TxLog) as binary records when one is given.
+    """
+
+    def __init__(self, dut, data=None, txlog=None):
+        self.dut = dut
+        self.data = dut.D if data is None else data  # sipo_sr names its data pin SIO
+        self.log = logging.getLogger("cocotb.lm70")
+        self.txlog = txlog
+        self.frames_sent = 0
+
+    async def drive_temp_data(self, temp_value):
+        """Drives one 16-bit word onto D (the caller owns CS)
+
+        Returns right after the rising SC edge that samples the last bit.
+        """
+        d = self.data
+        fall = FallingEdge(self.dut.SC)
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug("Driving temperature value: %#06x", temp_value)
+        if self.txlog is not None:
+            self.txlog.frame(temp_value)
+        for bit in frame_bits(temp_value):
+            await fall
+            d.value = bit
+        await RisingEdge(self.dut.SC)
+        self.frames_sent += 1
+
+    async def send_frames(self, frames, gap=1, on_frame=None):
+        """Streams 16-bit words back to back, framing each one with CS
+
+        `frames` may be any iterable or generator of words. CS drops on a
+        falling SC edge and is held low for 17 rising edges: 16 to fill the
+        shift chain and one more to transfer it into SIPO_Q. CS then rises
+        (closing the latch) and stays high for `gap` SC cycles, at least 1,
+        after which `on_frame(word)` is called while the latched value is held.
+        """
+        if gap < 1:
+            raise ValueError(f"gap must be at least 1 SC cycle (CS has to rise to close the latch), got {gap}")
+        cs = self.dut.CS
+        d = self.data
+        fall = FallingEdge(self.dut.SC)
+        debug = self.log.isEnabledFor(logging.DEBUG)
+        txlog = self.txlog
+
+        await fall
+        for word in frames:
+            if debug:
+                self.log.debug("LM70 frame %#06x", word)
+            if txlog is not None:
+                txlog.frame(word)
+            cs.value = 0
+            for bit in frame_bits(word):
+                d.value = bit
+                await fall
+            await fall  # 17th rising edge moves the shift chain into SIPO_Q
+            cs.value = 1
+            for _ in range(gap):
+                await fall
+            self.frames_sent += 1
+            if on_frame is not None:
+                on_frame(word)
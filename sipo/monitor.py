@@ -0,0 +1,252 @@
+"""Edge-triggered output monitor and asynchronous scoreboard
+
+OutputMonitor samples SIPO_Q, Latch_Q, Latch_Q_MSB/LSB, lsb_sel and uo_out
+in the ReadOnly phase of every CS rising edge (the moment the latch closes)
+and of every lsb_sel change, and publishes a Transaction to a queue. There
+are no fixed Timer waits. Scoreboard consumes the queue in its own task and
+checks each transaction against the golden model, so the driver never
+stalls on checking and can run frames back to back with the minimum CS gap.
+
+    scoreboard = Scoreboard(dut, GoldenModel()).start()
+    await lm70.send_frames(scoreboard.expect(word) for word in words)
+    await scoreboard.drain()
+    assert not scoreboard.failures
+
+ScanChecker does the same for the scanned display top (sipo_scan_display):
+it keeps the last pattern seen on uo_out for each enabled digit, so both
+digits can be checked even though only one is driven at a time.
+"""
+import collections
+
+import cocotb
+from cocotb.queue import Queue
+from cocotb.triggers import Edge, Event, First, ReadOnly, RisingEdge
+from cocotb.utils import get_sim_time
+
+Transaction = collections.namedtuple(
+    "Transaction", ["time_ps", "cause", "sipo_q", "latch_q", "latch_q_msb", "latch_q_lsb", "lsb_sel", "uo_out"]
+)
+
+# cause values
+CS_RISE = "cs"
+LSB_SEL = "lsb_sel"
+
+
+def _read(handle):
+    if handle is None:
+        return None
+    value = handle.value
+    return value.integer if value.is_resolvable else None
+
+
+class OutputMonitor:
+    """Publishes output samples on CS rising edges and lsb_sel changes"""
+
+    def __init__(self, dut, queue=None):
+        self.dut = dut
+        self.queue = Queue() if queue is None else queue
+        self._handles = [
+            getattr(dut, name, None)
+            for name in ("SIPO_Q", "Latch_Q", "Latch_Q_MSB", "Latch_Q_LSB", "lsb_sel", "uo_out")
+        ]
+        self._tasks = []
+
+    def start(self):
+        self._tasks.append(cocotb.start_soon(self._watch(RisingEdge(self.dut.CS), CS_RISE)))
+        if hasattr(self.dut, "lsb_sel"):
+            self._tasks.append(cocotb.start_soon(self._watch(Edge(self.dut.lsb_sel), LSB_SEL)))
+        return self
+
+    def stop(self):
+        for task in self._tasks:
+            task.kill()
+        self._tasks = []
+
+    def sample(self, cause):
+        return Transaction(get_sim_time("ps"), cause, *(_read(handle) for handle in self._handles))
+
+    async def _watch(self, trigger, cause):
+        read_only = ReadOnly()
+        put = self.queue.put_nowait
+        while True:
+            await trigger
+            await read_only
+            put(self.sample(cause))
+
+
+class Scoreboard:
+    """Checks monitor transactions against the golden model in a separate task
+
+    Words are registered with expect() in the order they are driven; every
+    CS rising edge consumes one. An lsb_sel change re-checks uo_out for the
+    word currently held by the latch.
+    """
+
+    def __init__(
+        self, dut, golden, monitor=None, capture=None, txlog=None, coverage=None, recorder=None, max_failures=10
+    ):
+        self.dut = dut
+        self.golden = golden
+        self.monitor = OutputMonitor(dut) if monitor is None else monitor
+        self.queue = self.monitor.queue
+        self.capture = capture
+        self.txlog = txlog
+        self.coverage = coverage  # func_coverage.Coverage sampled with every checked transaction
+        self.recorder = recorder  # replay.Recorder given every checked frame
+        self.max_failures = max_failures
+        self.expected = collections.deque()
+        self.frames = 0  # CS frames checked
+        self.checked = 0  # All transactions checked
+        self.mismatches = 0
+        self.failures = []
+        self._held = None  # Word currently held by the latch
+        self._idle = Event()
+        self._task = None
+
+    def start(self):
+        self.monitor.start()
+        self._task = cocotb.start_soon(self._run())
+        return self
+
+    def stop(self):
+        self.monitor.stop()
+        if self._task is not None:
+            self._task.kill()
+
+    def expect(self, word):
+        """Registers the next driven word; returns it so it can wrap a frame generator"""
+        self.expected.append(word)
+        return word
+
+    async def drain(self):
+        """Waits until every queued transaction has been checked"""
+        while not self.queue.empty():
+            self._idle.clear()
+            await self._idle.wait()
+
+    async def _run(self):
+        get = self.queue.get
+        while True:
+            self.check(await get())
+            if self.queue.empty():
+                self._idle.set()
+
+    def check(self, tx):
+        if tx.cause == CS_RISE:
+            if not self.expected:
+                return  # CS rose outside a frame (reset or idle)
+            word = self.expected.popleft()
+            self._held = word
+            self.frames += 1
+            errors = self._check_frame(word, tx)
+            if self.txlog is not None:
+                self.txlog.latch(tx.sipo_q, tx.latch_q)
+            if self.coverage is not None:
+                self.coverage.sample_frame(word, tx)
+            if self.recorder is not None:
+                self.recorder.frame(word, tx)
+        elif self._held is not None:
+            word = self._held
+            errors = self._check_display(word, tx)
+            if self.txlog is not None:
+                self.txlog.display(tx.lsb_sel, tx.uo_out)
+            if self.coverage is not None and None not in (tx.lsb_sel, tx.latch_q, tx.uo_out):
+                self.coverage.sample_display(tx.lsb_sel, tx.latch_q, tx.uo_out)
+        else:
+            return
+        self.checked += 1
+        if self.txlog is not None and errors:
+            self._log_mismatch(word, tx)
+        if errors:
+            self.mismatches += 1
+            if self.capture is not None:
+                self.capture.trigger(f"mismatch on word {word:#06x}")
+            if len(self.failures) < self.max_failures:
+                self.failures.append(f"{tx.time_ps / 1000:.0f} ns word {word:#06x}: " + ", ".join(errors))
+
+    def _log_mismatch(self, word, tx):
+        # One record per failing output: uo_out with its own kind, Latch_Q (or SIPO_Q/nibbles) as "mismatch"
+        display_failed = False
+        if tx.uo_out is not None and tx.lsb_sel is not None:
+            expected = self.golden.uo_out(word, tx.lsb_sel)
+            if tx.uo_out != expected:
+                display_failed = True
+                self.txlog.display_mismatch(word, tx.uo_out, expected, tx.lsb_sel)
+        expected = self.golden.latch_q(word)
+        if tx.cause == CS_RISE and (tx.latch_q != expected or not display_failed):
+            self.txlog.mismatch(word, tx.latch_q, expected, tx.lsb_sel)
+
+    def _check_frame(self, word, tx):
+        errors = []
+        expected = self.golden.latch_q(word)
+        if tx.sipo_q is not None and tx.sipo_q != word:
+            errors.append(f"SIPO_Q = {tx.sipo_q:#06x}")
+        if tx.latch_q != expected:
+            errors.append(f"Latch_Q = {tx.latch_q}, expected {expected:#04x}")
+        if tx.latch_q_msb is not None and tx.latch_q_msb != expected >> 4:
+            errors.append(f"Latch_Q_MSB = {tx.latch_q_msb}, expected {expected >> 4}")
+        if tx.latch_q_lsb is not None and tx.latch_q_lsb != expected & 0xF:
+            errors.append(f"Latch_Q_LSB = {tx.latch_q_lsb}, expected {expected & 0xF}")
+        return errors + self._check_display(word, tx)
+
+    def _check_display(self, word, tx):
+        if tx.uo_out is None or tx.lsb_sel is None:
+            return []
+        expected = self.golden.uo_out(word, tx.lsb_sel)
+        if tx.uo_out != expected:
+            return [f"uo_out = {tx.uo_out:07b} with lsb_sel={tx.lsb_sel}, expected {expected:07b}"]
+        return []
+
+
+class ScanChecker:
+    """Rebuilds both digits of a scanned display from digit_en and uo_out
+
+    `shown[0]` is the last pattern seen while the LSB digit was enabled,
+    `shown[1]` the last one seen for the MSB digit.
+    """
+
+    def __init__(self, dut):
+        self.dut = dut
+        self.shown = [None, None]
+        self.switches = 0
+        self.switch_times = collections.deque(maxlen=3)
+        self._switch = Event()
+        self._task = None
+
+    def start(self):
+        self._task = cocotb.start_soon(self._watch())
+        return self
+
+    def stop(self):
+        if self._task is not None:
+            self._task.kill()
+
+    async def wait_full_scan(self):
+        """Waits until both digits have been enabled again"""
+        for _ in range(2):
+            self._switch.clear()
+            await self._switch.wait()
+
+    def refresh_period_ps(self):
+        """Time for one full scan of both digits, from the last digit switches"""
+        if len(self.switch_times) < 3:
+            return None
+        return self.switch_times[-1] - self.switch_times[0]
+
+    async def _watch(self):
+        dut = self.dut
+        read_only = ReadOnly()
+        enabled = None
+        while True:
+            await First(Edge(dut.uo_out), Edge(dut.digit_en))
+            await read_only
+            digit = {0b01: 0, 0b10: 1}.get(_read(dut.digit_en))
+            if digit is None:
+                continue
+            self.shown[digit] = _read(dut.uo_out)
+            if digit != enabled:
+                if enabled is not None:
+                    self.switches += 1
+                    self.switch_times.append(get_sim_time("ps"))
+                    self._switch.set()
+                enabled = digit
@@ -0,0 +1,77 @@
+"""Measures how test_sipo_multi scales with the number of LM70 channels
+
+Each channel count is compiled into its own SIM_BUILD (N is a top-level
+parameter) and run with the same number of frames per channel. The script
+prints wall time, aggregate frames/sec, wall time per channel-frame and the
+simulator's peak RSS, and writes the table to scaling.json in the output
+directory.
+
+Usage: python multi_scaling.py [--channels 1 2 4 ...] [--frames N] [--var NAME=VALUE ...]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+
+import runner
+
+DESIGN = "sipo_multi"
+CHANNELS = (1, 2, 4, 8, 16, 32, 64)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", nargs="+", type=int, default=list(CHANNELS))
+    parser.add_argument("--frames", type=int, default=64, help="frames per channel")
+    parser.add_argument("--out", default="multi_build")
+    parser.add_argument("--var", action="append", default=[], help="extra make variable, e.g. PDK_PATH=...")
+    args = parser.parse_args(argv)
+
+    base_variables = dict(item.split("=", 1) for item in args.var)
+    base_variables.setdefault("WAVES", "0")
+    out_dir = os.path.abspath(args.out)
+    os.makedirs(out_dir, exist_ok=True)
+
+    rows = []
+    for channels in args.channels:
+        variables = dict(base_variables, CHANNELS=channels)
+        run_dir = os.path.join(out_dir, f"n{channels}")
+        sim_build = os.path.join(run_dir, "sim_build")
+        shutil.rmtree(sim_build, ignore_errors=True)
+        os.makedirs(run_dir, exist_ok=True)
+
+        build = runner.compile_design(DESIGN, sim_build, variables, log_path=os.path.join(run_dir, "compile.log"))
+        if not build.ok:
+            print(f"{channels:3d} channels  compile failed, see {build.log_path}")
+            return 1
+        report_path = os.path.join(run_dir, "report.json")
+        result = runner.run_design(
+            DESIGN,
+            sim_build,
+            os.path.join(run_dir, "results.xml"),
+            variables,
+            env={"MULTI_FRAMES": args.frames, "MULTI_REPORT": report_path},
+            log_path=os.path.join(run_dir, "run.log"),
+        )
+        if not result.ok or not os.path.exists(report_path):
+            print(f"{channels:3d} channels  run failed, see {result.log_path}")
+            return 1
+        with open(report_path) as f:
+            report = json.load(f)
+        report["compile_time"] = build.wall_time
+        report["us_per_channel_frame"] = 1e6 * report["wall_time"] / report["frames"] if report["frames"] else 0.0
+        rows.append(report)
+        print(
+            f"{channels:3d} channels  compile {build.wall_time:6.2f} s  wall {report['wall_time']:8.2f} s  "
+            f"{report['frames_per_sec']:9.0f} frames/s  {report['us_per_channel_frame']:8.1f} us/frame  "
+            f"rss {report['peak_rss_kb'] / 1024:7.1f} MiB"
+        )
+
+    with open(os.path.join(out_dir, "scaling.json"), "w") as f:
+        json.dump({"frames_per_channel": args.frames, "runs": rows}, f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
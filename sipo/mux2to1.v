@@ -30,6 +30,10 @@ module mux2to1 (
 );
     wire [3:0] y_internal;
 
+`ifdef PRIMS_RTL
+    // Behavioral equivalent of the 4 udp_mux_2to1 cells (make PRIMS=rtl)
+    assign y_internal = lsb_sel ? Latch_Q_MSB : Latch_Q_LSB;
+`else
     // Generate 4 instances of the 1-bit mux
     genvar i;
     generate
@@ -42,6 +46,7 @@ module mux2to1 (
             );
         end
     endgenerate
+`endif
 
     // Assign the internal output to the final output
     assign bcd_data = y_internal;
@@ -0,0 +1,83 @@
+"""Equivalence check between the PRIMS=rtl and PRIMS=pdk builds of each design
+
+Both builds run the same seeded port-level stimulus (equiv_ports.py), and the
+recorded output traces, X and Z values included, must match sample for
+sample. The first divergence is reported per design.
+
+Usage: python prims_equiv.py [--steps N] [--seed S] [--var NAME=VALUE ...] [DESIGN ...]
+"""
+import argparse
+import concurrent.futures
+import os
+import sys
+
+import runner
+
+EQUIV_DESIGNS = ("sipo_latch", "mux2to1", "sipo_with_latch_mux")
+EQUIV_MODULE = "equiv_ports"
+
+
+def record(design, prims, out_dir, steps, seed, variables):
+    """Runs the trace recorder for one design/PRIMS combination; returns the trace path"""
+    run_dir = os.path.join(out_dir, design, prims)
+    os.makedirs(run_dir, exist_ok=True)
+    trace_path = os.path.join(run_dir, "trace.txt")
+    if os.path.exists(trace_path):
+        os.remove(trace_path)
+    result = runner.run_design(
+        design,
+        os.path.join(run_dir, "sim_build"),
+        os.path.join(run_dir, "results.xml"),
+        dict(variables, PRIMS=prims, MODULE=EQUIV_MODULE),
+        env={"EQUIV_STEPS": steps, "EQUIV_SEED": seed, "EQUIV_TRACE": trace_path},
+        log_path=os.path.join(run_dir, "run.log"),
+    )
+    if not result.ok or not os.path.exists(trace_path):
+        raise RuntimeError(f"{design} PRIMS={prims}: run failed, see {result.log_path}")
+    return trace_path
+
+
+def first_difference(rtl_path, pdk_path):
+    """Index and both lines of the first differing sample, or None"""
+    index = -1
+    with open(rtl_path) as rtl, open(pdk_path) as pdk:
+        for index, (rtl_line, pdk_line) in enumerate(zip(rtl, pdk)):
+            if rtl_line != pdk_line:
+                return index, rtl_line.strip(), pdk_line.strip()
+        rtl_rest, pdk_rest = rtl.readline(), pdk.readline()
+        if rtl_rest or pdk_rest:
+            return index + 1, rtl_rest.strip(), pdk_rest.strip()
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("designs", nargs="*", default=list(EQUIV_DESIGNS))
+    parser.add_argument("--steps", type=int, default=20000, help="SC cycles of random stimulus")
+    parser.add_argument("--seed", type=int, default=9)
+    parser.add_argument("--out", default="equiv_build")
+    parser.add_argument("--var", action="append", default=[], help="extra make variable, e.g. PDK_PATH=...")
+    args = parser.parse_args(argv)
+
+    out_dir = os.path.abspath(args.out)
+    variables = dict(item.split("=", 1) for item in args.var)
+    jobs = [(design, prims) for design in args.designs for prims in ("rtl", "pdk")]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+        traces = dict(
+            zip(jobs, pool.map(lambda job: record(job[0], job[1], out_dir, args.steps, args.seed, variables), jobs))
+        )
+
+    failed = False
+    for design in args.designs:
+        difference = first_difference(traces[design, "rtl"], traces[design, "pdk"])
+        if difference is None:
+            print(f"{design:22s} EQUIVALENT over {args.steps} cycles")
+        else:
+            failed = True
+            index, rtl_line, pdk_line = difference
+            print(f"{design:22s} DIFFERS at sample {index}: rtl [{rtl_line}] pdk [{pdk_line}]")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
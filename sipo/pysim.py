@@ -0,0 +1,1152 @@
+"""Simulator-free mode: cocotb tests against cycle-accurate Python models
+
+pysim provides Python models of the Verilog tops (sipo_with_latch_mux,
+sipo_with_latch, mux2to1, sipo_sr, shift_register_16bit, sipo_multi,
+sipo_scan_display) with the same handle interface cocotb gives
+(`dut.CS.value`, `.integer`, edge triggers), a small discrete-event
+scheduler, and a stand-in for the parts of the cocotb API the testbenches
+use. The stand-in is installed as `cocotb` before the test module is
+imported, so existing tests run unchanged and write a cocotb style
+results.xml. Sign-off still goes through vvp.
+
+Writes are applied together once every runnable coroutine has yielded, the
+way cocotb applies them in the ReadWrite phase, and models evaluate edge
+logic with non-blocking semantics.
+
+Usage: python pysim.py --toplevel TOP [--results FILE] [--param N=V] MODULE[,MODULE...]
+       make DESIGN=... SIM=python
+"""
+import argparse
+import collections
+import functools
+import heapq
+import importlib
+import inspect
+import itertools
+import logging
+import os
+import random
+import sys
+import time
+import traceback
+import types
+import xml.etree.ElementTree as ET
+
+SEVEN_SEGMENT = (
+    0b1111110, 0b0110000, 0b1101101, 0b1111001, 0b0110010,
+    0b1011011, 0b1011111, 0b1110000, 0b1111111, 0b1110011,
+) + (0b1111111,) * 6
+
+_UNITS = {"fs": 1e-3, "ps": 1, "ns": 1e3, "us": 1e6, "ms": 1e9, "sec": 1e12, "step": 1}
+
+
+def to_steps(value, units="step"):
+    """Converts a time to integer picoseconds (the simulation step)"""
+    if units is None:
+        units = "step"
+    return int(round(value * _UNITS[units]))
+
+
+# Values and handles
+
+
+class LogicValue:
+    """Immutable stand-in for cocotb's BinaryValue; None means all X"""
+
+    __slots__ = ("_value", "_width")
+
+    def __init__(self, value, width):
+        self._value = value
+        self._width = width
+
+    @property
+    def integer(self):
+        if self._value is None:
+            raise ValueError(f"Unresolvable bit in binary string: '{self.binstr}'")
+        return self._value
+
+    @property
+    def is_resolvable(self):
+        return self._value is not None
+
+    @property
+    def binstr(self):
+        if self._value is None:
+            return "x" * self._width
+        return format(self._value, f"0{self._width}b")
+
+    def __int__(self):
+        return self.integer
+
+    __index__ = __int__
+
+    def __len__(self):
+        return self._width
+
+    def __bool__(self):
+        return bool(self.integer)
+
+    def __eq__(self, other):
+        if isinstance(other, LogicValue):
+            return self._value == other._value
+        if isinstance(other, str):
+            return self.binstr == other
+        return self._value == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._value)
+
+    def __str__(self):
+        return self.binstr
+
+    def __repr__(self):
+        return self.binstr
+
+    def __format__(self, spec):
+        return format(self.integer, spec) if spec else self.binstr
+
+
+class SimHandle:
+    """Signal handle with cocotb's `.value` read/write interface"""
+
+    def __init__(self, sim, model, name, width):
+        self._sim = sim
+        self._model = model
+        self._name = name
+        self._width = width
+        self._log = logging.getLogger(f"cocotb.{model.name}.{name}")
+        self._waiters = []  # (edge kind, callback)
+
+    @property
+    def value(self):
+        return LogicValue(self._model.values[self._name], self._width)
+
+    @value.setter
+    def value(self, value):
+        self._sim.schedule_write(self, _coerce(value, self._width))
+
+    def setimmediatevalue(self, value):
+        self._sim.apply_writes({self: _coerce(value, self._width)})
+
+    def __len__(self):
+        return self._width
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._model.name}.{self._name})"
+
+
+def _coerce(value, width):
+    if isinstance(value, LogicValue):
+        return value._value
+    if isinstance(value, str):
+        return None if any(c not in "01" for c in value) else int(value, 2)
+    return int(value) & ((1 << width) - 1)
+
+
+class Dut:
+    """Top-level handle: signal handles as attributes"""
+
+    def __init__(self, sim, model):
+        self._sim = sim
+        self._model = model
+        self._name = model.name
+        self._log = logging.getLogger(f"cocotb.{model.name}")
+        self._handles = {
+            name: SimHandle(sim, model, name, width) for name, width in model.SIGNALS.items()
+        }
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["_handles"][name]
+        except KeyError:
+            raise AttributeError(f"{self.__dict__.get('_name')} contains no object named {name}") from None
+
+    def __iter__(self):
+        return iter(self._handles.values())
+
+
+# Models
+
+
+class Model:
+    """Base for the design models; None in `values` means X"""
+
+    name = ""
+    SIGNALS = {}
+
+    def __init__(self):
+        self.values = dict.fromkeys(self.SIGNALS)
+        self.changed = {}  # name -> value before this delta
+
+    def set(self, name, value):
+        values = self.values
+        if values[name] != value:
+            if name not in self.changed:
+                self.changed[name] = values[name]
+            values[name] = value
+
+    def apply(self, writes):
+        """Applies a batch of writes, evaluates the logic, returns {name: old value}"""
+        values = self.values
+        old = {}
+        for name, value in writes.items():
+            if values[name] != value:
+                old[name] = values[name]
+                values[name] = value
+        self.changed = dict(old)
+        self.evaluate(old)
+        return self.changed
+
+    def evaluate(self, old):
+        raise NotImplementedError
+
+    def rose(self, old, name):
+        return name in old and old[name] != 1 and self.values[name] == 1
+
+    def fell(self, old, name):
+        return name in old and old[name] != 0 and self.values[name] == 0
+
+
+class SipoWithLatchMux(Model):
+    """sipo_with_latch_mux: shift chain, SIPO_Q register, latch, mux and decoder"""
+
+    name = "sipo_with_latch_mux"
+    SIGNALS = {
+        "CS": 1, "SC": 1, "RESET_N": 1, "D": 1, "lsb_sel": 1, "clk": 1,
+        "Latch_Q": 8, "uo_out": 7, "SIPO_Q": 16,
+        "MSB_Q": 8, "shifted_data": 8, "Latch_Q_LSB": 4, "Latch_Q_MSB": 4, "bcd_data": 4,
+    }
+    HAS_MUX = True
+
+    def __init__(self):
+        super().__init__()
+        self.chain = None  # dff_q of the 16 flip-flops
+
+    def evaluate(self, old):
+        v = self.values
+        sc_rise = self.rose(old, "SC")
+        reset_rise = self.rose(old, "RESET_N")
+
+        # SIPO_Q register: always @(posedge SC or posedge RESET_N), reads the old chain
+        if sc_rise or reset_rise:
+            if v["RESET_N"] == 0:
+                self.set("SIPO_Q", 0)
+            elif v["CS"] == 0:
+                self.set("SIPO_Q", self.chain)
+            elif v["CS"] is None or v["RESET_N"] is None:
+                self.set("SIPO_Q", None)
+
+        # Flip-flop chain: level reset, shift on the rising SC edge
+        if v["RESET_N"] == 0:
+            self.chain = 0
+        elif sc_rise:
+            if self.chain is None or v["D"] is None:
+                self.chain = None
+            else:
+                self.chain = ((self.chain << 1) | v["D"]) & 0xFFFF
+
+        if "SIPO_Q" in self.changed:
+            sipo_q = v["SIPO_Q"]
+            self.set("MSB_Q", None if sipo_q is None else sipo_q >> 8)
+            self.set("shifted_data", None if sipo_q is None else ((sipo_q >> 8) << 1) & 0xFF)
+
+        # Latch: transparent while CS is low, cleared while RESET_N is low
+        if v["RESET_N"] == 0:
+            self.set("Latch_Q", 0)
+        elif v["CS"] == 0:
+            self.set("Latch_Q", v["shifted_data"])
+        elif v["CS"] is None or v["RESET_N"] is None:
+            self.set("Latch_Q", None)
+
+        # Continuous assigns only re-evaluate when their source changes, so deposits stick
+        if "Latch_Q" in self.changed:
+            latch_q = v["Latch_Q"]
+            self.set("Latch_Q_LSB", None if latch_q is None else latch_q & 0xF)
+            self.set("Latch_Q_MSB", None if latch_q is None else latch_q >> 4)
+
+        if self.HAS_MUX:
+            evaluate_mux(self)
+
+
+def evaluate_mux(model):
+    """mux2to1 and bcd_to_seven_segment"""
+    v = model.values
+    changed = model.changed
+    if "Latch_Q_LSB" in changed or "Latch_Q_MSB" in changed or "lsb_sel" in changed:
+        sel = v["lsb_sel"]
+        if sel == 1:
+            model.set("bcd_data", v["Latch_Q_MSB"])
+        elif sel == 0:
+            model.set("bcd_data", v["Latch_Q_LSB"])
+        else:
+            same = v["Latch_Q_LSB"] == v["Latch_Q_MSB"]
+            model.set("bcd_data", v["Latch_Q_LSB"] if same else None)
+    if "bcd_data" in changed:
+        bcd = v["bcd_data"]
+        model.set("uo_out", 0b1111111 if bcd is None else SEVEN_SEGMENT[bcd])
+
+
+class SipoWithLatch(SipoWithLatchMux):
+    """sipo_with_latch from sipo_latch.v"""
+
+    name = "sipo_with_latch"
+    SIGNALS = {
+        "CS": 1, "SC": 1, "RESET_N": 1, "D": 1,
+        "Latch_Q": 8, "Latch_Q_LSB": 4, "Latch_Q_MSB": 4,
+        "SIPO_Q": 16, "MSB_Q": 8, "shifted_data": 8,
+    }
+    HAS_MUX = False
+
+
+class Mux2to1(Model):
+    """mux2to1 with its seven-segment decoder"""
+
+    name = "mux2to1"
+    SIGNALS = {"Latch_Q_LSB": 4, "Latch_Q_MSB": 4, "lsb_sel": 1, "bcd_data": 4, "uo_out": 7, "clk": 1}
+
+    def evaluate(self, old):
+        evaluate_mux(self)
+
+
+class SipoSr(Model):
+    """sipo_sr: shifts on the falling SC edge while CS is low"""
+
+    name = "sipo_sr"
+    SIGNALS = {"SC": 1, "CS": 1, "RESET_N": 1, "SIO": 1, "sipo_Q": 16}
+
+    def evaluate(self, old):
+        v = self.values
+        if self.fell(old, "SC") or self.rose(old, "RESET_N"):
+            if v["CS"] == 0:
+                q = v["sipo_Q"]
+                self.set("sipo_Q", None if q is None or v["SIO"] is None else ((q << 1) | v["SIO"]) & 0xFFFF)
+            elif v["RESET_N"] == 0:
+                self.set("sipo_Q", 0)
+
+
+class ShiftRegister16(Model):
+    """shift_register_16bit"""
+
+    name = "shift_register_16bit"
+    SIGNALS = {"SC": 1, "RESET_N": 1, "d_in": 1, "Q": 16}
+
+    def evaluate(self, old):
+        v = self.values
+        if v["RESET_N"] == 0:
+            self.set("Q", 0)
+        elif self.rose(old, "SC"):
+            q = v["Q"]
+            self.set("Q", None if q is None or v["d_in"] is None else ((q << 1) | v["d_in"]) & 0xFFFF)
+
+
+class SipoMulti(Model):
+    """sipo_multi: N sipo_with_latch_mux channels on a shared SC"""
+
+    name = "sipo_multi"
+    SHARED = ("SC", "RESET_N", "clk")
+    PER_CHANNEL = ("CS", "D", "lsb_sel")
+    OUTPUTS = (("Latch_Q", 8), ("uo_out", 7), ("SIPO_Q", 16))
+
+    def __init__(self, N=4):
+        self.n = int(N)
+        self.SIGNALS = {"SC": 1, "RESET_N": 1, "clk": 1, "CS": self.n, "D": self.n, "lsb_sel": self.n}
+        self.SIGNALS.update({name: width * self.n for name, width in self.OUTPUTS})
+        super().__init__()
+        self.channels = [SipoWithLatchMux() for _ in range(self.n)]
+
+    def evaluate(self, old):
+        v = self.values
+        shared = {name: v[name] for name in self.SHARED if name in old}
+        touched = range(self.n) if shared else set()
+        per_channel = [name for name in self.PER_CHANNEL if name in old]
+        if per_channel and not shared:
+            touched = set()
+            for name in per_channel:
+                if old[name] is None or v[name] is None:
+                    touched = range(self.n)
+                    break
+                diff = old[name] ^ v[name]
+                touched.update(i for i in range(self.n) if diff >> i & 1)
+        outputs_changed = False
+        for i in touched:
+            writes = dict(shared)
+            for name in self.PER_CHANNEL:
+                writes[name] = None if v[name] is None else (v[name] >> i) & 1
+            if self.channels[i].apply(writes):
+                outputs_changed = True
+        if outputs_changed:
+            for name, width in self.OUTPUTS:
+                value = 0
+                for i, channel in enumerate(self.channels):
+                    part = channel.values[name]
+                    if part is None:
+                        value = None
+                        break
+                    value |= part << (width * i)
+                self.set(name, value)
+
+
+class SipoScanDisplay(Model):
+    """sipo_scan_display: sipo_with_latch_mux with lsb_sel scanned from clk"""
+
+    name = "sipo_scan_display"
+    SIGNALS = {
+        "CS": 1, "SC": 1, "RESET_N": 1, "D": 1, "clk": 1,
+        "Latch_Q": 8, "uo_out": 7, "SIPO_Q": 16, "digit_en": 2, "lsb_sel": 1,
+    }
+    INPUTS = ("CS", "SC", "RESET_N", "D", "clk")
+
+    def __init__(self, REFRESH_DIV=4):
+        super().__init__()
+        self.refresh_div = int(REFRESH_DIV)
+        self.count = None
+        self.core = SipoWithLatchMux()
+
+    def evaluate(self, old):
+        v = self.values
+        # display_scan: always @(posedge clk or negedge RESET_N)
+        if v["RESET_N"] == 0:
+            self.count = 0
+            self.set("lsb_sel", 0)
+        elif self.rose(old, "clk") and self.count is not None:
+            if self.count == self.refresh_div - 1:
+                self.count = 0
+                self.set("lsb_sel", None if v["lsb_sel"] is None else v["lsb_sel"] ^ 1)
+            else:
+                self.count += 1
+        if "lsb_sel" in self.changed:
+            sel = v["lsb_sel"]
+            self.set("digit_en", None if sel is None else (0b10 if sel else 0b01))
+
+        writes = {name: v[name] for name in self.INPUTS}
+        writes["lsb_sel"] = v["lsb_sel"]
+        if self.core.apply(writes):
+            for name in ("Latch_Q", "uo_out", "SIPO_Q"):
+                self.set(name, self.core.values[name])
+
+
+MODELS = {
+    model.name: model
+    for model in (SipoWithLatchMux, SipoWithLatch, Mux2to1, SipoSr, ShiftRegister16, SipoMulti, SipoScanDisplay)
+}
+
+
+# Scheduler
+
+
+class Task:
+    """A running coroutine; awaiting a Task waits for it to finish"""
+
+    _ids = itertools.count()
+
+    def __init__(self, coro, sim):
+        if inspect.iscoroutinefunction(coro) or inspect.isgeneratorfunction(coro):
+            raise TypeError(f"Coroutine function {coro!r} should be called prior to being scheduled")
+        self._coro = coro
+        self._sim = sim
+        self._id = next(Task._ids)
+        self._done = False
+        self._outcome = None
+        self._exception = None
+        self._join_callbacks = []
+        self._cancel_wait = None
+        self.__name__ = getattr(coro, "__name__", "task")
+
+    def _step(self, send_value=None):
+        self._cancel_wait = None
+        try:
+            trigger = self._coro.send(send_value)
+        except StopIteration as stop:
+            self._finish(stop.value, None)
+            return
+        except BaseException as exc:  # noqa: B902 - reported through the test outcome
+            self._finish(None, exc)
+            return
+        if isinstance(trigger, (types.CoroutineType, types.GeneratorType)):
+            trigger = Join(self._sim.start_soon(trigger))
+        elif isinstance(trigger, Task):
+            trigger = Join(trigger)
+        if not isinstance(trigger, Trigger):
+            self._finish(None, TypeError(f"Coroutine yielded an object that is not a trigger: {trigger!r}"))
+            return
+        self._cancel_wait = trigger._prime(self._sim, lambda fired: self._sim.resume(self, fired))
+
+    def _finish(self, value, exc):
+        self._done = True
+        self._outcome = value
+        self._exception = exc
+        self._sim.tasks.discard(self)
+        for callback in self._join_callbacks:
+            callback()
+        self._join_callbacks = []
+        if exc is not None and self is not self._sim.test_task:
+            self._sim.task_failed(self, exc)
+
+    def kill(self):
+        if self._done:
+            return
+        if self._cancel_wait is not None:
+            self._cancel_wait()
+        self._coro.close()
+        self._done = True
+        self._sim.tasks.discard(self)
+        for callback in self._join_callbacks:
+            callback()
+        self._join_callbacks = []
+
+    cancel = kill
+
+    def done(self):
+        return self._done
+
+    def result(self):
+        if self._exception is not None:
+            raise self._exception
+        return self._outcome
+
+    def join(self):
+        return Join(self)
+
+    def __await__(self):
+        return (yield Join(self))
+
+    def __repr__(self):
+        return f"<Task {self._id} {self.__name__}>"
+
+
+class Simulator:
+    """Event scheduler driving one model"""
+
+    def __init__(self, model):
+        self.model = model
+        self.dut = Dut(self, model)
+        self.now = 0
+        self._seq = itertools.count()
+        self._timers = []  # heap of (time, seq, callback)
+        self._ready = collections.deque()
+        self._writes = {}
+        self._readonly = []
+        self._readwrite = []
+        self._next_step = []
+        self.tasks = set()
+        self.test_task = None
+        self.task_error = None
+
+    # Task management
+
+    def start_soon(self, coro):
+        if isinstance(coro, Task):
+            return coro
+        task = Task(coro, self)
+        self.tasks.add(task)
+        self._ready.append((task, None))
+        return task
+
+    def resume(self, task, value):
+        self._ready.append((task, value))
+
+    def task_failed(self, task, exc):
+        if self.task_error is None:
+            self.task_error = exc
+
+    def add_timer(self, steps, callback):
+        entry = [self.now + steps, next(self._seq), callback]
+        heapq.heappush(self._timers, entry)
+
+        def cancel():
+            entry[2] = None
+
+        return cancel
+
+    def schedule_write(self, handle, value):
+        self._writes[handle] = value
+
+    def apply_writes(self, writes):
+        changes = self.model.apply({handle._name: value for handle, value in writes.items()})
+        for name, old in changes.items():
+            handle = self.dut._handles[name]
+            if not handle._waiters:
+                continue
+            new = self.model.values[name]
+            if new == old:
+                continue
+            waiters, handle._waiters = handle._waiters, []
+            for entry in waiters:
+                kind, callback = entry
+                if kind == "edge" or (kind == "rising" and new == 1 and old != 1) or (
+                    kind == "falling" and new == 0 and old != 0
+                ):
+                    callback()
+                else:
+                    handle._waiters.append(entry)
+
+    # Main loop
+
+    def run(self, test_task):
+        """Runs until `test_task` completes; returns False if the simulation ran dry"""
+        self.test_task = test_task
+        while not test_task.done():
+            while self._ready:
+                task, value = self._ready.popleft()
+                if not task.done():
+                    task._step(value)
+                if self.task_error is not None:
+                    return True
+            if self._writes or self._readwrite:
+                writes, self._writes = self._writes, {}
+                if writes:
+                    self.apply_writes(writes)
+                callbacks, self._readwrite = self._readwrite, []
+                for callback in callbacks:
+                    callback()
+                continue
+            if self._readonly:
+                callbacks, self._readonly = self._readonly, []
+                for callback in callbacks:
+                    callback()
+                continue
+            if test_task.done():
+                break
+            while self._timers and self._timers[0][2] is None:
+                heapq.heappop(self._timers)
+            if not self._timers:
+                return False
+            self.now = self._timers[0][0]
+            callbacks, self._next_step = self._next_step, []
+            for callback in callbacks:
+                callback()
+            while self._timers and self._timers[0][0] == self.now:
+                _, _, callback = heapq.heappop(self._timers)
+                if callback is not None:
+                    callback()
+        return True
+
+    def kill_all(self):
+        for task in list(self.tasks):
+            task.kill()
+        self._ready.clear()
+        self._readonly = []
+        self._readwrite = []
+        self._next_step = []
+        self._timers = []
+
+
+# Triggers
+
+
+class Trigger:
+    """Base trigger; `_prime` registers a callback and returns a cancel function"""
+
+    def _prime(self, sim, callback):
+        raise NotImplementedError
+
+    def __await__(self):
+        return (yield self)
+
+
+class Timer(Trigger):
+    def __init__(self, time=None, units="step", round_mode=None, time_ps=None):
+        if time is None:
+            time = time_ps
+        self.steps = to_steps(time, units)
+
+    def _prime(self, sim, callback):
+        return sim.add_timer(self.steps, lambda: callback(self))
+
+    def __repr__(self):
+        return f"Timer({self.steps}ps)"
+
+
+class _EdgeTrigger(Trigger):
+    kind = "edge"
+
+    def __init__(self, signal):
+        self.signal = signal
+
+    def _prime(self, sim, callback):
+        entry = (self.kind, lambda: callback(self))
+        self.signal._waiters.append(entry)
+
+        def cancel():
+            if entry in self.signal._waiters:
+                self.signal._waiters.remove(entry)
+
+        return cancel
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.signal._name})"
+
+
+class Edge(_EdgeTrigger):
+    kind = "edge"
+
+
+class RisingEdge(_EdgeTrigger):
+    kind = "rising"
+
+
+class FallingEdge(_EdgeTrigger):
+    kind = "falling"
+
+
+class ReadOnly(Trigger):
+    def _prime(self, sim, callback):
+        entry = lambda: callback(self)  # noqa: E731
+        sim._readonly.append(entry)
+        return lambda: entry in sim._readonly and sim._readonly.remove(entry)
+
+
+class ReadWrite(Trigger):
+    def _prime(self, sim, callback):
+        entry = lambda: callback(self)  # noqa: E731
+        sim._readwrite.append(entry)
+        return lambda: entry in sim._readwrite and sim._readwrite.remove(entry)
+
+
+class NextTimeStep(Trigger):
+    def _prime(self, sim, callback):
+        entry = lambda: callback(self)  # noqa: E731
+        sim._next_step.append(entry)
+        return lambda: entry in sim._next_step and sim._next_step.remove(entry)
+
+
+class Join(Trigger):
+    def __init__(self, task):
+        self.task = task
+
+    def _prime(self, sim, callback):
+        if self.task.done():
+            return sim.add_timer(0, lambda: callback(self.task._outcome))
+        entry = lambda: callback(self.task._outcome)  # noqa: E731
+        self.task._join_callbacks.append(entry)
+        return lambda: entry in self.task._join_callbacks and self.task._join_callbacks.remove(entry)
+
+
+class First(Trigger):
+    def __init__(self, *triggers):
+        self.triggers = [_as_trigger(trigger) for trigger in triggers]
+
+    def _prime(self, sim, callback):
+        cancels = []
+
+        def fire(value):
+            for cancel in cancels:
+                cancel()
+            callback(value)
+
+        for trigger in self.triggers:
+            cancels.append(trigger._prime(sim, fire))
+        return lambda: [cancel() for cancel in cancels]
+
+
+class Combine(Trigger):
+    def __init__(self, *triggers):
+        self.triggers = [_as_trigger(trigger) for trigger in triggers]
+
+    def _prime(self, sim, callback):
+        remaining = set(range(len(self.triggers)))
+        cancels = []
+
+        def make_fire(index):
+            def fire(_):
+                remaining.discard(index)
+                if not remaining:
+                    callback(self)
+
+            return fire
+
+        for index, trigger in enumerate(self.triggers):
+            cancels.append(trigger._prime(sim, make_fire(index)))
+        if not self.triggers:
+            return sim.add_timer(0, lambda: callback(self))
+        return lambda: [cancel() for cancel in cancels]
+
+
+class ClockCycles(Trigger):
+    def __init__(self, signal, num_cycles, rising=True):
+        self.signal = signal
+        self.num_cycles = num_cycles
+        self.edge = RisingEdge(signal) if rising else FallingEdge(signal)
+
+    def _prime(self, sim, callback):
+        state = {"left": self.num_cycles, "cancel": None}
+
+        def fire(_):
+            state["left"] -= 1
+            if state["left"] <= 0:
+                callback(self)
+            else:
+                state["cancel"] = self.edge._prime(sim, fire)
+
+        if self.num_cycles <= 0:
+            return sim.add_timer(0, lambda: callback(self))
+        state["cancel"] = self.edge._prime(sim, fire)
+        return lambda: state["cancel"]()
+
+
+class Event:
+    """cocotb.triggers.Event"""
+
+    def __init__(self, name=None):
+        self.name = name
+        self.data = None
+        self._fired = False
+        self._callbacks = []
+
+    def set(self, data=None):
+        self._fired = True
+        self.data = data
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def clear(self):
+        self._fired = False
+
+    def is_set(self):
+        return self._fired
+
+    def wait(self):
+        return _EventWait(self)
+
+
+class _EventWait(Trigger):
+    def __init__(self, event):
+        self.event = event
+
+    def _prime(self, sim, callback):
+        if self.event._fired:
+            return sim.add_timer(0, lambda: callback(self))
+        entry = lambda: callback(self)  # noqa: E731
+        self.event._callbacks.append(entry)
+        return lambda: entry in self.event._callbacks and self.event._callbacks.remove(entry)
+
+
+def _as_trigger(obj):
+    if isinstance(obj, Trigger):
+        return obj
+    if isinstance(obj, Task):
+        return Join(obj)
+    if isinstance(obj, (types.CoroutineType, types.GeneratorType)):
+        return Join(_SIM.start_soon(obj))
+    raise TypeError(f"{obj!r} is not a trigger")
+
+
+class Queue:
+    """cocotb.queue.Queue"""
+
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self._items = collections.deque()
+        self._getters = collections.deque()
+        self._putters = collections.deque()
+
+    def qsize(self):
+        return len(self._items)
+
+    def empty(self):
+        return not self._items
+
+    def full(self):
+        return 0 < self.maxsize <= len(self._items)
+
+    def put_nowait(self, item):
+        if self.full():
+            raise QueueFull()
+        self._items.append(item)
+        if self._getters:
+            self._getters.popleft().set()
+
+    def get_nowait(self):
+        if not self._items:
+            raise QueueEmpty()
+        item = self._items.popleft()
+        if self._putters:
+            self._putters.popleft().set()
+        return item
+
+    async def put(self, item):
+        while self.full():
+            event = Event()
+            self._putters.append(event)
+            await event.wait()
+        self.put_nowait(item)
+
+    async def get(self):
+        while not self._items:
+            event = Event()
+            self._getters.append(event)
+            await event.wait()
+        return self.get_nowait()
+
+
+class QueueFull(Exception):
+    pass
+
+
+class QueueEmpty(Exception):
+    pass
+
+
+# Clock
+
+
+class Clock:
+    """cocotb.clock.Clock"""
+
+    def __init__(self, signal, period, units="step"):
+        self.signal = signal
+        self.period = to_steps(period, units)
+        self.half_period = to_steps(period / 2, units)
+        self.frequency = 1e6 / self.period
+
+    async def start(self, cycles=None, start_high=True):
+        t = Timer(self.half_period)
+        it = itertools.count() if cycles is None else range(cycles)
+        first, second = (1, 0) if start_high else (0, 1)
+        for _ in it:
+            self.signal.value = first
+            await t
+            self.signal.value = second
+            await t
+
+
+# The cocotb stand-in
+
+
+class TestFailure(AssertionError):
+    pass
+
+
+class TestSuccess(BaseException):
+    pass
+
+
+class SimTimeoutError(TimeoutError):
+    pass
+
+
+class _XUnit:
+    """The part of cocotb's XUnitReporter that tests use: suite properties"""
+
+    def __init__(self, suite):
+        self.last_testsuite = suite
+
+    def add_property(self, testsuite=None, **kwargs):
+        return ET.SubElement(self.last_testsuite if testsuite is None else testsuite, "property", **kwargs)
+
+
+class _Test:
+    """What cocotb.test() returns"""
+
+    def __init__(self, func, name=None, kwargs=None, args=(), options=None):
+        self.func = func
+        self.name = name or func.__name__
+        self.kwargs = kwargs or {}
+        self.args = args
+        self.options = options or {}
+        self.__name__ = self.name
+        self.__doc__ = func.__doc__
+        # Same attributes as cocotb's Test, so other test modules can wrap it
+        self._func = functools.partial(func, *args, **self.options) if args or self.options else func
+        self.skip = self.kwargs.get("skip", False)
+        self.expect_fail = self.kwargs.get("expect_fail", False)
+        self.expect_error = self.kwargs.get("expect_error", ())
+        self.timeout_time = self.kwargs.get("timeout_time")
+        self.timeout_unit = self.kwargs.get("timeout_unit", "step")
+        self.stage = self.kwargs.get("stage", 0)
+
+
+def test(_func=None, **kwargs):
+    if _func is not None:
+        return _Test(_func, kwargs=kwargs)
+    return lambda func: _Test(func, kwargs=kwargs)
+
+
+def coroutine(func):
+    return func
+
+
+class TestFactory:
+    def __init__(self, test_function, *args, **kwargs):
+        self.test_function = test_function.func if isinstance(test_function, _Test) else test_function
+        self.name = self.test_function.__name__
+        self.args = args
+        self.kwargs_constant = kwargs
+        self.kwargs = {}
+
+    def add_option(self, name, optionlist):
+        self.kwargs[name] = optionlist
+
+    def generate_tests(self, prefix="", postfix=""):
+        module = sys.modules[inspect.stack()[1].frame.f_globals["__name__"]]
+        options = self.kwargs
+        for index, values in enumerate(itertools.product(*options.values())):
+            name = f"{prefix}{self.name}{postfix}_{index + 1:03d}"
+            test_kwargs = dict(self.kwargs_constant)
+            test_kwargs.update(zip(options, values))
+            setattr(module, name, _Test(self.test_function, name, args=self.args, options=test_kwargs))
+
+
+def get_sim_time(units="step"):
+    return _SIM.now / _UNITS[units] if units not in (None, "step", "ps") else _SIM.now
+
+
+_SIM = None
+
+
+def _module(name, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    return module
+
+
+def install(sim):
+    """Registers the stand-in as `cocotb` and its submodules"""
+    global _SIM
+    _SIM = sim
+
+    def fork(coro):
+        task = sim.start_soon(coro)
+        sim._ready.remove((task, None))
+        task._step()
+        return task
+
+    async def start(coro):
+        return fork(coro)
+
+    triggers = _module(
+        "cocotb.triggers",
+        Timer=Timer, Edge=Edge, RisingEdge=RisingEdge, FallingEdge=FallingEdge, ReadOnly=ReadOnly,
+        ReadWrite=ReadWrite, NextTimeStep=NextTimeStep, Join=Join, First=First, Combine=Combine,
+        ClockCycles=ClockCycles, Event=Event, Trigger=Trigger,
+    )
+    modules = {
+        "cocotb": _module(
+            "cocotb",
+            __version__="pysim", SIM_NAME="pysim", SIM_VERSION="1", RANDOM_SEED=0, plusargs={},
+            top=sim.dut, log=logging.getLogger("cocotb"), test=test, coroutine=coroutine,
+            start_soon=sim.start_soon, start=start, fork=fork, create_task=sim.start_soon, Task=Task,
+        ),
+        "cocotb.triggers": triggers,
+        "cocotb.clock": _module("cocotb.clock", Clock=Clock),
+        "cocotb.result": _module(
+            "cocotb.result", TestFailure=TestFailure, TestSuccess=TestSuccess, SimTimeoutError=SimTimeoutError
+        ),
+        "cocotb.regression": _module("cocotb.regression", TestFactory=TestFactory, Test=_Test),
+        "cocotb.utils": _module("cocotb.utils", get_sim_time=get_sim_time, get_sim_steps=to_steps),
+        "cocotb.queue": _module("cocotb.queue", Queue=Queue, QueueFull=QueueFull, QueueEmpty=QueueEmpty),
+        "cocotb.handle": _module("cocotb.handle", SimHandleBase=SimHandle, ModifiableObject=SimHandle),
+        "cocotb.binary": _module("cocotb.binary", BinaryValue=LogicValue),
+    }
+    for name, module in modules.items():
+        if "." in name:
+            parent, child = name.rsplit(".", 1)
+            setattr(modules[parent], child, module)
+        sys.modules[name] = module
+
+
+class _SimTimeFilter(logging.Filter):
+    def filter(self, record):
+        record.simtime = f"{_SIM.now / 1000:.2f}ns" if _SIM else "-"
+        return True
+
+
+def run_tests(toplevel, module_names, results_path="results.xml", testcase=None, params=None):
+    """Imports the test modules against a model and runs their tests; returns the failure count"""
+    sim = Simulator(MODELS[toplevel](**(params or {})))
+    install(sim)
+
+    handler = logging.StreamHandler()
+    handler.addFilter(_SimTimeFilter())
+    handler.setFormatter(logging.Formatter("%(simtime)12s %(levelname)-8s %(name)-30s %(message)s"))
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(os.environ.get("COCOTB_LOG_LEVEL", "INFO").upper())
+    log = logging.getLogger("cocotb.pysim")
+
+    seed = int(os.environ.get("RANDOM_SEED", time.time()))
+    random.seed(seed)
+    sys.modules["cocotb"].RANDOM_SEED = seed
+
+    tests = []
+    for module_name in module_names:
+        module = importlib.import_module(module_name.strip())
+        for obj in list(vars(module).values()):
+            if isinstance(obj, _Test) and (not testcase or obj.name in testcase.split(",")):
+                tests.append((module, obj))
+
+    suite_root = ET.Element("testsuites", name="results")
+    suite = ET.SubElement(suite_root, "testsuite", name="all", package="all")
+    ET.SubElement(suite, "property", name="random_seed", value=str(seed))
+    sys.modules["cocotb"].regression_manager = types.SimpleNamespace(xunit=_XUnit(suite))
+    failures = 0
+    for module, test_obj in tests:
+        if test_obj.kwargs.get("skip"):
+            continue
+        log.info(f"running {module.__name__}.{test_obj.name}")
+        start_wall, start_sim = time.perf_counter(), sim.now
+        sim.task_error = None
+        task = sim.start_soon(test_obj.func(sim.dut, *test_obj.args, **test_obj.options))
+        completed = sim.run(task)
+        error = sim.task_error or task._exception
+        if error is None and not completed:
+            error = RuntimeError("Simulation ran out of events before the test finished")
+        sim.kill_all()
+
+        expect_fail = test_obj.kwargs.get("expect_fail", False)
+        expect_error = test_obj.kwargs.get("expect_error", ())
+        if isinstance(error, AssertionError):
+            passed = expect_fail
+        elif error is not None:
+            passed = bool(expect_error) and (expect_error is True or isinstance(error, expect_error))
+        else:
+            passed = not (expect_fail or expect_error)
+
+        wall = time.perf_counter() - start_wall
+        sim_ns = (sim.now - start_sim) / 1000
+        testcase_el = ET.SubElement(
+            suite,
+            "testcase",
+            name=test_obj.name,
+            classname=module.__name__,
+            file=inspect.getsourcefile(module) or "",
+            lineno=str(inspect.getsourcelines(test_obj.func)[1]),
+            time=repr(wall),
+            sim_time_ns=repr(sim_ns),
+            ratio_time=repr(sim_ns / wall if wall else 0.0),
+        )
+        if passed:
+            log.info(f"{test_obj.name} passed")
+        else:
+            failures += 1
+            ET.SubElement(testcase_el, "failure")
+            detail = "".join(traceback.format_exception(type(error), error, error.__traceback__)) if error else ""
+            log.error(f"{test_obj.name} failed\n{detail}")
+
+    ET.indent(suite_root)
+    ET.ElementTree(suite_root).write(results_path, encoding="unicode")
+    log.info(f"{len(tests)} tests, {failures} failed; results in {results_path}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("module", help="test module(s), comma separated, as for MODULE=")
+    parser.add_argument("--toplevel", required=True, choices=sorted(MODELS))
+    parser.add_argument("--results", default=os.environ.get("COCOTB_RESULTS_FILE", "results.xml"))
+    parser.add_argument("--testcase", default=os.environ.get("TESTCASE") or None)
+    parser.add_argument("--param", action="append", default=[], help="top-level parameter, e.g. N=8")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    params = dict(item.split("=", 1) for item in args.param)
+    failures = run_tests(args.toplevel.strip(), args.module.split(","), args.results, args.testcase, params)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
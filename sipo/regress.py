@@ -0,0 +1,107 @@
+"""Runs every DESIGN concurrently and merges their JUnit results
+
+Each design builds into its own SIM_BUILD and writes its own results file,
+so the runs no longer overwrite one another. Concurrency is capped at the
+number of cores, and the merged report keeps one testsuite per design with
+its wall-clock time and total sim_time_ns.
+
+Usage: python regress.py [--jobs N] [--out DIR] [--var NAME=VALUE ...] [DESIGN ...]
+"""
+import argparse
+import concurrent.futures
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+import runner
+
+
+def run_one(design, out_dir, variables):
+    """Compiles and runs one design in its own directory"""
+    design_dir = os.path.join(out_dir, design)
+    os.makedirs(design_dir, exist_ok=True)
+    results_file = os.path.join(design_dir, "results.xml")
+    if os.path.exists(results_file):
+        os.remove(results_file)
+    result = runner.run_design(
+        design,
+        os.path.join(design_dir, "sim_build"),
+        results_file,
+        variables,
+        log_path=os.path.join(design_dir, "run.log"),
+    )
+    return design, result, results_file
+
+
+def merge_results(runs, merged_path):
+    """Writes one JUnit file with a testsuite per design"""
+    root = ET.Element("testsuites", name="results")
+    for design, result, results_file in runs:
+        testcases = []
+        if os.path.exists(results_file):
+            testcases = list(ET.parse(results_file).getroot().iter("testcase"))
+        sim_time_ns = sum(float(testcase.get("sim_time_ns", 0)) for testcase in testcases)
+
+        suite = ET.SubElement(
+            root,
+            "testsuite",
+            name=design,
+            package=design,
+            time=repr(result.wall_time),
+            sim_time_ns=repr(sim_time_ns),
+        )
+        ET.SubElement(suite, "property", name="wall_time", value=repr(result.wall_time))
+        ET.SubElement(suite, "property", name="sim_time_ns", value=repr(sim_time_ns))
+        ET.SubElement(suite, "property", name="returncode", value=str(result.returncode))
+        for testcase in testcases:
+            suite.append(testcase)
+        if not testcases:
+            testcase = ET.SubElement(suite, "testcase", name=design, classname="regress", time=repr(result.wall_time))
+            ET.SubElement(testcase, "error", message=f"make exited with {result.returncode}, see {result.log_path}")
+
+    ET.indent(root)
+    ET.ElementTree(root).write(merged_path, encoding="unicode", xml_declaration=False)
+    return root
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("designs", nargs="*", default=list(runner.DESIGNS), help="designs to run (default: all)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="maximum concurrent simulations")
+    parser.add_argument("--out", default="regress_build", help="directory for per-design builds and results")
+    parser.add_argument("--var", action="append", default=[], help="extra make variable, e.g. PDK_PATH=...")
+    args = parser.parse_args(argv)
+
+    out_dir = os.path.abspath(args.out)
+    variables = dict(item.split("=", 1) for item in args.var)
+    jobs = max(1, min(args.jobs, len(args.designs)))
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as pool:
+        runs = list(pool.map(lambda design: run_one(design, out_dir, variables), args.designs))
+    wall_time = time.perf_counter() - start
+
+    merged_path = os.path.join(out_dir, "results.xml")
+    root = merge_results(runs, merged_path)
+
+    failed = False
+    for suite in root.iter("testsuite"):
+        testcases = list(suite.iter("testcase"))
+        returncode = int(suite.find("property[@name='returncode']").get("value"))
+        # A crash or timeout after the last testcase still fails the suite
+        passed = returncode == 0 and all(
+            testcase.find("failure") is None and testcase.find("error") is None for testcase in testcases
+        )
+        failed |= not passed
+        print(
+            f"{suite.get('name'):22s} {'PASS' if passed else 'FAIL'}  {len(testcases):3d} tests  "
+            f"wall {float(suite.get('time')):7.2f} s  sim {float(suite.get('sim_time_ns')):12.1f} ns"
+        )
+    slowest = max(result.wall_time for _, result, _ in runs)
+    print(f"Regression wall time {wall_time:.2f} s (slowest design {slowest:.2f} s), merged report: {merged_path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
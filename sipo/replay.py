@@ -0,0 +1,199 @@
+"""Record and replay of LM70 frame streams
+
+A recording holds one fixed-width 16-byte record per frame: the word
+driven, the CS-high gap after it, the lsb_sel value while CS rose, and the
+SIPO_Q / Latch_Q / uo_out values sampled in the ReadOnly phase of that CS
+rising edge. The gap is measured from the CS rising edges (rise to rise is
+17 + gap SC cycles); the last frame keeps the minimum of 1. The header
+keeps the SC period and reset length, so the bus timing can be rebuilt.
+A recording starts from reset and holds one uninterrupted stream: RESET_N
+pulses in the middle of a run are not recorded.
+The records are a NumPy structured array (RECORD_DTYPE) written as raw
+bytes after the header, so load() can memory-map them.
+
+Recording rides on the scoreboard (Scoreboard(..., recorder=recorder)).
+Replay drives the recorded frames into any DESIGN with an LM70 port and
+diffs its outputs against the recording with array comparisons: no
+stimulus generation and no golden model. D changes on the SC edge the
+DESIGN does not sample on (sipo_sr shifts on the falling edge, the others
+on the rising edge). Outputs the DESIGN does not have are left out of the
+diff.
+
+    make DESIGN=sipo_with_latch_mux REPLAY_RECORD=run.replay     # record
+    make replay DESIGN=sipo_latch REPLAY_FILE=run.replay          # replay
+
+Usage: python replay.py show FILE [--tail N]
+       python replay.py diff EXPECTED ACTUAL
+"""
+import argparse
+import os
+import struct
+import sys
+
+import numpy as np
+
+# flags (0x01 is unused)
+LSB_SEL = 0x02  # lsb_sel was 1 while CS rose
+HAS_SIPO_Q = 0x04
+HAS_LATCH_Q = 0x08
+HAS_UO_OUT = 0x10
+
+OUTPUTS = (("sipo_q", HAS_SIPO_Q), ("latch_q", HAS_LATCH_Q), ("uo_out", HAS_UO_OUT))
+
+RECORD_DTYPE = np.dtype(
+    [("time_ps", "<u8"), ("word", "<u2"), ("gap", "u1"), ("flags", "u1"), ("sipo_q", "<u2"), ("latch_q", "u1"),
+     ("uo_out", "u1")]
+)
+HEADER = struct.Struct("<8sQQQ32s")  # magic, records, SC period (ps), reset length (ps), recorded design
+MAGIC = b"REPLAY\x001"
+
+
+class Recording:
+    """Frame records plus the timing needed to drive them again"""
+
+    def __init__(self, records, sc_period_ps, reset_ps, design=""):
+        self.records = records
+        self.sc_period_ps = sc_period_ps
+        self.reset_ps = reset_ps
+        self.design = design
+
+    def __len__(self):
+        return len(self.records)
+
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(self.records), self.sc_period_ps, self.reset_ps, self.design.encode()[:32]))
+            f.write(np.ascontiguousarray(self.records, dtype=RECORD_DTYPE).tobytes())
+        os.replace(tmp_path, path)
+        return path
+
+
+def load(path, mmap=True):
+    """Reads a recording; the records are memory-mapped unless mmap=False"""
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size or header[:8] != MAGIC:
+            raise ValueError(f"{path}: not a replay recording")
+        _, count, sc_period_ps, reset_ps, design = HEADER.unpack(header)
+        if mmap and count:
+            records = np.memmap(f, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size, shape=(count,))
+        else:
+            records = np.fromfile(f, dtype=RECORD_DTYPE, count=count)
+    return Recording(records, sc_period_ps, reset_ps, design.rstrip(b"\0").decode())
+
+
+class Recorder:
+    """Collects scoreboard frames into a growing record array"""
+
+    def __init__(self, sc_period_ps, reset_ps, design="", capacity=1024):
+        self.sc_period_ps = sc_period_ps
+        self.reset_ps = reset_ps
+        self.design = design
+        self._records = np.zeros(capacity, dtype=RECORD_DTYPE)
+        self._count = 0
+
+    def frame(self, word, tx):
+        """Records a driven word with the monitor transaction taken when its CS rose"""
+        if self._count == len(self._records):
+            self._records = np.resize(self._records, 2 * len(self._records))
+        if self._count:
+            # CS rise to CS rise is the 17 frame cycles plus the previous frame's gap
+            previous = self._records[self._count - 1]
+            cycles = round((tx.time_ps - int(previous["time_ps"])) / self.sc_period_ps)
+            previous["gap"] = min(max(cycles - 17, 1), 255)
+        flags = LSB_SEL if tx.lsb_sel else 0
+        record = self._records[self._count]
+        record["time_ps"] = tx.time_ps
+        record["word"] = word
+        record["gap"] = 1
+        for name, flag in OUTPUTS:
+            value = getattr(tx, name)
+            if value is not None:
+                record[name] = value
+                flags |= flag
+        record["flags"] = flags
+        self._count += 1
+
+    def recording(self):
+        return Recording(self._records[:self._count], self.sc_period_ps, self.reset_ps, self.design)
+
+
+def recorder_from_env(design, sc_period_ps, reset_ps):
+    """Recorder when REPLAY_RECORD names an output file, else None"""
+    if not os.environ.get("REPLAY_RECORD"):
+        return None
+    return Recorder(sc_period_ps, reset_ps, design)
+
+
+def save_recorder(recorder):
+    if recorder is not None:
+        recorder.recording().save(os.environ["REPLAY_RECORD"])
+
+
+def diff(expected, actual):
+    """Compares two record arrays field by field
+
+    Only outputs present in both records are compared. Returns {output:
+    indices of the records that differ}, with empty outputs left out.
+    """
+    count = min(len(expected), len(actual))
+    expected = expected[:count]
+    actual = actual[:count]
+    result = {}
+    if count and (expected["word"] != actual["word"]).any():
+        raise ValueError("the recordings drive different frames")
+    for name, flag in OUTPUTS:
+        both = (expected["flags"] & actual["flags"] & flag) != 0
+        differs = np.flatnonzero(both & (expected[name] != actual[name]))
+        if differs.size:
+            result[name] = differs
+    return result
+
+
+def format_record(index, record):
+    flags = int(record["flags"])
+    outputs = "  ".join(
+        f"{name}={int(record[name]):#x}" if flags & flag else f"{name}=-" for name, flag in OUTPUTS
+    )
+    return (
+        f"{index:8d} {int(record['time_ps']) / 1000:14.3f}ns  word={int(record['word']):#06x} "
+        f"lsb_sel={int(bool(flags & LSB_SEL))} gap={int(record['gap'])}  {outputs}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    show = commands.add_parser("show", help="print the records of a recording")
+    show.add_argument("file")
+    show.add_argument("--tail", type=int, help="only the last N records")
+    compare = commands.add_parser("diff", help="compare the outputs of two recordings of the same frames")
+    compare.add_argument("expected")
+    compare.add_argument("actual")
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        recording = load(args.file)
+        print(
+            f"# {len(recording)} frames recorded from {recording.design or '?'}, "
+            f"SC period {recording.sc_period_ps / 1000:g} ns, reset {recording.reset_ps / 1000:g} ns"
+        )
+        start = max(len(recording) - args.tail, 0) if args.tail else 0
+        for index in range(start, len(recording)):
+            print(format_record(index, recording.records[index]))
+        return 0
+
+    expected, actual = load(args.expected), load(args.actual)
+    if len(expected) != len(actual):
+        print(f"{args.expected} has {len(expected)} frames, {args.actual} has {len(actual)}")
+    differences = diff(expected.records, actual.records)
+    for name, indices in differences.items():
+        print(f"{name}: {indices.size} frames differ, first at frame {int(indices[0])}")
+    if not differences:
+        print(f"{min(len(expected), len(actual))} frames match")
+    return 1 if differences or len(expected) != len(actual) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
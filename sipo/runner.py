@@ -0,0 +1,109 @@
+"""Helpers for launching cocotb make runs as independent processes
+
+Each run gets its own SIM_BUILD directory and COCOTB_RESULTS_FILE so several
+simulations can execute side by side without overwriting each other.
+"""
+import os
+import subprocess
+import time
+import xml.etree.ElementTree as ET
+
+SIPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DESIGNS = ("sipo", "sipo_latch", "mux2to1", "sipo_with_latch_mux", "sipo_multi", "sipo_scan")
+
+# Make target that elaborates a design without running it, per simulator
+BUILD_TARGETS = {"icarus": "sim.vvp", "verilator": "Vtop"}
+
+
+def make_env(env=None):
+    """Environment for a make run rooted in the sipo directory"""
+    run_env = dict(os.environ)
+    # The Makefile locates sources through $(PWD), which make takes from the environment
+    run_env["PWD"] = SIPO_DIR
+    if env:
+        run_env.update({key: str(value) for key, value in env.items()})
+    return run_env
+
+
+def make_args(design, sim_build, results_file=None, variables=None):
+    """Command line for `make DESIGN=... SIM_BUILD=...` with extra make variables"""
+    args = ["make", "-C", SIPO_DIR, f"DESIGN={design}", f"SIM_BUILD={sim_build}"]
+    if results_file is not None:
+        args.append(f"COCOTB_RESULTS_FILE={results_file}")
+    for name, value in (variables or {}).items():
+        args.append(f"{name}={value}")
+    return args
+
+
+def compile_design(design, sim_build, variables=None, env=None, log_path=None):
+    """Elaborates a design into `sim_build` without running any tests"""
+    args = make_args(design, sim_build, variables=variables)
+    sim = (variables or {}).get("SIM", os.environ.get("SIM", "icarus"))
+    if sim == "python":
+        # pysim has nothing to elaborate
+        os.makedirs(sim_build, exist_ok=True)
+        return RunResult(args, 0, 0.0, log_path)
+    args.append(os.path.join(sim_build, BUILD_TARGETS[sim]))
+    return _run(args, make_env(env), log_path)
+
+
+def run_design(design, sim_build, results_file, variables=None, env=None, log_path=None):
+    """Runs the cocotb regression for a design; returns a RunResult"""
+    args = make_args(design, sim_build, results_file, variables)
+    return _run(args, make_env(env), log_path)
+
+
+def start_design(design, sim_build, results_file, variables=None, env=None, log_path=None):
+    """Like run_design, but returns the Popen handle and start time immediately"""
+    args = make_args(design, sim_build, results_file, variables)
+    log = open(log_path, "w") if log_path else subprocess.DEVNULL
+    start = time.perf_counter()
+    proc = subprocess.Popen(args, env=make_env(env), stdout=log, stderr=subprocess.STDOUT)
+    if log_path:
+        log.close()  # The child keeps its own descriptor
+    return proc, start
+
+
+class RunResult:
+    """Outcome of one make invocation"""
+
+    def __init__(self, args, returncode, wall_time, log_path):
+        self.args = args
+        self.returncode = returncode
+        self.wall_time = wall_time
+        self.log_path = log_path
+
+    @property
+    def ok(self):
+        return self.returncode == 0
+
+
+def _run(args, env, log_path):
+    start = time.perf_counter()
+    if log_path:
+        with open(log_path, "w") as log:
+            returncode = subprocess.call(args, env=env, stdout=log, stderr=subprocess.STDOUT)
+    else:
+        returncode = subprocess.call(args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+    return RunResult(args, returncode, time.perf_counter() - start, log_path)
+
+
+def parse_results(path):
+    """Reads the testcases of a cocotb JUnit results file as dicts"""
+    testcases = []
+    if not os.path.exists(path):
+        return testcases
+    for testcase in ET.parse(path).getroot().iter("testcase"):
+        testcases.append(
+            {
+                "name": testcase.get("name"),
+                "classname": testcase.get("classname"),
+                "time": float(testcase.get("time", 0)),
+                "sim_time_ns": float(testcase.get("sim_time_ns", 0)),
+                "ratio_time": float(testcase.get("ratio_time", 0)),
+                "passed": testcase.find("failure") is None and testcase.find("error") is None,
+                "skipped": testcase.find("skipped") is not None,
+            }
+        )
+    return testcases
@@ -0,0 +1,13 @@
+// SDF back-annotation root for timing runs (make SDF_FILE=design.sdf)
+//
+// sdf_annotate is elaborated as an extra root module (iverilog -s sdf_annotate),
+// like hdl_clocks, and annotates SDF_FILE onto the instance named by SDF_SCOPE
+// (the TOPLEVEL) at time zero. The netlist's specify blocks only take effect
+// with iverilog -gspecify, which the Makefile adds with SDF_FILE. Without an
+// SDF file nothing here is compiled and Icarus stays zero-delay.
+
+`ifdef SDF_FILE
+module sdf_annotate;
+    initial $sdf_annotate(`SDF_FILE, `SDF_SCOPE);
+endmodule
+`endif
@@ -0,0 +1,138 @@
+"""Vectorized decoder for recorded seven-segment traces
+
+Turns a whole uo_out / lsb_sel time series into the digits shown, with a
+single table lookup per array instead of a Python loop per sample.
+bcd_to_seven_segment drives 1111111 both for 8 and for every invalid code
+(10-15), so those samples decode to 8 and are flagged ambiguous. When the
+latched nibbles are known as well, resolve() sorts the ambiguous samples
+into real 8s and invalid codes.
+
+Traces come from a VCD dump (from_vcd, using vcd_reader's index) or from
+monitor transactions (from_transactions).
+
+Usage: python segment_decoder.py DUMP.vcd [--uo-out NAME] [--lsb-sel NAME] [--show N]
+"""
+import argparse
+import collections
+import sys
+
+import numpy as np
+
+from golden_model import SEVEN_SEGMENT
+
+AMBIGUOUS_PATTERN = 0b1111111
+INVALID = -1  # decoded digit for a pattern bcd_to_seven_segment never drives
+
+# uo_out pattern -> digit; 1111111 reads as 8
+PATTERN_TO_DIGIT = np.full(128, INVALID, dtype=np.int8)
+PATTERN_TO_DIGIT[SEVEN_SEGMENT[:10]] = np.arange(10, dtype=np.int8)
+
+Trace = collections.namedtuple("Trace", ["times", "uo_out", "lsb_sel"])
+Decoded = collections.namedtuple("Decoded", ["digits", "ambiguous", "illegal"])
+
+
+def decode(uo_out):
+    """Decodes an array of uo_out samples
+
+    Returns Decoded(digits, ambiguous, illegal): the digit per sample (-1
+    for patterns the decoder never produces), a mask of 1111111 samples
+    (8 or invalid BCD), and a mask of illegal patterns.
+    """
+    patterns = np.asarray(uo_out).astype(np.intp) & 0x7F
+    digits = PATTERN_TO_DIGIT[patterns]
+    return Decoded(digits, patterns == AMBIGUOUS_PATTERN, digits == INVALID)
+
+
+def resolve(decoded, nibble):
+    """Digits with the ambiguous samples set to -1 where the shown nibble is not 8"""
+    nibble = np.asarray(nibble)
+    return np.where(decoded.ambiguous & (nibble != 8), INVALID, decoded.digits)
+
+
+def shown_nibble(lsb_sel, latch_q):
+    """The Latch_Q nibble the mux selects for each sample"""
+    latch_q = np.asarray(latch_q)
+    return np.where(np.asarray(lsb_sel) != 0, latch_q >> 4, latch_q & 0xF)
+
+
+def check(uo_out, lsb_sel, latch_q):
+    """Indices where uo_out is not the segment pattern of the selected Latch_Q nibble"""
+    expected = SEVEN_SEGMENT[shown_nibble(lsb_sel, latch_q)]
+    return np.flatnonzero(np.asarray(uo_out) != expected)
+
+
+def digit_sequence(decoded, lsb_sel):
+    """Collapses consecutive repeats into the (digit, lsb_sel, ambiguous) sequence the display showed"""
+    digits = decoded.digits
+    lsb_sel = np.asarray(lsb_sel)
+    if digits.size == 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int), np.empty(0, dtype=bool)
+    keep = np.ones(digits.size, dtype=bool)
+    keep[1:] = (digits[1:] != digits[:-1]) | (lsb_sel[1:] != lsb_sel[:-1])
+    return digits[keep], lsb_sel[keep], decoded.ambiguous[keep]
+
+
+def from_vcd(path, uo_out="uo_out", lsb_sel="lsb_sel"):
+    """Aligns the uo_out and lsb_sel change histories of a dump on one timeline"""
+    from vcd_reader import VCDFile
+
+    with VCDFile(path) as vcd:
+        vcd.load_index()
+        out = vcd.history(uo_out)
+        try:
+            sel = vcd.history(lsb_sel)
+        except KeyError:
+            sel = None
+    if sel is None:
+        known = ~out.unknown
+        return Trace(out.times[known], out.values[known].astype(np.uint8), np.zeros(known.sum(), dtype=np.uint8))
+    times = np.union1d(out.times, sel.times)
+    out_index = np.searchsorted(out.times, times, side="right") - 1
+    sel_index = np.searchsorted(sel.times, times, side="right") - 1
+    # Samples before both signals have a value, or while either is X/Z, are dropped
+    valid = (out_index >= 0) & (sel_index >= 0)
+    valid[valid] &= ~out.unknown[out_index[valid]] & ~sel.unknown[sel_index[valid]]
+    return Trace(
+        times[valid],
+        out.values[out_index[valid]].astype(np.uint8),
+        sel.values[sel_index[valid]].astype(np.uint8),
+    )
+
+
+def from_transactions(transactions):
+    """Trace from monitor.Transaction records (samples with X values are dropped)"""
+    rows = [(tx.time_ps, tx.uo_out, tx.lsb_sel) for tx in transactions if None not in (tx.uo_out, tx.lsb_sel)]
+    if not rows:
+        return Trace(np.empty(0, np.int64), np.empty(0, np.uint8), np.empty(0, np.uint8))
+    times, uo_out, lsb_sel = np.array(rows, dtype=np.int64).T
+    return Trace(times, uo_out.astype(np.uint8), lsb_sel.astype(np.uint8))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("vcd")
+    parser.add_argument("--uo-out", default="uo_out")
+    parser.add_argument("--lsb-sel", default="lsb_sel")
+    parser.add_argument("--show", type=int, default=20, help="digits of the shown sequence to print")
+    args = parser.parse_args(argv)
+
+    try:
+        trace = from_vcd(args.vcd, args.uo_out, args.lsb_sel)
+    except KeyError as missing:
+        print(f"{args.vcd}: no signal named {missing}")
+        return 2
+    decoded = decode(trace.uo_out)
+    digits, lsb_sel, ambiguous = digit_sequence(decoded, trace.lsb_sel)
+    counts = np.bincount(decoded.digits[~decoded.illegal], minlength=10)
+    print(f"{trace.times.size} samples, {digits.size} digit changes")
+    print("digits: " + "  ".join(f"{n}:{count}" for n, count in enumerate(counts) if count))
+    print(f"ambiguous (8 or invalid BCD): {int(decoded.ambiguous.sum())}")
+    print(f"illegal patterns: {int(decoded.illegal.sum())}")
+    shown = [f"{'?' if flag else ''}{digit}{'MSB' if sel else 'LSB'}" for digit, sel, flag in
+             zip(digits[:args.show].tolist(), lsb_sel[:args.show].tolist(), ambiguous[:args.show].tolist())]
+    print("sequence: " + " ".join(shown))
+    return 1 if decoded.illegal.any() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
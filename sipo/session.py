@@ -0,0 +1,129 @@
+"""Runs the tests of several modules against one elaborated design
+
+MODULE=session collects every test of the modules listed in SESSION_TESTS
+and runs them in order in a single simulator launch, so adding tests adds
+only their own sim time. Before each test the design is quiesced: native
+clocks are stopped and released, every input is driven idle, RESET_N is
+pulsed (with two SC edges, which SIPO_Q needs to clear), and the outputs
+are checked to be back at their reset values. A test therefore starts
+from the same known state whatever the previous one left behind. After the
+first test the reset is restored from its snapshot under PRIMS=rtl (see
+snapshot.py).
+
+SESSION_TESTS is a comma separated list of `module` (all of its tests) or
+`module:test+test` entries:
+
+    make session DESIGN=sipo_with_latch_mux \\
+        SESSION_TESTS=test_sipo_with_latch_mux2,test_sipo_with_latch_mux_coverage
+"""
+import importlib
+import os
+
+import cocotb
+from cocotb.regression import Test
+from cocotb.triggers import Timer
+
+from hdl_clock import release_all
+from snapshot import mark_fresh, reset
+
+DEFAULT_TESTS = "test_sipo_with_latch_mux2,test_sipo_with_latch_mux_coverage"
+RESET_NS = 20
+
+# Per-channel (width, value) of the outputs right after reset with CS high and lsb_sel low;
+# sipo_multi packs one slice per channel into each port
+RESET_VALUES = {"SIPO_Q": (16, 0), "sipo_Q": (16, 0), "Latch_Q": (8, 0), "uo_out": (7, 0b1111110)}
+
+# cocotb.test() options carried over to the session wrapper
+TEST_OPTIONS = ("timeout_time", "timeout_unit", "expect_fail", "expect_error", "skip", "stage")
+
+
+async def _session_reset(dut):
+    """Idles every input and resets the design, clocking SC so SIPO_Q clears too"""
+    for name in ("SC", "clk"):
+        if hasattr(dut, name):
+            getattr(dut, name).value = 0
+    if hasattr(dut, "CS"):
+        dut.CS.value = (1 << len(dut.CS)) - 1  # Every chip select high
+    for name in ("D", "SIO", "lsb_sel"):
+        # sipo_scan_display drives lsb_sel itself
+        if hasattr(dut, name) and not (name == "lsb_sel" and hasattr(dut, "digit_en")):
+            getattr(dut, name).value = 0
+    dut.RESET_N.value = 0
+    await Timer(RESET_NS // 2, units="ns")
+    # SIPO_Q is clocked by SC and only clears on an SC edge while RESET_N is low
+    for _ in range(2):
+        dut.SC.value = 1
+        await Timer(RESET_NS // 8, units="ns")
+        dut.SC.value = 0
+        await Timer(RESET_NS // 8, units="ns")
+    dut.RESET_N.value = 1
+    await Timer(1, units="ns")
+
+
+def reset_value(handle, width, value):
+    """The per-channel reset value repeated across every channel slice of `handle`"""
+    return sum(value << (width * i) for i in range(max(len(handle) // width, 1)))
+
+
+async def quiesce(dut):
+    """Parks the clocks, idles the inputs and resets the design
+
+    The test's own `await reset(dut)` then returns at once instead of
+    resetting a second time.
+    """
+    release_all()
+    mark_fresh(False)
+    await reset(dut, ritual=_session_reset)
+    dirty = []
+    for name, (width, value) in RESET_VALUES.items():
+        if hasattr(dut, name):
+            handle = getattr(dut, name)
+            sample = handle.value
+            if not sample.is_resolvable or sample.integer != reset_value(handle, width, value):
+                dirty.append(f"{name} = {sample}")
+    assert not dirty, "Design did not return to its reset state: " + ", ".join(dirty)
+    mark_fresh()
+
+
+def _session_test(module_name, test):
+    # cocotb wraps a test with a timeout in its own coroutine; the wrapper below applies it again
+    func = getattr(test._func, "__wrapped__", test._func)
+
+    async def run(dut):
+        await quiesce(dut)
+        await func(dut)
+
+    run.__name__ = run.__qualname__ = f"{module_name}.{test.__name__}"
+    run.__doc__ = test.__doc__
+    options = {name: getattr(test, name) for name in TEST_OPTIONS if hasattr(test, name)}
+    return cocotb.test(**options)(run)
+
+
+def _collect(spec):
+    for entry in spec.split(","):
+        module_name, _, names = entry.strip().partition(":")
+        if not module_name:
+            continue
+        module = importlib.import_module(module_name)
+        tests = [thing for thing in vars(module).values() if isinstance(thing, Test)]
+        if names:
+            wanted = names.split("+")
+            missing = set(wanted) - {test.__name__ for test in tests}
+            if missing:
+                raise AttributeError(f"{module_name} has no test(s) {', '.join(sorted(missing))}")
+            tests = [test for test in tests if test.__name__ in wanted]
+        for test in tests:
+            yield module_name, test
+
+
+def _register(spec):
+    # Only the wrappers may be module globals, or cocotb would discover the originals too
+    tests = list(_collect(spec))
+    if not tests:
+        raise ValueError(f"SESSION_TESTS={spec!r} selects no tests")
+    for module_name, test in tests:
+        globals()[f"{module_name}__{test.__name__}"] = _session_test(module_name, test)
+
+
+# make session exports SESSION_TESTS even when it is not set, so empty means the default
+_register(os.environ.get("SESSION_TESTS") or DEFAULT_TESTS)
@@ -0,0 +1,193 @@
+"""SC period and CS/D timing-margin shmoo of sipo_with_latch, in parallel workers
+
+Every combination of SC period, CS setup (CS falling to the first SC rising
+edge), CS hold (17th SC rising edge to CS rising) and D setup (D change to
+the SC rising edge that samples it) is a grid point. The design is compiled
+once, the grid is dealt round-robin to worker processes, and each worker runs
+test_shmoo over its points in a single simulator launch, resetting between
+them. A point passes when every frame latches the golden Latch_Q.
+
+Icarus runs zero-delay by default, so only the protocol margins show up: D
+setup must stay below one SC period, and CS must rise after the 17th edge
+but before the 18th. With an SDF file (--sdf, optionally --netlist for a
+gate-level netlist) the cell delays and timing checks are annotated and the
+real setup/hold limits appear in the map.
+
+The script prints one map per swept margin (SC period down, margin across;
+# pass, . fail, the other margins at the values that pass most often). It
+reports the fastest SC period that passes at those reference margins and
+the tightest passing margins at that period, and writes every point to
+shmoo.json.
+
+Usage: python shmoo.py [--sc-ps ...] [--cs-setup-ps ...] [--cs-hold-ps ...] [--d-setup-ps ...]
+                       [--workers N] [--frames N] [--sdf FILE [--netlist FILE]] [--var NAME=VALUE ...]
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+
+import runner
+
+DESIGN = "sipo_latch"
+SHMOO_MODULE = "test_shmoo"
+
+SC_PS = (20000, 10000, 5000, 2000, 1000, 500, 200, 100)
+CS_SETUP_PS = (0, 10, 50, 100, 500, 1000)
+CS_HOLD_PS = (0, 10, 50, 100, 500, 1000, 5000, 10000, 15000)
+D_SETUP_PS = (0, 10, 50, 100, 500, 1000, 5000, 10000)
+MARGINS = ("cs_setup_ps", "cs_hold_ps", "d_setup_ps")
+
+
+def grid(sc_ps, cs_setup_ps, cs_hold_ps, d_setup_ps):
+    return [
+        {"sc_ps": sc, "cs_setup_ps": cs_setup, "cs_hold_ps": cs_hold, "d_setup_ps": d_setup}
+        for sc, cs_setup, cs_hold, d_setup in itertools.product(sc_ps, cs_setup_ps, cs_hold_ps, d_setup_ps)
+    ]
+
+
+def run_shmoo(points, workers, out_dir, frames, variables=None):
+    """Runs the grid across worker processes; returns every point with its result"""
+    out_dir = os.path.abspath(out_dir)
+    sim_build = os.path.join(out_dir, "sim_build")
+    os.makedirs(out_dir, exist_ok=True)
+    variables = dict(variables or {}, MODULE=SHMOO_MODULE)
+
+    build = runner.compile_design(DESIGN, sim_build, variables, log_path=os.path.join(out_dir, "compile.log"))
+    if not build.ok:
+        raise RuntimeError(f"Compile failed, see {build.log_path}")
+
+    workers = max(1, min(workers, len(points)))
+    procs = []
+    for worker in range(workers):
+        points_path = os.path.join(out_dir, f"worker{worker}_points.json")
+        report_path = os.path.join(out_dir, f"worker{worker}.json")
+        with open(points_path, "w") as f:
+            json.dump(points[worker::workers], f)
+        if os.path.exists(report_path):
+            os.remove(report_path)
+        env = {"SHMOO_POINTS": points_path, "SHMOO_REPORT": report_path, "SHMOO_FRAMES": frames}
+        proc, _ = runner.start_design(
+            DESIGN,
+            sim_build,
+            os.path.join(out_dir, f"worker{worker}.xml"),
+            variables,
+            env,
+            log_path=os.path.join(out_dir, f"worker{worker}.log"),
+        )
+        procs.append((worker, proc, report_path))
+
+    results = []
+    for worker, proc, report_path in procs:
+        proc.wait()
+        if proc.returncode != 0 or not os.path.exists(report_path):
+            raise RuntimeError(f"Worker {worker} exited with {proc.returncode}, see {out_dir}/worker{worker}.log")
+        with open(report_path) as f:
+            results.extend(json.load(f))
+    for result in results:
+        result["passed"] = result["mismatches"] == 0
+    return results
+
+
+def reference_margins(results):
+    """Per margin, the value that passes at the most grid points (ties go to the larger value)"""
+    reference = {}
+    for name in MARGINS:
+        passes = {}
+        for result in results:
+            passes[result[name]] = passes.get(result[name], 0) + result["passed"]
+        reference[name] = max(passes, key=lambda value: (passes[value], value))
+    return reference
+
+
+def shmoo_map(results, margin):
+    """Text map of SC period against one margin, the other margins at their reference values"""
+    reference = {name: value for name, value in reference_margins(results).items() if name != margin}
+    cells = {
+        (result["sc_ps"], result[margin]): result["passed"]
+        for result in results
+        if all(result[name] == value for name, value in reference.items())
+    }
+    periods = sorted({sc for sc, _ in cells}, reverse=True)
+    values = sorted({value for _, value in cells})
+    width = max(len(str(value)) for value in values) + 1
+    lines = [f"{margin} (others at {', '.join(f'{name}={value}' for name, value in reference.items())})"]
+    lines.append(f"{'sc_ps':>8s} " + "".join(f"{value:>{width}d}" for value in values))
+    for sc in periods:
+        marks = "".join(f"{'#' if cells.get((sc, value)) else '.':>{width}s}" for value in values)
+        lines.append(f"{sc:8d} {marks}")
+    return "\n".join(lines)
+
+
+def summarize(results):
+    """Fastest SC period passing at the reference margins, and the tightest passing margins there"""
+    reference = reference_margins(results)
+    passing_periods = [
+        result["sc_ps"]
+        for result in results
+        if result["passed"] and all(result[name] == value for name, value in reference.items())
+    ]
+    if not passing_periods:
+        return {"fastest_sc_ps": None}
+    fastest = min(passing_periods)
+    summary = {"fastest_sc_ps": fastest}
+    passing = [result for result in results if result["sc_ps"] == fastest and result["passed"]]
+    for margin in MARGINS:
+        # Swept alone, like the maps: every other margin at its reference value
+        summary[f"tightest_{margin}"] = min(
+            result[margin]
+            for result in passing
+            if all(result[name] == reference[name] for name in MARGINS if name != margin)
+        )
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sc-ps", nargs="+", type=int, default=list(SC_PS), help="SC periods")
+    parser.add_argument("--cs-setup-ps", nargs="+", type=int, default=list(CS_SETUP_PS))
+    parser.add_argument("--cs-hold-ps", nargs="+", type=int, default=list(CS_HOLD_PS))
+    parser.add_argument("--d-setup-ps", nargs="+", type=int, default=list(D_SETUP_PS))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="simulator processes")
+    parser.add_argument("--frames", type=int, default=32, help="frames per grid point")
+    parser.add_argument("--sdf", help="SDF file to annotate (Icarus)")
+    parser.add_argument("--netlist", help="gate-level netlist to simulate instead of the RTL")
+    parser.add_argument("--out", default="shmoo_build", help="directory for the build, logs and shmoo.json")
+    parser.add_argument("--var", action="append", default=[], help="extra make variable, e.g. PRIMS=rtl")
+    args = parser.parse_args(argv)
+
+    variables = dict(item.split("=", 1) for item in args.var)
+    variables.setdefault("WAVES", "0")
+    if args.sdf:
+        variables["SDF_FILE"] = os.path.abspath(args.sdf)
+    if args.netlist:
+        variables["NETLIST"] = os.path.abspath(args.netlist)
+    points = grid(args.sc_ps, args.cs_setup_ps, args.cs_hold_ps, args.d_setup_ps)
+
+    start = time.perf_counter()
+    results = run_shmoo(points, args.workers, args.out, args.frames, variables)
+    wall_time = time.perf_counter() - start
+
+    for margin in MARGINS:
+        print(shmoo_map(results, margin))
+        print()
+    summary = summarize(results)
+    passed = sum(result["passed"] for result in results)
+    print(f"{passed} of {len(results)} points pass ({args.workers} workers, {wall_time:.1f} s)")
+    if summary["fastest_sc_ps"] is None:
+        print("No SC period passes with the reference margins")
+    else:
+        print(
+            f"Fastest SC period {summary['fastest_sc_ps']} ps; tightest passing margins there: "
+            + ", ".join(f"{name} {summary[f'tightest_{name}']}" for name in MARGINS)
+        )
+    with open(os.path.join(os.path.abspath(args.out), "shmoo.json"), "w") as f:
+        report = {"variables": variables, "frames": args.frames, "wall_time": wall_time, "summary": summary}
+        json.dump(dict(report, points=results), f, indent=1)
+    return 0 if summary["fastest_sc_ps"] is not None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
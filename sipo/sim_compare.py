@@ -0,0 +1,92 @@
+"""Side-by-side Icarus and Verilator benchmark on the bench_lm70 workloads
+
+Every DESIGN is compiled from scratch with each simulator and then runs
+the same frame counts. The script prints compile time, frames/sec, the
+sim-time/wall-time ratio and the simulator's peak RSS, plus Verilator's
+speedup over Icarus, and writes the table to sim_compare.json in the
+output directory. Both simulators build the behavioral primitives
+(PRIMS=rtl; Verilator cannot build the UDP cells), so they simulate the
+same RTL.
+
+Usage: python sim_compare.py [--designs ...] [--workloads ...] [--repeat N]
+                             [--sims icarus verilator] [--var NAME=VALUE ...]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+
+import bench
+import runner
+
+SIMS = ("icarus", "verilator")
+WORKLOADS = (1_000, 65_536)
+
+
+def summarize(compile_time, samples):
+    return {
+        "compile_time": compile_time,
+        "wall_time": statistics.mean(s["wall_time"] for s in samples),
+        "frames_per_sec": statistics.mean(s["frames_per_sec"] for s in samples),
+        "ratio_time": statistics.mean(s["ratio_time"] for s in samples),
+        "peak_rss_kb": max(s["peak_rss_kb"] for s in samples),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--designs", nargs="+", default=list(runner.DESIGNS))
+    parser.add_argument("--workloads", nargs="+", type=int, default=list(WORKLOADS), help="frame counts")
+    parser.add_argument("--repeat", type=int, default=3, help="samples per workload")
+    parser.add_argument("--sims", nargs="+", default=list(SIMS))
+    parser.add_argument("--out", default="sim_compare_build")
+    parser.add_argument("--var", action="append", default=[], help="extra make variable, e.g. HDL_CLOCKS=0")
+    args = parser.parse_args(argv)
+
+    variables = dict(item.split("=", 1) for item in args.var)
+    variables.setdefault("MODULE", bench.BENCH_MODULE)
+    variables.setdefault("WAVES", "0")
+    variables.setdefault("PRIMS", "rtl")
+    out_dir = os.path.abspath(args.out)
+
+    rows = []
+    for design in args.designs:
+        builds = {}  # sim -> (sim_build, compile time), or the compile error
+        for sim in args.sims:
+            try:
+                builds[sim] = bench.compile_bench(design, os.path.join(out_dir, sim), dict(variables, SIM=sim))
+            except RuntimeError as error:
+                builds[sim] = error
+        for frames in args.workloads:
+            row = {"design": design, "frames": frames}
+            for sim in args.sims:
+                try:
+                    if isinstance(builds[sim], RuntimeError):
+                        raise builds[sim]
+                    sim_build, compile_time = builds[sim]
+                    samples = bench.run_workload(
+                        design, sim_build, frames, args.repeat, os.path.join(out_dir, sim), dict(variables, SIM=sim)
+                    )
+                except RuntimeError as error:
+                    print(f"{design:22s} {frames:8d} frames  {sim:9s} {error}")
+                    continue
+                row[sim] = summarize(compile_time, samples)
+                print(
+                    f"{design:22s} {frames:8d} frames  {sim:9s} compile {compile_time:6.2f} s  "
+                    f"{row[sim]['frames_per_sec']:9.0f} frames/s  ratio {row[sim]['ratio_time']:9.0f}  "
+                    f"rss {row[sim]['peak_rss_kb'] / 1024:7.1f} MiB"
+                )
+            if "icarus" in row and "verilator" in row:
+                row["speedup"] = row["verilator"]["frames_per_sec"] / row["icarus"]["frames_per_sec"]
+                print(f"{design:22s} {frames:8d} frames  verilator runs {row['speedup']:.1f}x icarus")
+            rows.append(row)
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "sim_compare.json"), "w") as f:
+        json.dump({"repeat": args.repeat, "variables": variables, "runs": rows}, f, indent=1)
+    return 0 if all(sim in row for row in rows for sim in args.sims) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -43,11 +43,13 @@ module sipo_with_latch (
         Latch_Q_MSB = Latch_Q[7:4]; // Upper 4 bits
     end
 //endmodule
-//Dump file setup for GTKWAVE
+//Dump file setup for GTKWAVE (make WAVES=1)
+`ifdef DUMP_VCD
 initial begin 
 	$dumpfile("sipo_with_latch.vcd");
 	$dumpvars(0,sipo_with_latch);
 end
+`endif
 endmodule 
 
 
@@ -61,6 +63,17 @@ module sipo_shift_register (
     output reg [15:0] Q         // Parallel Output
 );
 
+`ifdef PRIMS_RTL
+    // Behavioral equivalent of the 16 udp_dff$PR cells (make PRIMS=rtl)
+    reg [15:0] dff_q;            // Internal D flip-flop outputs
+
+    always @(posedge SC or negedge RESET_N) begin
+        if (!RESET_N)
+            dff_q <= 16'b0;
+        else
+            dff_q <= {dff_q[14:0], D};
+    end
+`else
     wire [15:0] dff_q;           // Internal D flip-flop outputs
 
     // Instantiate 16 active-low reset D flip-flops
@@ -86,6 +99,7 @@ module sipo_shift_register (
             end
         end
     endgenerate
+`endif
 
     // Assign the parallel output Q
     always @(posedge SC or posedge RESET_N) begin
@@ -105,6 +119,19 @@ module async_active_low_reset_dlatch_8bit (
     input RESET_N,                // Active-low reset
     input SC                      // Serial clock
 );
+`ifdef PRIMS_RTL
+    // Behavioral equivalent of the 8 udp_dlatch$PR cells (make PRIMS=rtl)
+    reg [7:0] latch_q;
+
+    always @(*) begin
+        if (!RESET_N)
+            latch_q = 8'b0;
+        else if (!CS)
+            latch_q = Data_in;
+    end
+
+    assign Q = latch_q;
+`else
     // Generate 8 instances of the D latch
     genvar i;
     generate
@@ -117,5 +144,6 @@ module async_active_low_reset_dlatch_8bit (
             );
         end
     endgenerate
+`endif
 endmodule
 
@@ -0,0 +1,38 @@
+// Multi-Channel LM70 Front End
+
+// N sipo_with_latch_mux channels on one shared Serial Clock; each sensor has
+// its own chip select, data line and display select. Channel i uses bit i of
+// CS, D and lsb_sel and slice i of the packed Latch_Q, uo_out and SIPO_Q.
+
+module sipo_multi #(
+    parameter N = 4                  // Number of LM70 channels
+) (
+    input [N-1:0] CS,                // Chip Selects (Active Low), one per channel
+    input SC,                        // Shared Serial Clock
+    input RESET_N,                   // Reset (Active Low)
+    input [N-1:0] D,                 // Serial Data Inputs
+    input [N-1:0] lsb_sel,           // LSB/MSB display selects
+    input clk,                       // Clock for mux2to1
+    output [8*N-1:0] Latch_Q,        // Latched outputs, 8 bits per channel
+    output [7*N-1:0] uo_out,         // Seven-segment outputs, 7 bits per channel
+    output [16*N-1:0] SIPO_Q         // SIPO outputs, 16 bits per channel
+);
+
+    genvar i;
+    generate
+        for (i = 0; i < N; i = i + 1) begin : channel
+            sipo_with_latch_mux sensor (
+                .CS(CS[i]),
+                .SC(SC),
+                .RESET_N(RESET_N),
+                .D(D[i]),
+                .lsb_sel(lsb_sel[i]),
+                .clk(clk),
+                .Latch_Q(Latch_Q[8*i +: 8]),
+                .uo_out(uo_out[7*i +: 7]),
+                .SIPO_Q(SIPO_Q[16*i +: 16])
+            );
+        end
+    endgenerate
+
+endmodule
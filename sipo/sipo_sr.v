@@ -6,10 +6,12 @@ module sipo_sr (
     output reg [15:0] sipo_Q  // Parallel output
 );
 
+`ifdef DUMP_VCD
  initial begin
         $dumpfile("dump.vcd");
         $dumpvars(1,sipo_sr);
     end
+`endif
 
 
 
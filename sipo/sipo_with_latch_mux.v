@@ -70,6 +70,17 @@ module sipo_shift_register (
     output reg [15:0] Q         // Parallel Output
 );
 
+`ifdef PRIMS_RTL
+    // Behavioral equivalent of the 16 udp_dff$PR cells (make PRIMS=rtl)
+    reg [15:0] dff_q;            // Internal D flip-flop outputs
+
+    always @(posedge SC or negedge RESET_N) begin
+        if (!RESET_N)
+            dff_q <= 16'b0;
+        else
+            dff_q <= {dff_q[14:0], D};
+    end
+`else
     wire [15:0] dff_q;           // Internal D flip-flop outputs
 
     // Instantiate 16 active-low reset D flip-flops
@@ -94,6 +105,7 @@ module sipo_shift_register (
             end
         end
     endgenerate
+`endif
 
     // Assign the parallel output Q
     always @(posedge SC or posedge RESET_N) begin
@@ -113,6 +125,19 @@ module async_active_low_reset_dlatch_8bit (
     input RESET_N,                // Active-low reset
     input SC                      // Serial clock
 );
+`ifdef PRIMS_RTL
+    // Behavioral equivalent of the 8 udp_dlatch$PR cells (make PRIMS=rtl)
+    reg [7:0] latch_q;
+
+    always @(*) begin
+        if (!RESET_N)
+            latch_q = 8'b0;
+        else if (!CS)
+            latch_q = Data_in;
+    end
+
+    assign Q = latch_q;
+`else
     // Generate 8 instances of the D latch
     genvar i;
     generate
@@ -125,6 +150,7 @@ module async_active_low_reset_dlatch_8bit (
             );
         end
     endgenerate
+`endif
 endmodule
 
 
@@ -163,6 +189,10 @@ module mux2to1 (
 );
     wire [3:0] y_internal;
 
+`ifdef PRIMS_RTL
+    // Behavioral equivalent of the 4 udp_mux_2to1 cells (make PRIMS=rtl)
+    assign y_internal = lsb_sel ? Latch_Q_MSB : Latch_Q_LSB;
+`else
     // Generate 4 instances of the 1-bit mux
     genvar i;
     generate
@@ -175,6 +205,7 @@ module mux2to1 (
             );
         end
     endgenerate
+`endif
 
     // Assign the internal output to the final output
     assign bcd_data = y_internal;
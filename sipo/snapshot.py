@@ -0,0 +1,124 @@
+"""Post-reset snapshot of a design, restored by deposit instead of re-running reset
+
+Tests start with `await reset(dut)` in place of the reset ritual. Every
+call first stops and releases the native clocks (hdl_clocks.v), so the
+ports are Python's again. With SNAPSHOT=1, the first call in a simulator
+launch runs the ritual and captures every signal of the elaborated
+hierarchy. Later calls restore that state directly: the inputs are driven
+to their captured values, every register is deposited back, and every
+signal, nets included, is read back and compared with the snapshot (the
+clock ports are driven but not compared). If anything differs, the ritual
+runs instead, so a restored test always starts from exactly the captured
+state.
+
+The Makefile sets SNAPSHOT=1 only for PRIMS=rtl: the state held in the
+PRIMS=pdk UDP cells cannot be reached by a deposit, so there every restore
+would fall back and cost more than the ritual alone. `make snapshot-check`
+(test_snapshot) shows the restore working. Neither Icarus nor Verilator, as
+cocotb builds them, can checkpoint a running simulation, so the snapshot
+lives on the Python side of the GPI. pysim handles have no hierarchy to walk
+and always take the ritual.
+"""
+import os
+
+from cocotb.triggers import Timer
+
+from hdl_clock import release_all
+
+try:
+    from cocotb.handle import ModifiableObject, RegionObject
+except ImportError:  # pysim
+    RegionObject = None
+
+RESET_NS = 20
+CLOCK_PORTS = ("SC", "clk")  # Driven idle on restore, not compared (hdl_clocks.v forces them while running)
+
+_snapshots = {}  # ritual -> Snapshot, one per simulator launch
+_fresh = False  # Set by mark_fresh(): the design was just reset and nothing has run since
+
+
+def _inputs(dut):
+    # sipo_scan_display drives lsb_sel itself
+    names = ("SC", "RESET_N", "CS", "D", "SIO", "lsb_sel", "clk")
+    return [
+        name for name in names if hasattr(dut, name) and not (name == "lsb_sel" and hasattr(dut, "digit_en"))
+    ]
+
+
+async def reset_ritual(dut):
+    """SC low, CS high and RESET_N low for 20 ns, then out of reset"""
+    dut.SC.value = 0
+    dut.RESET_N.value = 0
+    dut.CS.value = (1 << len(dut.CS)) - 1  # Every chip select high
+    for name in _inputs(dut):
+        if name in ("D", "SIO", "lsb_sel"):
+            getattr(dut, name).value = 0
+    await Timer(RESET_NS, units="ns")
+    dut.RESET_N.value = 1
+    await Timer(1, units="ns")
+
+
+def _walk(handle):
+    for child in handle:
+        if isinstance(child, RegionObject):
+            yield from _walk(child)
+        elif isinstance(child, ModifiableObject):
+            yield child
+
+
+class Snapshot:
+    """Values of every signal of an elaborated design at one instant"""
+
+    def __init__(self, dut):
+        self.inputs = [(getattr(dut, name), getattr(dut, name).value) for name in _inputs(dut)]
+        clocks = {getattr(dut, name)._path for name in CLOCK_PORTS if hasattr(dut, name)}
+        self.signals = [(handle, handle.value) for handle in _walk(dut) if handle._path not in clocks]
+        # Nets follow their drivers once the inputs and registers are back
+        self.registers = [(handle, value) for handle, value in self.signals if handle._type != "GPI_NET"]
+        self.restores = 0
+        self.fallbacks = 0
+
+    async def restore(self):
+        """Deposits the captured state; returns the paths of signals that did not come back"""
+        for handle, value in self.inputs:
+            handle.value = value
+        await Timer(1, units="step")
+        # A step later, so edges caused by the input writes cannot overwrite the registers
+        for handle, value in self.registers:
+            handle.value = value
+        await Timer(1, units="step")
+        return [handle._path for handle, value in self.signals if str(handle.value) != str(value)]
+
+
+def mark_fresh(fresh=True):
+    """Lets the next reset() return at once, for a caller that has just reset the design itself"""
+    global _fresh
+    _fresh = fresh
+
+
+async def reset(dut, ritual=reset_ritual):
+    """Brings the design to its post-reset state, from the snapshot once one is captured"""
+    global _fresh
+    if _fresh:
+        _fresh = False
+        return
+    release_all()
+    snapshot = _snapshots.get(ritual)
+    if snapshot is not None:
+        differ = await snapshot.restore()
+        if not differ:
+            snapshot.restores += 1
+            return
+        if not snapshot.fallbacks:
+            dut._log.info(
+                f"Snapshot restore left {len(differ)} signal(s) off ({', '.join(differ[:3])}), running the reset"
+            )
+        snapshot.fallbacks += 1
+    await ritual(dut)
+    if snapshot is None and RegionObject is not None and os.environ.get("SNAPSHOT", "0") == "1":
+        _snapshots[ritual] = Snapshot(dut)
+
+
+def captured(ritual=reset_ritual):
+    """The snapshot taken for `ritual` in this launch, or None"""
+    return _snapshots.get(ritual)
@@ -0,0 +1,126 @@
+"""Exhaustive 65,536-word sweep of sipo_with_latch_mux, sharded across processes
+
+The design is compiled once, then the code space is split into contiguous
+shards that run as independent simulator processes. Per-shard reports are
+merged into a single pass/fail summary with each shard's frames/sec.
+
+Usage: python sweep.py [--shards N] [--out DIR] [--var NAME=VALUE ...]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import runner
+
+CODE_SPACE = 1 << 16
+SWEEP_MODULE = "test_sipo_with_latch_mux_sweep"
+
+
+def shard_range(shard, shards):
+    """Contiguous slice of the 16-bit code space owned by one shard"""
+    return range(shard * CODE_SPACE // shards, (shard + 1) * CODE_SPACE // shards)
+
+
+def run_sweep(shards, out_dir, variables=None):
+    """Runs every shard concurrently and returns the merged report"""
+    out_dir = os.path.abspath(out_dir)
+    sim_build = os.path.join(out_dir, "sim_build")
+    os.makedirs(out_dir, exist_ok=True)
+    variables = dict(variables or {}, MODULE=SWEEP_MODULE)
+
+    # Elaborate once so the shards only share a read-only build (sim.vvp or Vtop)
+    build = runner.compile_design(
+        "sipo_with_latch_mux", sim_build, variables, log_path=os.path.join(out_dir, "compile.log")
+    )
+    if not build.ok:
+        raise RuntimeError(f"Compile failed, see {build.log_path}")
+
+    start = time.perf_counter()
+    procs = []
+    for shard in range(shards):
+        report_path = os.path.join(out_dir, f"shard{shard}.json")
+        if os.path.exists(report_path):
+            os.remove(report_path)
+        env = {"SWEEP_SHARD": shard, "SWEEP_SHARDS": shards, "SWEEP_REPORT": report_path}
+        # One transaction log per shard (only written when TXLOG_LEVEL is set)
+        env["TXLOG_PATH"] = os.path.join(out_dir, f"txlog{shard}.bin")
+        proc, _ = runner.start_design(
+            "sipo_with_latch_mux",
+            sim_build,
+            os.path.join(out_dir, f"shard{shard}.xml"),
+            variables,
+            env,
+            log_path=os.path.join(out_dir, f"shard{shard}.log"),
+        )
+        procs.append((shard, proc, report_path))
+
+    shard_reports = []
+    for shard, proc, report_path in procs:
+        proc.wait()
+        if os.path.exists(report_path):
+            with open(report_path) as f:
+                report = json.load(f)
+        else:
+            words = shard_range(shard, shards)
+            report = {
+                "shard": shard,
+                "shards": shards,
+                "first_word": words.start,
+                "last_word": words.stop - 1,
+                "frames": 0,
+                "mismatches": None,
+                "failures": [f"shard process exited with {proc.returncode} without a report"],
+                "wall_time": 0.0,
+                "frames_per_sec": 0.0,
+            }
+        report["returncode"] = proc.returncode
+        shard_reports.append(report)
+    wall_time = time.perf_counter() - start
+
+    frames = sum(report["frames"] for report in shard_reports)
+    passed = frames == CODE_SPACE and all(
+        report["returncode"] == 0 and report["mismatches"] == 0 for report in shard_reports
+    )
+    merged = {
+        "passed": passed,
+        "shards": shards,
+        "frames": frames,
+        "mismatches": sum(report["mismatches"] or 0 for report in shard_reports),
+        "wall_time": wall_time,
+        "frames_per_sec": frames / wall_time if wall_time else 0.0,
+        "shard_reports": shard_reports,
+    }
+    with open(os.path.join(out_dir, "sweep_report.json"), "w") as f:
+        json.dump(merged, f, indent=2)
+    return merged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 1, help="number of simulator processes")
+    parser.add_argument("--out", default="sweep_build", help="directory for builds, logs and reports")
+    parser.add_argument("--var", action="append", default=[], help="extra make variable, e.g. PDK_PATH=...")
+    args = parser.parse_args(argv)
+
+    variables = dict(item.split("=", 1) for item in args.var)
+    merged = run_sweep(args.shards, args.out, variables)
+
+    for report in merged["shard_reports"]:
+        print(
+            f"shard {report['shard']:3d}  words {report['first_word']:#06x}-{report['last_word']:#06x}  "
+            f"frames {report['frames']:6d}  mismatches {report['mismatches']}  "
+            f"{report['frames_per_sec']:10.0f} frames/s"
+        )
+        for failure in report["failures"]:
+            print(f"    {failure}")
+    print(
+        f"{'PASS' if merged['passed'] else 'FAIL'}: {merged['frames']} frames on {merged['shards']} shards "
+        f"in {merged['wall_time']:.1f} s ({merged['frames_per_sec']:.0f} frames/s aggregate)"
+    )
+    return 0 if merged["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
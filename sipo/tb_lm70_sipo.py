@@ -1,13 +1,14 @@
 import cocotb
-from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, FallingEdge, Timer
 
+from hdl_clock import HdlClock
+
 # Testbench for the sipo_sr module
 @cocotb.test()
 async def tb_lm70_sipo(dut):
     # Clock and Reset setup
-    clock = Clock(dut.SC, 10, units="ns")  # Clock period is 10 ns (i.e., 100MHz)
-    cocotb.fork(clock.start())  # Start clock
+    clock = HdlClock(dut.SC, 10, units="ns")  # Clock period is 10 ns (i.e., 100MHz)
+    clock.start()  # Start clock, toggled inside the simulator
     
     # Initialize signals
     dut.CS.value = 1
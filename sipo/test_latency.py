@@ -0,0 +1,69 @@
+import os
+import random
+
+import cocotb
+from cocotb.triggers import Timer
+
+from hdl_clock import HdlClock
+from latency import FrameTimer
+from lm70 import LM70
+from snapshot import reset
+
+
+async def stream(dut, frame_count, period_ns, gap, rng):
+    """Streams random frames from reset under a FrameTimer; returns (report, frames sent)"""
+    await reset(dut)
+    if hasattr(dut, "clk"):
+        HdlClock(dut.clk, 10, units="ns").start(start_high=False)
+    HdlClock(dut.SC, period_ns, units="ns").start()
+
+    timer = FrameTimer(dut).start()
+    lm70 = LM70(dut, dut.SIO if hasattr(dut, "SIO") else dut.D)  # sipo_sr names its data pin SIO
+    await lm70.send_frames((rng.getrandbits(16) for _ in range(frame_count)), gap=gap)
+    await Timer(period_ns, units="ns")  # Let uo_out follow the last closed latch
+    timer.stop()
+    return timer.export(), lm70.frames_sent
+
+
+# make latency DESIGN=... [LATENCY_FRAMES=N] [LATENCY_SC_NS=10] [LATENCY_GAP=1]
+@cocotb.test()
+async def test_latency(dut):
+    """Streams frames and exports per-frame latency and sustained throughput to the results file"""
+
+    frame_count = int(os.environ.get("LATENCY_FRAMES", "256"))
+    period_ns = int(os.environ.get("LATENCY_SC_NS", "10"))
+    gap = int(os.environ.get("LATENCY_GAP", "1"))
+    rng = random.Random(int(os.environ.get("LATENCY_SEED", "24")))
+
+    report, frames_sent = await stream(dut, frame_count, period_ns, gap, rng)
+
+    dut._log.info(
+        f"{report['frames']} frames at SC {period_ns} ns, gap {gap}: {report['frames_per_us']:.2f} frames/us"
+    )
+    for name in ("shift", "latch", "display", "period"):
+        summary = report.get(name)
+        if summary and summary["count"]:
+            dut._log.info(
+                f"{name:8s} n={summary['count']:<6d} mean {summary['mean']:8.1f} ns  p50 {summary['p50']:8.1f}  "
+                f"p90 {summary['p90']:8.1f}  p99 {summary['p99']:8.1f}  max {summary['max']:8.1f}"
+            )
+    assert report["frames"] == frames_sent, f"Timed {report['frames']} of {frames_sent} frames"
+
+
+# With an SDF file (make SDF_FILE=...) the cell delays add to the latency, so zero-delay runs only
+@cocotb.test(skip=bool(os.environ.get("SDF_FILE")))
+async def test_latency_zero_delay(dut):
+    """On a zero-delay run every frame latches and displays at the 17th SC edge, 16.5 periods after CS falls"""
+
+    period_ns = 10
+    report, _ = await stream(dut, 64, period_ns, 1, random.Random(24))
+
+    expected = 16.5 * period_ns
+    for name in ("latch", "display"):
+        summary = report.get(name)
+        if summary is None:
+            continue  # The design has no such output
+        assert summary["count"], f"No frame changed {name}"
+        assert summary["min"] == summary["max"] == expected, (
+            f"{name} latency {summary['min']:g}-{summary['max']:g} ns, expected a constant {expected:g} ns"
+        )
@@ -2,19 +2,12 @@ import cocotb
 from cocotb.regression import TestFactory
 from cocotb.triggers import Timer
 
-@cocotb.coroutine
-def clock_gen(dut):
-    """Generates a clock signal."""
-    while True:
-        dut.clk.value = 0  # Set clock low
-        yield Timer(5, units='ns')  # Wait 5 ns
-        dut.clk.value = 1  # Set clock high
-        yield Timer(5, units='ns')  # Wait 5 ns
+from hdl_clock import HdlClock
 
 @cocotb.coroutine
 def test_mux2to1(dut):
-    # Start the clock generator
-    cocotb.start_soon(clock_gen(dut))
+    # Start the clock generator (10 ns, low first), toggled inside the simulator
+    HdlClock(dut.clk, 10, units="ns").start(start_high=False)
 
     # Logging initial test setup
     cocotb.log.info("Starting test for 2-to-1 multiplexer with BCD output")
@@ -58,5 +51,3 @@ def test_mux2to1(dut):
 # Run the test
 factory = TestFactory(test_mux2to1)
 factory.generate_tests()
-test_mux2to1.py
-
@@ -0,0 +1,121 @@
+import os
+import time
+
+import cocotb
+import numpy as np
+from cocotb.triggers import FallingEdge, ReadOnly, RisingEdge, Timer
+from cocotb.utils import get_sim_time
+
+from hdl_clock import HdlClock
+from lm70 import frame_bits
+from replay import HAS_LATCH_Q, HAS_SIPO_Q, HAS_UO_OUT, LSB_SEL, RECORD_DTYPE, Recording, diff, load
+
+# Tops whose shift register samples D on the falling SC edge
+FALLING_EDGE_TOPS = ("sipo_sr",)
+
+
+def _handle(dut, *names):
+    for name in names:
+        if hasattr(dut, name):
+            return getattr(dut, name)
+    return None
+
+
+def _read(handle):
+    value = handle.value
+    return value.integer if value.is_resolvable else 0
+
+
+# make replay DESIGN=... REPLAY_FILE=run.replay [REPLAY_OUT=actual.replay]
+@cocotb.test()
+async def test_replay(dut):
+    """Drives a recorded frame stream and diffs the outputs against the recording"""
+
+    recording = load(os.environ.get("REPLAY_FILE", "run.replay"))
+    records = recording.records
+    words = records["word"].tolist()
+    gaps = records["gap"].tolist()
+    flags = records["flags"].tolist()
+    period_ps = recording.sc_period_ps
+
+    data = _handle(dut, "D", "SIO")  # sipo_sr names its data pin SIO
+    # sipo_scan_display drives lsb_sel itself, so its uo_out is not compared
+    lsb_sel = dut.lsb_sel if hasattr(dut, "lsb_sel") and not hasattr(dut, "digit_en") else None
+    outputs = [
+        (name, flag, handle)
+        for name, flag, handle in (
+            ("sipo_q", HAS_SIPO_Q, _handle(dut, "SIPO_Q", "sipo_Q")),
+            ("latch_q", HAS_LATCH_Q, _handle(dut, "Latch_Q")),
+            ("uo_out", HAS_UO_OUT, _handle(dut, "uo_out") if lsb_sel is not None else None),
+        )
+        if handle is not None
+    ]
+    actual = np.zeros(len(records), dtype=RECORD_DTYPE)
+    actual["word"] = records["word"]
+    actual["gap"] = records["gap"]
+    actual["flags"] = records["flags"] & LSB_SEL
+    for _, flag, _ in outputs:
+        actual["flags"] |= flag
+    samples = {name: [] for name, _, _ in outputs}
+    times = []
+
+    # Same reset ritual as the recorded run: SC low, design in reset, then the clocks
+    dut.SC.value = 0
+    dut.RESET_N.value = 0
+    dut.CS.value = 1
+    data.value = 0
+    if lsb_sel is not None:
+        lsb_sel.value = 0
+    if hasattr(dut, "clk"):
+        HdlClock(dut.clk, 10, units="ns").start(start_high=False)
+    await Timer(recording.reset_ps, units="ps")
+    dut.RESET_N.value = 1
+    await Timer(1, units="ns")
+    HdlClock(dut.SC, period_ps, units="ps").start()
+
+    cs = dut.CS
+    # D and CS change on the edge the design does not sample on. Rising-edge designs
+    # take a 17th edge to move the shift chain into SIPO_Q; sipo_sr shifts straight into sipo_Q.
+    falling = dut._name in FALLING_EDGE_TOPS
+    drive = RisingEdge(dut.SC) if falling else FallingEdge(dut.SC)
+    read_only = ReadOnly()
+
+    start = time.perf_counter()
+    await drive
+    for index, word in enumerate(words):
+        if lsb_sel is not None:
+            lsb_sel.value = 1 if flags[index] & LSB_SEL else 0
+        cs.value = 0
+        for bit in frame_bits(word):
+            data.value = bit
+            await drive
+        if not falling:
+            await drive  # 17th rising edge moves the shift chain into SIPO_Q
+        cs.value = 1
+        await read_only
+        times.append(get_sim_time("ps"))
+        for name, _, handle in outputs:
+            samples[name].append(_read(handle))
+        for _ in range(gaps[index]):
+            await drive
+    elapsed = time.perf_counter() - start
+
+    actual["time_ps"] = times
+    for name, values in samples.items():
+        actual[name] = values
+    replay_out = os.environ.get("REPLAY_OUT")
+    if replay_out:
+        Recording(actual, period_ps, recording.reset_ps, dut._name).save(replay_out)
+
+    differences = diff(records, actual)
+    dut._log.info(
+        f"Replayed {len(words)} frames recorded from {recording.design or '?'} in {elapsed:.2f} s "
+        f"({len(words) / elapsed:.0f} frames/s), compared {', '.join(name for name, _, _ in outputs)}"
+    )
+    report = [
+        f"{name}: {indices.size} frames differ, first at frame {int(indices[0])} "
+        f"(word {int(records['word'][indices[0]]):#06x}: recorded {int(records[name][indices[0]]):#x}, "
+        f"got {int(actual[name][indices[0]]):#x})"
+        for name, indices in differences.items()
+    ]
+    assert not differences, "Replay mismatches:\n" + "\n".join(report)
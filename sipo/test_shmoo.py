@@ -0,0 +1,107 @@
+import json
+import os
+import random
+
+import cocotb
+from cocotb.triggers import Timer
+
+from golden_model import GoldenModel
+from snapshot import reset
+
+# Word patterns every grid point starts with: alternating bits catch setup/hold
+# slips, all-ones/all-zeros catch a missing or extra shift
+PATTERNS = (0xAAAA, 0x5555, 0xFFFF, 0x0000)
+
+DEFAULT_POINT = {"sc_ps": 10000, "cs_setup_ps": 5000, "cs_hold_ps": 5000, "d_setup_ps": 5000}
+
+
+def frame_cycles(point):
+    """SC cycles per frame: 17 with CS low, then enough CS-high cycles for the setup and hold"""
+    period = point["sc_ps"]
+    return 17 + max(1, -(-(point["cs_setup_ps"] + point["cs_hold_ps"]) // period))
+
+
+def schedule(point, words, data, cs, sc):
+    """Sorted (time_ps, order, handle or None, value) events for a frame stream
+
+    SC runs free with rising edges at n * sc_ps. Frame f samples its 16 bits on
+    the rising edges starting at its first edge r: bit k changes d_setup_ps
+    before edge r + k, CS falls cs_setup_ps before r and rises cs_hold_ps after
+    the 17th edge (r + 16). Check events (handle None, value = frame index)
+    read Latch_Q just before the next frame's CS falls.
+    """
+    period = point["sc_ps"]
+    cycles = frame_cycles(point)
+    lead = -(-max(point["cs_setup_ps"], point["d_setup_ps"]) // period) + 1
+    events = []
+    first_edges = [(lead + f * cycles) * period for f in range(len(words))]
+    for f, (word, edge) in enumerate(zip(words, first_edges)):
+        events.append((edge - point["cs_setup_ps"], 1, cs, 0))
+        for k in range(16):
+            events.append((edge + k * period - point["d_setup_ps"], 1, data, (word >> (15 - k)) & 1))
+        events.append((edge + 16 * period + point["cs_hold_ps"], 1, cs, 1))
+    for f, edge in enumerate(first_edges):
+        check = first_edges[f + 1] - point["cs_setup_ps"] if f + 1 < len(words) else edge + cycles * period
+        events.append((check, 0, None, f))
+    end = events[-1][0]
+    for n in range(end // period + 1):
+        events.append((n * period, 1, sc, 1))
+        events.append((n * period + period // 2, 1, sc, 0))
+    # Checks read before the writes of the same instant are applied
+    events.sort(key=lambda event: (event[0], event[1]))
+    return [event for event in events if event[0] <= end]
+
+
+async def run_point(dut, point, words, golden):
+    """Streams `words` with the point's timing; returns the mismatching frames"""
+    data = dut.D
+    latch_q = dut.Latch_Q
+    failures = []
+    now = 0
+    for time_ps, _, handle, value in schedule(point, words, data, dut.CS, dut.SC):
+        if time_ps > now:
+            await Timer(time_ps - now, units="ps")
+            now = time_ps
+        if handle is not None:
+            handle.value = value
+            continue
+        got = latch_q.value
+        expected = golden.latch_q(words[value])
+        if not got.is_resolvable or got.integer != expected:
+            failures.append(f"word {words[value]:#06x}: Latch_Q = {got}, expected {expected:#04x}")
+    return failures
+
+
+# One worker of shmoo.py (make shmoo): every grid point in SHMOO_POINTS, each from reset.
+# Without SHMOO_POINTS, checks the single point given by SHMOO_SC_PS / SHMOO_CS_SETUP_PS /
+# SHMOO_CS_HOLD_PS / SHMOO_D_SETUP_PS.
+@cocotb.test()
+async def test_shmoo(dut):
+    """Streams frames at each grid point's SC period and setup/hold margins and records pass/fail"""
+
+    points_path = os.environ.get("SHMOO_POINTS")
+    if points_path:
+        with open(points_path) as f:
+            points = json.load(f)
+    else:
+        points = [{name: int(os.environ.get(f"SHMOO_{name.upper()}", value)) for name, value in DEFAULT_POINT.items()}]
+    frame_count = int(os.environ.get("SHMOO_FRAMES", "32"))
+    rng = random.Random(int(os.environ.get("SHMOO_SEED", "25")))
+    words = list(PATTERNS) + [rng.getrandbits(16) for _ in range(max(frame_count - len(PATTERNS), 0))]
+    golden = GoldenModel()
+
+    results = []
+    for point in points:
+        await reset(dut)
+        failures = await run_point(dut, point, words, golden)
+        results.append(dict(point, frames=len(words), mismatches=len(failures), failures=failures[:3]))
+        dut._log.debug(f"{point}: {len(failures)} of {len(words)} frames mismatched")
+    report_path = os.environ.get("SHMOO_REPORT")
+    if report_path:
+        with open(report_path, "w") as f:
+            json.dump(results, f)
+
+    passed = sum(1 for result in results if not result["mismatches"])
+    dut._log.info(f"{passed} of {len(results)} grid points latched all {len(words)} frames correctly")
+    if not points_path:
+        assert not results[0]["mismatches"], "\n".join(results[0]["failures"])
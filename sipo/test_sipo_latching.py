@@ -3,24 +3,8 @@ from cocotb.triggers import RisingEdge, FallingEdge, Timer
 from cocotb.clock import Clock
 from cocotb.result import TestFailure
 
-class LM70:
-    """Dummy model for the LM70 temperature sensor"""
+from lm70 import LM70
 
-    def __init__(self, dut):
-        self.dut = dut
-
-    async def drive_temp_data(self, temp_value):
-        """Drives 16-bit temperature data to the SIPO"""
-        temp_bits = f"{temp_value:016b}"  # Convert the temperature value to a 16-bit binary string
-
-        self.dut._log.info(f"Driving temperature value: {temp_value} (binary: {temp_bits})")  # Log the temperature value
-
-        for bit in temp_bits:
-            self.dut.D.value = int(bit)  # Drive each bit serially on D pin
-            self.dut._log.info(f"Driving bit: {bit} on D")
-            #await Timer(1,units="ns") #allow time for signal to settle
-            await RisingEdge(self.dut.SC)  # Wait for the rising edge of SC
-            #await Timer(1,units="ns")  #Small delay for stability
 
 # Testbench for the sipo_with_latch module
 @cocotb.test()
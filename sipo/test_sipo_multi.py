@@ -0,0 +1,69 @@
+import os
+import random
+import time
+
+import cocotb
+from cocotb.triggers import FallingEdge, Timer
+
+from bench_report import write_report
+from channels import ChannelMonitor, channels
+from golden_model import GoldenModel
+from hdl_clock import HdlClock
+from lm70 import LM70
+from monitor import Scoreboard
+
+
+# One LM70 model per channel, all streaming concurrently on the shared SC
+@cocotb.test()
+async def test_sipo_multi(dut):
+    """Streams MULTI_FRAMES frames into every channel and checks each channel with its own scoreboard"""
+
+    frame_count = int(os.environ.get("MULTI_FRAMES", "64"))
+    rng = random.Random(int(os.environ.get("MULTI_SEED", "15")))
+
+    # Ensure SC is low and the design is in reset before starting the clock
+    dut.SC.value = 0
+    dut.RESET_N.value = 0
+    sensors = channels(dut)  # Drives every CS high and every D / lsb_sel low
+    await Timer(20, units="ns")
+    dut.RESET_N.value = 1
+    await Timer(1, units="ns")
+
+    HdlClock(dut.SC, 10, units="ns").start()
+
+    golden = GoldenModel()
+    monitor = ChannelMonitor(dut, sensors)
+    scoreboards = [Scoreboard(channel, golden, monitor.channel(channel.index)).start() for channel in sensors]
+
+    async def run_channel(channel, scoreboard, seed):
+        channel_rng = random.Random(seed)
+        # Staggered starts so the chip selects are not all in lock step
+        for _ in range(channel_rng.randrange(17)):
+            await FallingEdge(dut.SC)
+        lm70 = LM70(channel)
+        await lm70.send_frames(scoreboard.expect(channel_rng.getrandbits(16)) for _ in range(frame_count))
+        return lm70.frames_sent
+
+    start = time.perf_counter()
+    tasks = [
+        cocotb.start_soon(run_channel(channel, scoreboard, rng.getrandbits(32)))
+        for channel, scoreboard in zip(sensors, scoreboards)
+    ]
+    frames = 0
+    for task in tasks:
+        frames += await task
+    for scoreboard in scoreboards:
+        await scoreboard.drain()
+        scoreboard.stop()
+    elapsed = time.perf_counter() - start
+
+    write_report(os.environ.get("MULTI_REPORT"), frames, elapsed, channels=len(sensors))
+    dut._log.info(f"{len(sensors)} channels: {frames} frames in {elapsed:.2f} s ({frames / elapsed:.0f} frames/s)")
+    checked = sum(scoreboard.frames for scoreboard in scoreboards)
+    assert checked == frames, f"Checked {checked} of {frames} frames"
+    failures = [
+        f"channel {channel.index} {failure}"
+        for channel, scoreboard in zip(sensors, scoreboards)
+        for failure in scoreboard.failures
+    ]
+    assert not failures, "Mismatches:\n" + "\n".join(failures[:10])
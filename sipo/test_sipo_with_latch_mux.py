@@ -1,22 +1,11 @@
 import cocotb
-from cocotb.triggers import RisingEdge, Timer
+from cocotb.triggers import Timer
 from cocotb.clock import Clock
 from cocotb.regression import TestFactory
 from cocotb.result import TestFailure
 
-class LM70:
-    """Dummy model for the LM70 temperature sensor"""
+from lm70 import LM70
 
-    def __init__(self, dut):
-        self.dut = dut
-
-    async def drive_temp_data(self, temp_value):
-        """Drives 16-bit temperature data to the SIPO"""
-        temp_bits = f"{temp_value:016b}"  # Convert the temperature value to a 16-bit binary string
-        for bit in temp_bits:
-            self.dut.D.value = int(bit)  # Drive each bit serially on D pin
-            await Timer(1, units="ns")  # Allow time for signal to settle
-            await RisingEdge(self.dut.SC)  # Wait for the rising edge of SC
 
 async def clock_gen(dut):
     """Generates a clock signal for the SC and clk signals."""
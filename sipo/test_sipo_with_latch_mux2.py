@@ -1,60 +1,38 @@
+import os
+import random
+import time
+
 import cocotb
 from cocotb.regression import TestFactory
-from cocotb.triggers import RisingEdge, Timer
-from cocotb.clock import Clock
+from cocotb.triggers import Timer
 from cocotb.result import TestFailure
 
-class LM70:
-    """Dummy model for the LM70 temperature sensor"""
-
-    def __init__(self, dut):
-        self.dut = dut
-
-    async def drive_temp_data(self, temp_value):
-        """Drives 16-bit temperature data to the SIPO"""
-        temp_bits = f"{temp_value:016b}"  # Convert the temperature value to a 16-bit binary string
-        for bit in temp_bits:
-            self.dut.D.value = int(bit)  # Drive each bit serially on D pin
-            await Timer(1, units="ns")  # Allow time for signal to settle
-            await RisingEdge(self.dut.SC)  # Wait for the rising edge of SC
-
-@cocotb.coroutine
-def clock_gen(dut):
-    """Generates a clock signal."""
-    while True:
-        dut.clk.value = 0  # Set clock low
-        yield Timer(5, units='ns')  # Wait 5 ns
-        dut.clk.value = 1  # Set clock high
-        yield Timer(5, units='ns')  # Wait 5 ns
+from golden_model import GoldenModel
+from hdl_clock import HdlClock
+from lm70 import LM70
+from monitor import Scoreboard
+from replay import recorder_from_env, save_recorder
+from snapshot import reset
+from txlog import save_from_env, txlog_from_env
+from wavecapture import capture_from_env
+
 
 @cocotb.test()
 async def test_sipo_with_latch_mux(dut):
     """Integrated test for SIPO with latch and 2-to-1 multiplexer"""
 
-    # Start the clock generator
-    cocotb.start_soon(clock_gen(dut))
-
     # Create an instance of the LM70 model
     lm70 = LM70(dut)
 
-    # Ensure SC is low before starting the clock
-    dut.SC.value = 0
+    # Reset with SC low and CS high to disable SIPO and latch
+    # (restored from the post-reset snapshot under PRIMS=rtl)
+    await reset(dut)
 
-    # Apply initial reset and CS high to disable SIPO and latch
-    dut.RESET_N.value = 0
-    dut.CS.value = 1
-    dut.D.value = 0  # Data input
+    # Start the clock generator (10 ns, low first), toggled inside the simulator
+    HdlClock(dut.clk, 10, units="ns").start(start_high=False)
 
-    # Wait for a few cycles to apply reset with SC low
-    await Timer(20, units="ns")
-
-    # Release reset and enable the system (CS = 0) after ensuring SC is low
-    dut.RESET_N.value = 1
-    await Timer(1, units="ns")  # Small delay before starting the clock
-
-    # Start a 10ns period clock on the SC (Serial Clock) signal
-    clock = Clock(dut.SC, 10, units="ns")
-    cocotb.start_soon(clock.start())
+    # Start a 10ns period clock on the SC (Serial Clock) signal, also toggled inside the simulator
+    HdlClock(dut.SC, 10, units="ns").start()
 
     # Apply serial data input after enabling CS (CS = 0)
     dut.CS.value = 0
@@ -131,3 +109,36 @@ async def test_sipo_with_latch_mux(dut):
 
     cocotb.log.info("Test completed successfully.")
 
+
+@cocotb.test()
+async def test_lm70_frame_stream(dut):
+    """Streams many LM70 frames back to back and checks every latched word"""
+
+    frame_count = int(os.environ.get("LM70_FRAMES", "256"))
+    rng = random.Random(int(os.environ.get("LM70_SEED", "70")))
+
+    # SC low, design reset (restored from the post-reset snapshot under PRIMS=rtl)
+    await reset(dut)
+
+    HdlClock(dut.SC, 10, units="ns").start()
+
+    txlog = txlog_from_env()
+    recorder = recorder_from_env(dut._name, sc_period_ps=10000, reset_ps=20000)
+    scoreboard = Scoreboard(dut, GoldenModel(), capture=capture_from_env(dut), txlog=txlog, recorder=recorder).start()
+
+    # Checking runs in the scoreboard task, so frames go out with the minimum CS gap
+    lm70 = LM70(dut, txlog=txlog)
+    words = (scoreboard.expect(rng.getrandbits(16)) for _ in range(frame_count))
+    start = time.perf_counter()
+    await lm70.send_frames(words)
+    await scoreboard.drain()
+    elapsed = time.perf_counter() - start
+    scoreboard.stop()
+    if scoreboard.capture is not None:
+        await scoreboard.capture.flush()
+    save_from_env(txlog)
+    save_recorder(recorder)
+
+    dut._log.info(f"Streamed {lm70.frames_sent} frames in {elapsed:.2f} s ({lm70.frames_sent / elapsed:.0f} frames/s)")
+    assert scoreboard.frames == lm70.frames_sent, f"Checked {scoreboard.frames} of {lm70.frames_sent} frames"
+    assert not scoreboard.mismatches, "Latch mismatches:\n" + "\n".join(scoreboard.failures)
@@ -1,29 +1,13 @@
 import cocotb
-from cocotb.triggers import RisingEdge, FallingEdge, Timer
-from cocotb.clock import Clock
-from cocotb.regression import TestFactory
+from cocotb.triggers import RisingEdge, Timer
 
-
-
-
-
-# LM70 module definition
-class LM70:
-    def __init__(self, dut):
-        self.dut = dut
-        self.temperature_data = 0b0010011000011111  # Example temperature for 26°C
-
-    async def send_temperature_data(self):
-        # Simulate sending the temperature data
-        for i in range(15, -1, -1):
-            self.dut.D.value = (self.temperature_data >> i) & 1
-            await RisingEdge(self.dut.SC)  # Wait for clock edge for data capture
+from hdl_clock import HdlClock
+from lm70 import LM70
 
 
 @cocotb.test()
 async def test_sipo_with_latch(dut):
-    # Start the clock (Serial Clock - SC) with a period of 10 time units (5 ns high, 5 ns low)
-    #cocotb.start_soon(Clock(dut.SC, 10, units="ns").start())
+    lm70 = LM70(dut)
 
     #ensure SC is low before starting the clock
     dut.SC.value = 0
@@ -45,16 +29,17 @@ async def test_sipo_with_latch(dut):
     # Apply reset
     await Timer(10, units="ns")
     dut.RESET_N.value = 1  # Release reset
+    await Timer(1, units="ns")
+
+    # Start the clock (Serial Clock - SC) with a period of 10 ns (5 ns high, 5 ns low)
+    HdlClock(dut.SC, 10, units="ns").start()
 
     # Activate Chip Select and shift data into the SIPO
     dut.CS.value = 0  # Activate chip select (active low)
     await Timer(5, units="ns")
 
     # Shift the data bit-by-bit into SIPO (Example: 0010 0110 0001 1111)
-    for i in range(15, -1, -1):
-        dut.D.value = (Data_in >> i) & 1
-        await RisingEdge(dut.SC)  # Wait for clock edge for data capture
-        await Timer(5, units="ns")  # Optional small delay before the next bit
+    await lm70.drive_temp_data(Data_in)
 
     # Wait for a clock edge after shifting all bits to latch data
     await RisingEdge(dut.SC)
@@ -0,0 +1,194 @@
+"""Binary transaction log for the testbenches
+
+Frames, latch samples, display samples and mismatches (Latch_Q and uo_out
+each get their own kind) are packed as fixed-width 16-byte records into a
+bounded ring buffer; the oldest records are overwritten once it is full.
+Values sampled as X or Z (None from the monitor) are stored as 0 with their
+bit set in the record's `unknown` flags, and print as x. Nothing is formatted while the simulation
+runs: the ring is written to disk as raw bytes at the end of the test, and
+the CLI below turns it into text (or NumPy reads it with RECORD_DTYPE).
+
+The level gates what is recorded, so tracing costs one comparison per call
+when it is off and one struct.pack_into per record when it is on:
+    off       nothing
+    frames    frames driven and mismatches
+    samples   also every Latch_Q / uo_out sample
+
+Tests opt in through the environment:
+    TXLOG_LEVEL    off, frames or samples (default off)
+    TXLOG_DEPTH    ring size in records (default 65536)
+    TXLOG_PATH     output file (default txlog.bin)
+
+Usage: python txlog.py LOG.bin [--kind frame|latch|display|mismatch|display_mismatch ...] [--tail N]
+"""
+import argparse
+import os
+import struct
+import sys
+
+import numpy as np
+
+OFF, FRAMES, SAMPLES = 0, 1, 2
+LEVELS = {"off": OFF, "frames": FRAMES, "samples": SAMPLES}
+
+FRAME, LATCH, DISPLAY, MISMATCH, DISPLAY_MISMATCH = 1, 2, 3, 4, 5
+KINDS = {
+    FRAME: "frame", LATCH: "latch", DISPLAY: "display", MISMATCH: "mismatch", DISPLAY_MISMATCH: "display_mismatch"
+}
+
+# time_ps, kind, lsb_sel, word (frame word or SIPO_Q), latch_q, uo_out, unknown
+# Mismatch records keep the value read in latch_q and the expected one in uo_out:
+# Latch_Q for "mismatch", uo_out for "display_mismatch"
+RECORD = struct.Struct("<QBBHBBBx")
+RECORD_DTYPE = np.dtype(
+    [("time_ps", "<u8"), ("kind", "u1"), ("lsb_sel", "u1"), ("word", "<u2"), ("latch_q", "u1"), ("uo_out", "u1"),
+     ("unknown", "u1"), ("pad", "V1")]
+)
+# `unknown` flags: fields that were X/Z when sampled
+UNKNOWN_FIELDS = ("lsb_sel", "word", "latch_q", "uo_out")  # bit 0 upwards
+HEADER = struct.Struct("<8sQQ")  # magic, records in file, records dropped by the ring
+MAGIC = b"TXLOG\x002\x00"
+
+
+class TxLog:
+    """Ring buffer of fixed-width transaction records"""
+
+    def __init__(self, level=FRAMES, depth=1 << 16, clock=None):
+        self.level = level
+        self.depth = depth
+        self._buffer = bytearray(depth * RECORD.size)
+        self._next = 0  # Total records ever written
+        if clock is None:
+            from cocotb.utils import get_sim_time
+
+            clock = lambda: get_sim_time("ps")  # noqa: E731
+        self._now = clock
+
+    def _put(self, kind, lsb_sel, word, latch_q, uo_out):
+        unknown = 0
+        fields = (lsb_sel, word, latch_q, uo_out)
+        if None in fields:
+            unknown = sum(1 << i for i, value in enumerate(fields) if value is None)
+            lsb_sel, word, latch_q, uo_out = (value or 0 for value in fields)
+        RECORD.pack_into(
+            self._buffer, (self._next % self.depth) * RECORD.size, self._now(), kind, lsb_sel, word, latch_q, uo_out,
+            unknown,
+        )
+        self._next += 1
+
+    def frame(self, word):
+        if self.level >= FRAMES:
+            self._put(FRAME, 0, word, 0, 0)
+
+    def mismatch(self, word, latch_q, expected, lsb_sel=0):
+        if self.level >= FRAMES:
+            self._put(MISMATCH, lsb_sel, word, latch_q, expected)
+
+    def display_mismatch(self, word, uo_out, expected, lsb_sel=0):
+        if self.level >= FRAMES:
+            self._put(DISPLAY_MISMATCH, lsb_sel, word, uo_out, expected)
+
+    def latch(self, sipo_q, latch_q):
+        if self.level >= SAMPLES:
+            self._put(LATCH, 0, sipo_q, latch_q, 0)
+
+    def display(self, lsb_sel, uo_out):
+        if self.level >= SAMPLES:
+            self._put(DISPLAY, lsb_sel, 0, 0, uo_out)
+
+    def __len__(self):
+        return min(self._next, self.depth)
+
+    @property
+    def dropped(self):
+        return max(self._next - self.depth, 0)
+
+    def save(self, path):
+        """Writes the buffered records, oldest first"""
+        count = len(self)
+        split = (self._next % self.depth) * RECORD.size if self._next > self.depth else 0
+        view = memoryview(self._buffer)
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, count, self.dropped))
+            f.write(view[split:count * RECORD.size])
+            f.write(view[:split])
+        return path
+
+
+def load(path):
+    """Reads a saved log; returns (records as a RECORD_DTYPE array, dropped count)"""
+    with open(path, "rb") as f:
+        magic, count, dropped = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            if magic[:6] == MAGIC[:6]:
+                version, expected = magic[6:7].decode(), MAGIC[6:7].decode()
+                raise ValueError(f"{path}: transaction log format {version}, expected {expected}")
+            raise ValueError(f"{path}: not a transaction log")
+        records = np.fromfile(f, dtype=RECORD_DTYPE, count=count)
+    return records, dropped
+
+
+def format_record(record):
+    kind = int(record["kind"])
+    time_ns = int(record["time_ps"]) / 1000
+    unknown = int(record["unknown"])
+
+    def field(name, spec):
+        if unknown >> UNKNOWN_FIELDS.index(name) & 1:
+            return "x"
+        return format(int(record[name]), spec)
+
+    if kind == FRAME:
+        detail = f"word={field('word', '#06x')}"
+    elif kind == LATCH:
+        detail = f"SIPO_Q={field('word', '#06x')} Latch_Q={field('latch_q', '#04x')}"
+    elif kind == DISPLAY:
+        detail = f"lsb_sel={field('lsb_sel', 'd')} uo_out={field('uo_out', '07b')}"
+    elif kind == DISPLAY_MISMATCH:
+        detail = (
+            f"word={field('word', '#06x')} lsb_sel={field('lsb_sel', 'd')} "
+            f"uo_out={field('latch_q', '07b')} expected={field('uo_out', '07b')}"
+        )
+    else:
+        detail = (
+            f"word={field('word', '#06x')} lsb_sel={field('lsb_sel', 'd')} "
+            f"got={field('latch_q', '#04x')} expected={field('uo_out', '#04x')}"
+        )
+    return f"{time_ns:14.3f}ns  {KINDS.get(kind, kind):8s}  {detail}"
+
+
+def txlog_from_env():
+    """TxLog configured from TXLOG_* variables, or None when logging is off"""
+    level = LEVELS[os.environ.get("TXLOG_LEVEL", "off").lower()]
+    if level == OFF:
+        return None
+    return TxLog(level, int(os.environ.get("TXLOG_DEPTH", str(1 << 16))))
+
+
+def save_from_env(txlog):
+    if txlog is not None:
+        txlog.save(os.environ.get("TXLOG_PATH", "txlog.bin"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log")
+    parser.add_argument("--kind", nargs="+", choices=sorted(KINDS.values()), help="only these record kinds")
+    parser.add_argument("--tail", type=int, help="only the last N records")
+    args = parser.parse_args(argv)
+
+    records, dropped = load(args.log)
+    if args.kind:
+        wanted = [code for code, name in KINDS.items() if name in args.kind]
+        records = records[np.isin(records["kind"], wanted)]
+    if args.tail:
+        records = records[-args.tail:]
+    if dropped:
+        print(f"# {dropped} older records were overwritten by the ring")
+    for record in records:
+        print(format_record(record))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
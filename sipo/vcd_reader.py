@@ -0,0 +1,279 @@
+"""Streaming, indexed reader for the VCD dumps written by the designs
+
+The file is memory-mapped and never read into memory as a whole. The header
+is parsed into the scope hierarchy, then one streaming pass over the value
+changes writes a (time, byte offset) record per change to a per-signal index
+file. Records are buffered in memory and appended in chunks with one file
+open at a time, so neither memory use nor open files grow with the dump. The index is cached in `<dump>.idx/` and reused until
+the dump changes. Histories are then pulled as NumPy arrays by seeking to
+the recorded offsets.
+
+Usage: python vcd_reader.py DUMP.vcd [SIGNAL ...]
+"""
+import array
+import collections
+import json
+import mmap
+import os
+import shutil
+import sys
+
+import numpy as np
+
+INDEX_VERSION = 1
+FLUSH_RECORDS = 1 << 20  # (time, offset) pairs buffered across all signals before a chunk is written
+
+History = collections.namedtuple("History", ["times", "values", "unknown"])
+
+_SCALAR_CHARS = b"01xzXZ"
+_VECTOR_CHARS = b"bB"
+_UNKNOWN_TO_ZERO = bytes.maketrans(b"xzXZ", b"0000")
+
+
+class Var:
+    """One $var declaration"""
+
+    __slots__ = ("code", "kind", "width", "name", "scope")
+
+    def __init__(self, code, kind, width, name, scope):
+        self.code = code
+        self.kind = kind
+        self.width = width
+        self.name = name
+        self.scope = scope
+
+    @property
+    def path(self):
+        return ".".join(self.scope + (self.name,))
+
+    def __repr__(self):
+        return f"Var({self.path}, {self.kind}, width={self.width})"
+
+
+class VCDFile:
+    """Memory-mapped VCD dump with a cached per-signal change index"""
+
+    def __init__(self, path, index_dir=None):
+        self.path = path
+        self.index_dir = index_dir or f"{path}.idx"
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.timescale = None
+        self.vars = []
+        self.scopes = set()
+        self._body_offset = self._parse_header()
+
+        # Aliased nets share an identifier code; index each code once
+        self.codes = sorted({var.code for var in self.vars})
+        self._code_index = {code: n for n, code in enumerate(self.codes)}
+        self._by_path = {var.path: var for var in self.vars}
+        self._counts = None
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _parse_header(self):
+        """Reads declarations up to $enddefinitions; returns the body offset"""
+        mm = self._mm
+        scope = []
+        pos = 0
+        pending = []
+        while True:
+            end = mm.find(b"\n", pos)
+            if end < 0:
+                raise ValueError(f"{self.path}: no $enddefinitions found")
+            pending += mm[pos:end].split()
+            pos = end + 1
+            # Declarations may span several lines; act once the closing $end arrives
+            if not pending or b"$end" not in pending:
+                continue
+            keyword = pending[0]
+            if keyword == b"$scope":
+                scope.append(pending[2].decode())
+                self.scopes.add(".".join(scope))
+            elif keyword == b"$upscope":
+                scope.pop()
+            elif keyword == b"$var":
+                self.vars.append(
+                    Var(pending[3], pending[1].decode(), int(pending[2]), pending[4].decode(), tuple(scope))
+                )
+            elif keyword == b"$timescale":
+                self.timescale = b"".join(pending[1:-1]).decode()
+            elif keyword == b"$enddefinitions":
+                return pos
+            pending = []
+
+    def var(self, name):
+        """Looks a signal up by full path, or by leaf name (shallowest match wins)"""
+        if name in self._by_path:
+            return self._by_path[name]
+        matches = [var for var in self.vars if var.name == name or var.path.endswith("." + name)]
+        if not matches:
+            raise KeyError(name)
+        return min(matches, key=lambda var: len(var.scope))
+
+    # Index construction
+
+    def _manifest_path(self):
+        return os.path.join(self.index_dir, "manifest.json")
+
+    def _source_stamp(self):
+        stat = os.stat(self.path)
+        return {"version": INDEX_VERSION, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def load_index(self):
+        """Uses the cached index if it matches the dump, otherwise rebuilds it"""
+        try:
+            with open(self._manifest_path()) as f:
+                manifest = json.load(f)
+            if manifest["source"] == self._source_stamp() and manifest["codes"] == [c.decode() for c in self.codes]:
+                self._counts = manifest["counts"]
+                return self
+        except (OSError, ValueError, KeyError):
+            pass
+        return self.build_index()
+
+    def build_index(self):
+        """One streaming pass over the value changes, writing per-signal index files"""
+        shutil.rmtree(self.index_dir, ignore_errors=True)
+        os.makedirs(self.index_dir)
+        mm = self._mm
+        size = len(mm)
+        code_index = self._code_index
+        buffers = [array.array("q") for _ in self.codes]
+        counts = [0] * len(self.codes)
+        buffered = 0
+
+        time = 0
+        pos = self._body_offset
+        while pos < size:
+            end = mm.find(b"\n", pos)
+            if end < 0:
+                end = size
+            first = mm[pos]
+            if first == 35:  # '#'
+                time = int(mm[pos + 1:end])
+            else:
+                code = None
+                if first in _SCALAR_CHARS:
+                    code = mm[pos + 1:end].strip()
+                elif first in _VECTOR_CHARS or first in b"rR":
+                    space = mm.find(b" ", pos, end)
+                    if space > 0:
+                        code = mm[space + 1:end].strip()
+                n = code_index.get(code)
+                if n is not None:
+                    buffer = buffers[n]
+                    buffer.append(time)
+                    buffer.append(pos)
+                    counts[n] += 1
+                    buffered += 1
+                    if buffered >= FLUSH_RECORDS:
+                        self._write_chunk(buffers)
+                        buffered = 0
+            pos = end + 1
+        self._write_chunk(buffers)
+
+        self._counts = counts
+        with open(self._manifest_path(), "w") as f:
+            json.dump(
+                {"source": self._source_stamp(), "codes": [c.decode() for c in self.codes], "counts": counts}, f
+            )
+        return self
+
+    def _index_file(self, n):
+        return os.path.join(self.index_dir, f"{n}.bin")
+
+    def _write_chunk(self, buffers):
+        # Appends and empties every buffer, one file open at a time, so dumps with
+        # more signals than the open-file limit still index
+        for n, buffer in enumerate(buffers):
+            if buffer:
+                with open(self._index_file(n), "ab") as f:
+                    buffer.tofile(f)
+                del buffer[:]
+
+    # Queries
+
+    def history(self, name):
+        """Value-change history of one signal as NumPy arrays
+
+        Returns History(times, values, unknown): change times in the dump's
+        timescale, values as uint64 (object for signals wider than 64 bits,
+        float64 for `$var real`) with x/z bits read as 0, and a mask of
+        changes that contained x or z.
+        """
+        if self._counts is None:
+            self.load_index()
+        var = self.var(name)
+        n = self._code_index[var.code]
+        if self._counts[n]:
+            records = np.memmap(self._index_file(n), dtype=np.int64, mode="r").reshape(-1, 2)
+        else:
+            records = np.empty((0, 2), dtype=np.int64)
+        times = np.array(records[:, 0])
+        offsets = records[:, 1]
+
+        if var.kind == "real":
+            mm = self._mm
+            values = np.array([float(mm[offset + 1:mm.find(b" ", offset)]) for offset in offsets.tolist()])
+            return History(times, values, np.zeros(len(offsets), dtype=bool))
+
+        if var.width == 1:
+            chars = np.frombuffer(self._mm, dtype=np.uint8)[offsets]
+            values = (chars == ord("1")).astype(np.uint64)
+            unknown = (chars != ord("0")) & (chars != ord("1"))
+            return History(times, values, unknown)
+
+        mm = self._mm
+        values = np.zeros(len(offsets), dtype=np.uint64 if var.width <= 64 else object)
+        unknown = np.zeros(len(offsets), dtype=bool)
+        for i, offset in enumerate(offsets.tolist()):
+            bits = mm[offset + 1:mm.find(b" ", offset)]
+            if bits.translate(None, b"01"):
+                unknown[i] = True
+                bits = bits.translate(_UNKNOWN_TO_ZERO)
+            values[i] = int(bits, 2)
+        return History(times, values, unknown)
+
+    def value_at(self, name, time):
+        """Value of a signal at `time` (the last change at or before it)"""
+        history = self.history(name)
+        i = np.searchsorted(history.times, time, side="right") - 1
+        if i < 0:
+            return None
+        return history.values[i]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print(__doc__.strip().splitlines()[-1])
+        return 2
+    with VCDFile(argv[0]) as vcd:
+        vcd.load_index()
+        if len(argv) == 1:
+            for var in vcd.vars:
+                print(f"{var.path:60s} {var.kind:10s} {var.width:3d}")
+            return 0
+        for name in argv[1:]:
+            var = vcd.var(name)
+            history = vcd.history(name)
+            print(f"{var.path} ({len(history.times)} changes)")
+            for time, value, unknown in zip(history.times, history.values, history.unknown):
+                if var.kind == "real":
+                    print(f"  {time:>12d}  {float(value)}")
+                else:
+                    print(f"  {time:>12d}  {'x' if unknown else format(int(value), f'0{var.width}b')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
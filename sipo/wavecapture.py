@@ -0,0 +1,195 @@
+"""Trigger-based waveform capture backed by an in-memory ring buffer
+
+Value changes of the watched signals are kept only for the last `window_ns`
+of simulated time. Nothing is written until `trigger()` is called (for
+example by a scoreboard on a mismatch); the capture then waits `post_ns` and
+writes the changes from `pre_ns` before the trigger to `post_ns` after it as
+a VCD file.
+
+Clock ports (SC, clk) are not watched edge by edge while an HdlClock drives
+them: the dump replays the clock's start/stop/gate/period/release timeline
+(hdl_clock.ClockTimeline), so a running clock costs no wake-ups and still
+shows every stop, gate and re-time. Whenever no HdlClock drives the port
+(released, or toggled by plain writes) its changes go into the ring like
+any other signal. The VCD header names the clocks that were redrawn.
+
+Tests opt in through the environment:
+    WAVE_RING_US   ring length in microseconds (enables capture)
+    WAVE_PRE_NS    pre-trigger window (default 1000)
+    WAVE_POST_NS   post-trigger window (default 200)
+    WAVE_PREFIX    output file prefix (default "capture")
+"""
+import collections
+import os
+
+import cocotb
+from cocotb.triggers import Edge, First, Timer
+from cocotb.utils import get_sim_time
+
+from hdl_clock import clock_timeline
+
+DEFAULT_SIGNALS = ("CS", "SC", "D", "RESET_N", "lsb_sel", "SIPO_Q", "Latch_Q", "uo_out", "clk")
+DEFAULT_CLOCKS = ("SC", "clk")
+
+
+class WaveCapture:
+    """Keeps a sliding window of value changes and dumps it on demand"""
+
+    def __init__(self, dut, signals=DEFAULT_SIGNALS, window_ns=10_000, pre_ns=1_000, post_ns=200,
+                 prefix="capture", max_captures=1, clocks=DEFAULT_CLOCKS):
+        self.dut = dut
+        self.handles = [getattr(dut, name) for name in signals if hasattr(dut, name)]
+        self.names = [handle._name for handle in self.handles]
+        # Signal index -> ClockTimeline of the clock ports
+        self.timelines = {
+            index: clock_timeline(handle) for index, handle in enumerate(self.handles) if handle._name in clocks
+        }
+        self.pre_ps = int(pre_ns * 1000)
+        self.post_ps = int(post_ns * 1000)
+        # The ring must cover the whole capture window
+        self.window_ps = max(int(window_ns * 1000), self.pre_ps + self.post_ps)
+        self.prefix = prefix
+        self.max_captures = max_captures
+        self.files = []
+
+        self._events = collections.deque()  # (time_ps, signal index, binstr)
+        self._base = []  # Values just before the oldest buffered event
+        self._pending = []
+        self._triggered = 0
+
+    def start(self):
+        """Records initial values and starts watching every signal"""
+        self._base = [handle.value.binstr for handle in self.handles]
+        for index, handle in enumerate(self.handles):
+            watch = self._watch_clock if index in self.timelines else self._watch
+            cocotb.start_soon(watch(index, handle))
+        return self
+
+    def _record(self, index, handle):
+        events = self._events
+        now = get_sim_time("ps")
+        events.append((now, index, handle.value.binstr))
+        horizon = now - self.window_ps
+        while events[0][0] < horizon:
+            _, old_index, old_value = events.popleft()
+            self._base[old_index] = old_value
+
+    async def _watch(self, index, handle):
+        edge = Edge(handle)
+        while True:
+            await edge
+            self._record(index, handle)
+
+    async def _watch_clock(self, index, handle):
+        # Edges are recorded only while no HdlClock drives the port; its timeline covers the rest
+        timeline = self.timelines[index]
+        edge = Edge(handle)
+        while True:
+            timeline.changed.clear()
+            if timeline.driven:
+                await timeline.changed.wait()
+            elif await First(edge, timeline.changed.wait()) is edge:
+                self._record(index, handle)
+
+    def trigger(self, reason=""):
+        """Schedules a dump around the current time; returns False once max_captures is reached"""
+        if self._triggered >= self.max_captures:
+            return False
+        self._triggered += 1
+        path = f"{self.prefix}_{self._triggered}.vcd"
+        self._pending.append(cocotb.start_soon(self._capture(get_sim_time("ps"), path, reason)))
+        return True
+
+    async def fail(self, message):
+        """Captures the window around an assertion, then raises it"""
+        self.trigger(message)
+        await self.flush()
+        raise AssertionError(message)
+
+    async def flush(self):
+        """Waits until every triggered capture has been written"""
+        for task in self._pending:
+            await task
+        self._pending = []
+
+    async def _capture(self, trigger_ps, path, reason):
+        if self.post_ps:
+            await Timer(self.post_ps, units="ps")
+        self.write_vcd(path, trigger_ps - self.pre_ps, trigger_ps + self.post_ps, reason)
+        self.files.append(path)
+        self.dut._log.info(f"Wave capture written to {path} ({reason})")
+
+    def write_vcd(self, path, start_ps, end_ps, comment=""):
+        """Writes the buffered changes between start_ps and end_ps as a VCD file"""
+        values = list(self._base)
+        changes = []
+        for time_ps, index, value in self._events:
+            if time_ps < start_ps:
+                values[index] = value
+            elif time_ps <= end_ps:
+                changes.append((time_ps, index, value))
+        start_ps = max(start_ps, 0)
+        redrawn = []
+        for index, timeline in self.timelines.items():
+            value, edges = timeline.trace(start_ps, end_ps)
+            if value is not None:
+                values[index] = value
+            if value is not None or edges:
+                redrawn.append(self.names[index])
+            changes.extend((time_ps, index, bit) for time_ps, bit in edges)
+        changes.sort(key=lambda change: change[0])
+
+        ids = [_vcd_id(index) for index in range(len(self.handles))]
+        with open(path, "w") as f:
+            if comment:
+                f.write(f"$comment {comment} $end\n")
+            if redrawn:
+                f.write(f"$comment synthesized from the HdlClock timeline while driven: {', '.join(redrawn)} $end\n")
+            f.write("$timescale 1ps $end\n")
+            f.write(f"$scope module {self.dut._name} $end\n")
+            for index, handle in enumerate(self.handles):
+                width = len(values[index])
+                suffix = f" [{width - 1}:0]" if width > 1 else ""
+                f.write(f"$var wire {width} {ids[index]} {self.names[index]}{suffix} $end\n")
+            f.write("$upscope $end\n$enddefinitions $end\n")
+            f.write(f"#{start_ps}\n$dumpvars\n")
+            for index, value in enumerate(values):
+                f.write(_vcd_value(value, ids[index]))
+            f.write("$end\n")
+            last_time = start_ps
+            for time_ps, index, value in changes:
+                if time_ps != last_time:
+                    f.write(f"#{time_ps}\n")
+                    last_time = time_ps
+                f.write(_vcd_value(value, ids[index]))
+
+
+def _vcd_id(index):
+    """Short printable VCD identifier for a signal index"""
+    chars = []
+    index += 1
+    while index:
+        index, digit = divmod(index - 1, 94)
+        chars.append(chr(33 + digit))
+    return "".join(chars)
+
+
+def _vcd_value(value, vcd_id):
+    value = value.lower()
+    if len(value) == 1:
+        return f"{value}{vcd_id}\n"
+    return f"b{value} {vcd_id}\n"
+
+
+def capture_from_env(dut):
+    """Starts a WaveCapture configured from WAVE_* variables, or returns None"""
+    ring_us = os.environ.get("WAVE_RING_US")
+    if not ring_us:
+        return None
+    return WaveCapture(
+        dut,
+        window_ns=float(ring_us) * 1000,
+        pre_ns=float(os.environ.get("WAVE_PRE_NS", "1000")),
+        post_ns=float(os.environ.get("WAVE_POST_NS", "200")),
+        prefix=os.environ.get("WAVE_PREFIX", "capture"),
+    ).start()